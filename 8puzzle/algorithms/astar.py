@@ -1,70 +1,54 @@
 """A* Search implementation for 8-puzzle"""
-import heapq
-from .heuristics import manhattan_distance
+from models.bucket_queue import IndexedBucketQueue, f_g_priority
+from .heuristics import manhattan_distance, get_incremental_heuristic
+from .budget import budgeted, closest_path
+from .node import Node
 
-class Node:
-    def __init__(self, state, parent=None, move=None, g=0):
-        self.state = state
-        self.parent = parent
-        self.move = move
-        self.g = g      # Cost from start to current node
-        self.h = 0      # Heuristic value (Manhattan distance)
-        self.f = 0      # Total cost (f = g + h)
-        
-    def __lt__(self, other):
-        return self.f < other.f
-        
-    def __eq__(self, other):
-        return isinstance(other, Node) and self.state == other.state
-
-def astar_search(puzzle):
+@budgeted
+def astar_search(puzzle, heuristic_func=manhattan_distance, budget=None):
     """Returns (path from initial to goal, nodes explored) or (None, nodes explored)"""
     if not puzzle.is_solvable():
         return None, 0
         
-    start_node = Node(puzzle.initial_state)
-    start_node.h = manhattan_distance(start_node.state, puzzle.goal_state)
-    start_node.f = start_node.g + start_node.h
+    # Trạng thái trong Node là số nguyên đã nén (xem models.packed_state)
+    get_successors = puzzle.layout.get_successors
+    goal = puzzle.pack_state(puzzle.goal_state)
+    heuristic = get_incremental_heuristic(puzzle.goal_state, heuristic_func)
+    start = puzzle.pack_state(puzzle.initial_state)
+    start_node = Node(start, h=heuristic.initial(start))
     
-    frontier = []
-    heapq.heappush(frontier, start_node)
+    # Open set theo bucket (f, g): f nhỏ trước, cùng f thì g lớn hơn (gần đích
+    # hơn) trước. Mỗi trạng thái có mặt nhiều nhất một lần, tìm được g tốt hơn
+    # thì chuyển sang bucket mới (decrease-key)
+    frontier = IndexedBucketQueue()
+    frontier.push(start_node.state, f_g_priority(start_node.f, start_node.g))
     
-    # Track both cost and visited states
-    cost_so_far = {puzzle.get_state_string(start_node.state): 0}
-    visited = {puzzle.get_state_string(start_node.state)}
+    # Nút tốt nhất đã biết của mỗi trạng thái (g nhỏ nhất)
+    best = {start_node.state: start_node}
     nodes_explored = 1
     
     while frontier:
-        current = heapq.heappop(frontier)
-        current_state_str = puzzle.get_state_string(current.state)
+        if budget is not None and budget.exceeded(nodes_explored, len(best)):
+            return closest_path(puzzle, best.values()), nodes_explored
+        current = best[frontier.pop()]
         
-        if puzzle.is_goal(current.state):
-            path = []
-            while current:
-                path.append(current.state)
-                current = current.parent
-            return path[::-1], nodes_explored
+        if current.state == goal:
+            return [puzzle.unpack_state(state) for state in current.path()], nodes_explored
             
-        # Skip if we've found a better path to this state
-        if current_state_str in visited and current.g > cost_so_far[current_state_str]:
-            continue
+        for move, target, new_state in get_successors(current.state):
+            new_cost = current.g + 1
+            old_node = best.get(new_state)
             
-        for move in puzzle.get_possible_moves(current.state):
-            try:
-                new_state = puzzle.apply_move(current.state, move)
-                new_cost = current.g + 1
-                state_string = puzzle.get_state_string(new_state)
-                
-                if state_string not in cost_so_far or new_cost < cost_so_far[state_string]:
-                    cost_so_far[state_string] = new_cost
-                    visited.add(state_string)
-                    new_node = Node(new_state, current, move, new_cost)
-                    new_node.h = manhattan_distance(new_state, puzzle.goal_state)
-                    new_node.f = new_node.g + new_node.h
-                    heapq.heappush(frontier, new_node)
-                    nodes_explored += 1
-                    
-            except ValueError:
-                continue  # Skip invalid moves
+            if old_node is None or new_cost < old_node.g:
+                # h chỉ phụ thuộc vào trạng thái: dùng lại nếu đã tính
+                if old_node is None:
+                    new_h = heuristic.delta(current.state, target, current.h)
+                else:
+                    new_h = old_node.h
+                new_node = Node(new_state, current, new_cost, new_h)
+                best[new_state] = new_node
+                # Thêm mới, giảm độ ưu tiên nếu đang trong open, hoặc mở lại
+                frontier.push(new_state, f_g_priority(new_cost + new_h, new_cost))
+                nodes_explored += 1
     
-    return None, nodes_explored 
\ No newline at end of file
+    return None, nodes_explored
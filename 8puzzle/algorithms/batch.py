@@ -0,0 +1,134 @@
+"""
+Batch solve API: giải nhiều trạng thái đầu cho cùng một goal_state
+
+Các lời giải chạy trên SolverPool (algorithms.solver_pool): mỗi tiến trình
+worker được làm nóng một lần với thuật toán và các bảng heuristic của
+goal_state; các bảng phụ thuộc goal được cache trong module nên mọi lời giải
+sau đó của worker dùng lại mà không phải tạo lại.
+
+Chạy như chương trình để so sánh các thuật toán trên nhiều độ sâu xáo trộn, dùng
+mọi nhân CPU qua SolverPool:
+
+    python -m algorithms.batch --algorithms ASTAR IDA BIBFS --depths 10 20 30 --count 50
+"""
+import argparse
+import os
+import random
+from collections import defaultdict
+from models.packed_state import get_layout, default_goal_state
+from models.puzzle import Puzzle
+from .budget import SOLVED
+from .registry import ALGORITHMS, algorithm_name, get_algorithm
+from .solver_pool import SolverPool
+
+DEFAULT_CHUNK_SIZE = 16
+
+
+def solve_many(states, goal_state, algorithm="ASTAR", workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **params):
+    """
+    Giải tất cả states (danh sách ma trận 3x3) tới goal_state.
+
+    algorithm là tên trong algorithms.registry.ALGORITHMS, params được truyền
+    thêm cho hàm giải (ví dụ heuristic_func=pattern_database, max_depth=30).
+    workers=None dùng os.cpu_count() tiến trình; workers=1 giải tuần tự trong
+    tiến trình hiện tại.
+
+    Là generator, trả về (index, path, nodes_explored) ngay khi từng nhóm được
+    giải xong - thứ tự không nhất thiết trùng với thứ tự của states.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        solve_func = get_algorithm(algorithm)
+        for index, state in enumerate(states):
+            puzzle = Puzzle(state)
+            puzzle.goal_state = goal_state
+            path, nodes_explored = solve_func(puzzle, **params)
+            yield index, path, nodes_explored
+        return
+
+    # Kiểm tra tên thuật toán ngay, trước khi tạo các tiến trình worker
+    algorithm = algorithm_name(algorithm)
+    jobs = [(state, goal_state, algorithm, params) for state in states]
+    with SolverPool(max_workers=workers, goal_states=[goal_state], algorithms=[algorithm]) as pool:
+        for index, result in pool.map(jobs, chunk_size=chunk_size):
+            yield index, result.path(), result.nodes_explored
+
+
+def scramble(goal_state, depth, rng=random):
+    """Trạng thái sau depth bước đi ngẫu nhiên từ goal_state (không đi ngược bước vừa đi)"""
+    layout = get_layout(len(goal_state))
+    state = layout.pack(goal_state)
+    previous = None
+    for _ in range(depth):
+        successors = [new_state for move, target, new_state in layout.get_successors(state)
+                      if new_state != previous]
+        previous, state = state, rng.choice(successors)
+    return layout.unpack(state)
+
+
+def benchmark(algorithms, depths, count=10, goal_state=None, seed=0, pool=None,
+              chunk_size=1, time_limit=None, params=None):
+    """
+    Giải count trạng thái xáo trộn ở mỗi độ sâu trong depths bằng mọi thuật
+    toán trong algorithms (cùng các trạng thái cho mọi thuật toán). params là
+    dict tên thuật toán -> tham số. Trả về dict (algorithm, depth) -> [SolveResult].
+    """
+    if goal_state is None:
+        goal_state = default_goal_state(3)
+    params = params or {}
+    rng = random.Random(seed)
+    cases = [(depth, scramble(goal_state, depth, rng)) for depth in depths for _ in range(count)]
+    jobs, keys = [], []
+    for algorithm in algorithms:
+        for depth, state in cases:
+            jobs.append((state, goal_state, algorithm, params.get(algorithm, {})))
+            keys.append((algorithm, depth))
+
+    results = defaultdict(list)
+    own_pool = pool is None
+    if own_pool:
+        pool = SolverPool(goal_states=[goal_state], algorithms=algorithms)
+    try:
+        for index, result in pool.map(jobs, chunk_size=chunk_size, time_limit=time_limit):
+            results[keys[index]].append(result)
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark 8-puzzle solvers across scramble depths")
+    parser.add_argument("--algorithms", nargs="+", default=["ASTAR", "IDA", "BIBFS"],
+                        help=f"algorithm names ({', '.join(ALGORITHMS)})")
+    parser.add_argument("--depths", nargs="+", type=int, default=[5, 10, 15, 20, 25])
+    parser.add_argument("--count", type=int, default=20, help="puzzles per depth")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per solve")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    algorithms = [algorithm_name(name) for name in args.algorithms]
+    with SolverPool(max_workers=args.workers, algorithms=algorithms) as pool:
+        results = benchmark(algorithms, args.depths, args.count, seed=args.seed, pool=pool,
+                            chunk_size=args.chunk_size, time_limit=args.time_limit)
+
+    print(f"{'Algorithm':<10} {'Depth':>5} {'Solved':>8} {'Avg steps':>10} "
+          f"{'Avg nodes':>12} {'Avg time':>10}")
+    for algorithm in algorithms:
+        for depth in args.depths:
+            group = results[(algorithm, depth)]
+            solved = [result for result in group if result.status == SOLVED]
+            avg_steps = sum(result.steps for result in solved) / len(solved) if solved else 0.0
+            avg_nodes = sum(result.nodes_explored for result in group) / len(group)
+            avg_time = sum(result.solve_time for result in group) / len(group)
+            print(f"{algorithm:<10} {depth:>5} {len(solved):>4}/{len(group):<3} {avg_steps:>10.1f} "
+                  f"{avg_nodes:>12.1f} {avg_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
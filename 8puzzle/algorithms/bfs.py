@@ -1,35 +1,43 @@
 """Breadth-First Search implementation for 8-puzzle"""
-from collections import deque
+from models.permutation_rank import new_state_table
+from models.search_arena import SearchArena
+from .budget import budgeted
 
-def bfs_search(puzzle):
+@budgeted
+def bfs_search(puzzle, budget=None):
     """Returns (path from initial to goal, nodes explored) or (None, nodes explored)"""
     if not puzzle.is_solvable():
         return None, 0
         
-    # Initialize with start state
-    queue = deque([[puzzle.initial_state]])
-    visited = {puzzle.get_state_string(puzzle.initial_state)}
+    # Initialize with start state (states are packed integers, see models.packed_state)
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    # Các nút nằm trong arena theo đúng thứ tự FIFO nên hàng đợi chỉ là
+    # chỉ số head chạy dọc theo arena
+    layout = puzzle.layout
+    arena = SearchArena(start, layout)
+    head = 0
+    # Tập đã thăm là bitset (một byte mỗi trạng thái) đánh chỉ số theo hạng Lehmer
+    # (dict với lưới lớn hơn 3x3, xem new_state_table)
+    state_key, visited = new_state_table(layout)
+    visited[state_key(start)] = 1
     nodes_explored = 1
     
-    while queue:
-        path = queue.popleft()
-        state = path[-1]
+    while head < len(arena):
+        if budget is not None and budget.exceeded(nodes_explored, len(arena)):
+            return None, nodes_explored
+        index = head
+        head += 1
+        state = arena.states[index]
         
-        if puzzle.is_goal(state):
-            return path, nodes_explored
+        if state == goal:
+            return [puzzle.unpack_state(s) for s in arena.path(index)], nodes_explored
             
-        for move in puzzle.get_possible_moves(state):
-            try:
-                new_state = puzzle.apply_move(state, move)
-                state_string = puzzle.get_state_string(new_state)
-                
-                if state_string not in visited:
-                    visited.add(state_string)
-                    new_path = list(path)
-                    new_path.append(new_state)
-                    queue.append(new_path)
-                    nodes_explored += 1
-            except ValueError:
-                continue  # Skip invalid moves
+        for move, target, new_state in layout.get_successors(state):
+            rank = state_key(new_state)
+            if not visited[rank]:
+                visited[rank] = 1
+                arena.add(new_state, index)
+                nodes_explored += 1
     
-    return None, nodes_explored 
\ No newline at end of file
+    return None, nodes_explored 
@@ -0,0 +1,70 @@
+"""Bidirectional Breadth-First Search implementation for 8-puzzle"""
+from models.permutation_rank import new_state_table
+from models.search_arena import SearchArena
+from .budget import budgeted
+
+@budgeted
+def bidirectional_bfs(puzzle, budget=None):
+    """
+    BFS đồng thời từ trạng thái đầu và trạng thái đích, gặp nhau ở giữa.
+    Mỗi vòng mở rộng trọn một tầng của phía có biên nhỏ hơn nên đường đi tìm được
+    vẫn ngắn nhất, trong khi chỉ cần khoảng 2·b^(d/2) nút thay vì b^d.
+    Returns (path from initial to goal, nodes explored) or (None, nodes explored)
+    """
+    if not puzzle.is_solvable():
+        return None, 0
+
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    if start == goal:
+        return [puzzle.unpack_state(start)], 1
+
+    # Mỗi phía: arena các nút, chỉ số đầu tầng hiện tại và bảng hạng Lehmer -> chỉ số
+    # nút trong arena (-1: chưa thăm)
+    layout = puzzle.layout
+    arenas = (SearchArena(start, layout), SearchArena(goal, layout))
+    layer_starts = [0, 0]
+    state_key, forward_seen = new_state_table(layout, 'i', -1)
+    state_key, backward_seen = new_state_table(layout, 'i', -1)
+    seen = (forward_seen, backward_seen)
+    seen[0][state_key(start)] = 0
+    seen[1][state_key(goal)] = 0
+    nodes_explored = 2
+
+    while True:
+        # Chọn phía có biên (tầng hiện tại) nhỏ hơn
+        sizes = [len(arenas[side]) - layer_starts[side] for side in (0, 1)]
+        if not sizes[0] or not sizes[1]:
+            return None, nodes_explored
+        side = 0 if sizes[0] <= sizes[1] else 1
+        arena, other_arena = arenas[side], arenas[1 - side]
+        own_seen, other_seen = seen[side], seen[1 - side]
+
+        # Mở rộng trọn một tầng, giữ điểm gặp có tổng độ sâu nhỏ nhất
+        best = None
+        layer_end = len(arena)
+        for index in range(layer_starts[side], layer_end):
+            if budget is not None and budget.exceeded(nodes_explored, len(arena) + len(other_arena)):
+                return None, nodes_explored
+            state = arena.states[index]
+            for move, target, new_state in layout.get_successors(state):
+                rank = state_key(new_state)
+                other_index = other_seen[rank]
+                if other_index >= 0:
+                    cost = arena.depths[index] + 1 + other_arena.depths[other_index]
+                    if best is None or cost < best[0]:
+                        best = (cost, index, other_index)
+                if own_seen[rank] < 0:
+                    own_seen[rank] = arena.add(new_state, index)
+                    nodes_explored += 1
+        layer_starts[side] = layer_end
+
+        if best is not None:
+            cost, index, other_index = best
+            own_path = arena.path(index)
+            other_path = other_arena.path(other_index)
+            if side == 0:
+                path = own_path + other_path[::-1]
+            else:
+                path = other_path + own_path[::-1]
+            return [puzzle.unpack_state(s) for s in path], nodes_explored
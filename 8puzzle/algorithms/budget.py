@@ -0,0 +1,125 @@
+"""
+Search budgets and cancellation shared by the solvers
+
+SearchBudget gom các giới hạn của một lần giải: thời gian (giây), số nút sinh ra,
+số trạng thái lưu trong bộ nhớ cùng lúc và cờ hủy. Các thuật toán nhận tham số
+budget=None; khi có budget, vòng lặp chính gọi budget.exceeded(nodes_explored,
+resident_states) ở mỗi bước - chỉ vài phép so sánh, đồng hồ chỉ được đọc sau
+mỗi _TIME_CHECK_INTERVAL lần gọi. Hai giá trị truyền vào được giữ lại làm tiến
+độ, để luồng khác (ví dụ giao diện) đọc trong khi thuật toán đang chạy.
+
+Khi vượt giới hạn, thuật toán dừng và trả về (đường đi tốt nhất hiện có,
+nodes_explored): với các thuật toán có heuristic là đường đi tới trạng thái có h
+nhỏ nhất đã gặp (chưa phải lời giải), với tìm kiếm không có thông tin là None.
+budget.status cho biết kết quả: SOLVED, NO_SOLUTION hoặc lý do dừng.
+"""
+import time
+from functools import wraps
+
+SOLVED = "solved"
+NO_SOLUTION = "no_solution"
+TIME_LIMIT = "time_limit"
+NODE_LIMIT = "node_limit"
+MEMORY_LIMIT = "memory_limit"
+CANCELLED = "cancelled"
+
+# Các trạng thái cho biết thuật toán dừng sớm vì budget
+STOPPED = frozenset((TIME_LIMIT, NODE_LIMIT, MEMORY_LIMIT, CANCELLED))
+
+_TIME_CHECK_INTERVAL = 64
+
+
+class SearchBudget:
+    """Giới hạn tài nguyên và cờ hủy cho một lần giải"""
+
+    def __init__(self, time_limit=None, max_nodes=None, max_states=None):
+        self.time_limit = time_limit
+        self.max_nodes = max_nodes
+        self.max_states = max_states
+        self.cancelled = False
+        self.status = None
+        self.deadline = None
+        self.started_at = None
+        # Tiến độ gần nhất do thuật toán báo qua exceeded()
+        self.nodes_explored = 0
+        self.resident_states = 0
+        self._countdown = _TIME_CHECK_INTERVAL
+
+    def start(self):
+        """Bắt đầu tính giờ, được gọi khi thuật toán bắt đầu tìm kiếm"""
+        self.status = None
+        self.nodes_explored = 0
+        self.resident_states = 0
+        self._countdown = _TIME_CHECK_INTERVAL
+        self.started_at = time.perf_counter()
+        if self.time_limit is not None:
+            self.deadline = self.started_at + self.time_limit
+        return self
+
+    def cancel(self):
+        """Yêu cầu dừng tìm kiếm (gọi được từ luồng khác)"""
+        self.cancelled = True
+
+    def exceeded(self, nodes_explored=0, resident_states=0):
+        """Có phải dừng không; nếu có thì ghi lý do vào status"""
+        self.nodes_explored = nodes_explored
+        self.resident_states = resident_states
+        if self.cancelled:
+            self.status = CANCELLED
+            return True
+        if self.max_nodes is not None and nodes_explored >= self.max_nodes:
+            self.status = NODE_LIMIT
+            return True
+        if self.max_states is not None and resident_states >= self.max_states:
+            self.status = MEMORY_LIMIT
+            return True
+        if self.deadline is not None:
+            self._countdown -= 1
+            if not self._countdown:
+                self._countdown = _TIME_CHECK_INTERVAL
+                if time.perf_counter() >= self.deadline:
+                    self.status = TIME_LIMIT
+                    return True
+        return False
+
+    @property
+    def elapsed(self):
+        """Số giây từ lúc bắt đầu tìm kiếm (0 nếu chưa bắt đầu)"""
+        if self.started_at is None:
+            return 0.0
+        return time.perf_counter() - self.started_at
+
+    @property
+    def stopped(self):
+        """Lần giải gần nhất có bị dừng sớm vì budget không"""
+        return self.status in STOPPED
+
+
+def budgeted(search_func):
+    """
+    Thêm tham số budget=None cho hàm giải search_func(puzzle, ...): gọi
+    budget.start() trước khi giải và ghi SOLVED/NO_SOLUTION vào budget.status
+    nếu thuật toán kết thúc mà không bị dừng sớm
+    """
+    @wraps(search_func)
+    def wrapper(puzzle, *args, budget=None, **kwargs):
+        if budget is None:
+            return search_func(puzzle, *args, **kwargs)
+        budget.start()
+        path, nodes_explored = search_func(puzzle, *args, budget=budget, **kwargs)
+        if budget.status is None:
+            budget.status = SOLVED if path else NO_SOLUTION
+        return path, nodes_explored
+    return wrapper
+
+
+def closest_path(puzzle, nodes):
+    """Đường đi (ma trận) tới nút có h nhỏ nhất trong nodes (Node), hoặc None"""
+    closest = min(nodes, key=_node_h, default=None)
+    if closest is None:
+        return None
+    return [puzzle.unpack_state(state) for state in closest.path()]
+
+
+def _node_h(node):
+    return node.h
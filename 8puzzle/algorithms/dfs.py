@@ -1,36 +1,43 @@
 """Depth-First Search implementation for 8-puzzle"""
+from models.permutation_rank import new_state_table
+from models.search_arena import SearchArena
+from .budget import budgeted
 
-def dfs_search(puzzle, max_depth=200):
+@budgeted
+def dfs_search(puzzle, max_depth=200, budget=None):
     
     if not puzzle.is_solvable():
         return None, 0
         
-    stack = [[puzzle.initial_state]]
-    visited = {puzzle.get_state_string(puzzle.initial_state)}
+    # Trạng thái được biểu diễn bằng số nguyên đã nén (xem models.packed_state)
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    # Ngăn xếp chỉ chứa chỉ số nút trong arena (trạng thái, nút cha, độ sâu)
+    layout = puzzle.layout
+    arena = SearchArena(start, layout)
+    stack = [0]
+    # Tập đã thăm là bitset (một byte mỗi trạng thái) đánh chỉ số theo hạng Lehmer
+    state_key, visited = new_state_table(layout)
+    visited[state_key(start)] = 1
     nodes_explored = 1
     
     while stack:
-        path = stack.pop()
-        state = path[-1]
+        if budget is not None and budget.exceeded(nodes_explored, len(arena)):
+            return None, nodes_explored
+        index = stack.pop()
+        state = arena.states[index]
         
-        if puzzle.is_goal(state):
-            return path, nodes_explored
+        if state == goal:
+            return [puzzle.unpack_state(s) for s in arena.path(index)], nodes_explored
             
-        if len(path) > max_depth:
+        if arena.depths[index] >= max_depth:
             continue
             
-        for move in puzzle.get_possible_moves(state):
-            try:
-                new_state = puzzle.apply_move(state, move)
-                state_string = puzzle.get_state_string(new_state)
-                
-                if state_string not in visited:
-                    visited.add(state_string)
-                    new_path = list(path)
-                    new_path.append(new_state)
-                    stack.append(new_path)
-                    nodes_explored += 1
-            except ValueError:
-                continue 
+        for move, target, new_state in layout.get_successors(state):
+            rank = state_key(new_state)
+            if not visited[rank]:
+                visited[rank] = 1
+                stack.append(arena.add(new_state, index))
+                nodes_explored += 1
     
     return None, nodes_explored
@@ -0,0 +1,128 @@
+"""
+Full state-space distance table solver for 8-puzzle
+
+Mỗi goal_state chỉ có 9!/2 = 181440 trạng thái đến được. Một lần BFS ngược từ
+trạng thái đích cho khoảng cách chính xác tới đích của mọi trạng thái, lưu thành
+mảng 181440 byte đánh chỉ số bằng models.permutation_rank.rank_reachable. Bảng
+được ghi vào thư mục cache và memory-map lại; sau đó mỗi lần giải chỉ cần đi
+xuống theo khoảng cách giảm dần - đường đi tối ưu, không phải tìm kiếm.
+"""
+import mmap
+import os
+from functools import lru_cache
+from models.packed_state import pack_state, unpack_state, get_successors, SIZE
+from models.permutation_rank import rank_reachable, REACHABLE_COUNT
+from .budget import budgeted
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', '8puzzle', 'distance')
+UNREACHABLE = 255
+
+
+def _build_table(goal):
+    """BFS ngược từ trạng thái đích (đã nén), trả về bytearray khoảng cách"""
+    table = bytearray([UNREACHABLE]) * REACHABLE_COUNT
+    table[rank_reachable(goal)] = 0
+    layer = [goal]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for state in layer:
+            for move, target, new_state in get_successors(state):
+                index = rank_reachable(new_state)
+                if table[index] == UNREACHABLE:
+                    table[index] = distance
+                    next_layer.append(new_state)
+        layer = next_layer
+    return table
+
+
+def _load_table(goal, cache_dir):
+    """Đọc bảng từ cache (memory-map) hoặc tạo mới và ghi vào cache"""
+    if cache_dir is None:
+        return _build_table(goal)
+
+    goal_key = ''.join(str(num) for row in unpack_state(goal) for num in row)
+    filename = os.path.join(cache_dir, f"dist_{goal_key}.bin")
+
+    if not os.path.exists(filename) or os.path.getsize(filename) != REACHABLE_COUNT:
+        table = _build_table(goal)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_filename = f"{filename}.{os.getpid()}.tmp"
+            with open(temp_filename, 'wb') as f:
+                f.write(table)
+            os.replace(temp_filename, filename)
+        except OSError:
+            # Không ghi được cache: dùng bảng trong bộ nhớ
+            return table
+
+    with open(filename, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class TableSolver:
+    """
+    Giải tối ưu bằng bảng khoảng cách của toàn bộ không gian trạng thái.
+
+    Bảng của mỗi goal_state được tạo (hoặc đọc từ cache) ở lần đầu cần đến rồi
+    giữ lại trong solver, nên một solver có thể phục vụ nhiều goal_state.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.tables = {}
+
+    def get_table(self, goal_state):
+        """Bảng khoảng cách (181440 byte) cho goal_state"""
+        if len(goal_state) != SIZE:
+            # 16!/2 trạng thái của 15-puzzle không thể lập bảng đầy đủ
+            raise ValueError("TableSolver only supports 3x3 puzzles")
+        goal = pack_state(goal_state)
+        table = self.tables.get(goal)
+        if table is None:
+            table = _load_table(goal, self.cache_dir)
+            self.tables[goal] = table
+        return table
+
+    def solve(self, puzzle, budget=None):
+        """Returns (path from initial to goal, nodes explored) or (None, nodes explored)"""
+        if not puzzle.is_solvable():
+            return None, 0
+        table = self.get_table(puzzle.goal_state)
+        state = pack_state(puzzle.initial_state)
+        goal = pack_state(puzzle.goal_state)
+        distance = table[rank_reachable(state)]
+        nodes_explored = 1
+        if distance == UNREACHABLE:
+            return None, nodes_explored
+
+        path = [state]
+        while state != goal:
+            # Hết budget: đường đi đã đi được luôn tiến gần đích hơn
+            if budget is not None and budget.exceeded(nodes_explored, len(path)):
+                return [unpack_state(s) for s in path], nodes_explored
+            # Đi tới trạng thái kề có khoảng cách nhỏ hơn đúng 1
+            for move, target, new_state in get_successors(state):
+                nodes_explored += 1
+                if table[rank_reachable(new_state)] == distance - 1:
+                    state = new_state
+                    distance -= 1
+                    path.append(state)
+                    break
+            else:
+                # Không xảy ra với trạng thái giải được: bảng luôn có bước giảm khoảng cách
+                return None, nodes_explored
+        return [unpack_state(s) for s in path], nodes_explored
+
+
+@lru_cache(maxsize=4)
+def get_table_solver(cache_dir=DEFAULT_CACHE_DIR):
+    """TableSolver dùng chung cho cache_dir"""
+    return TableSolver(cache_dir)
+
+
+@budgeted
+def table_search(puzzle, budget=None):
+    """Giải bằng TableSolver dùng chung, cùng giao diện với các thuật toán khác"""
+    return get_table_solver().solve(puzzle, budget)
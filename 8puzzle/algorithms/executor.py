@@ -0,0 +1,108 @@
+"""
+Background solver executor
+
+Chạy một hàm giải (cùng giao diện với algorithms.registry) trên luồng riêng để
+luồng gọi - ví dụ vòng lặp sự kiện Tkinter - không bị chặn. Mỗi lần giải có một
+SearchBudget: luồng gọi đọc tiến độ (số nút, số trạng thái trong bộ nhớ, thời
+gian) từ budget bằng cách thăm dò định kỳ, và hủy bằng budget.cancel().
+
+Với pool (algorithms.solver_pool.SolverPool), lần giải chạy ở tiến trình worker
+thay vì luồng, nên không tranh GIL với giao diện; job trả về có cùng giao diện.
+"""
+import threading
+import time
+from .budget import SearchBudget
+from .registry import get_algorithm
+
+
+class SolveJob:
+    """Một lần giải đang chạy (hoặc đã xong) trên luồng nền"""
+
+    def __init__(self, solve_func, puzzle, budget, params):
+        self.solve_func = solve_func
+        self.puzzle = puzzle
+        self.budget = budget
+        self.params = params
+        self.path = None
+        self.nodes_explored = 0
+        self.error = None
+        self.solve_time = 0.0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        start_time = time.perf_counter()
+        try:
+            self.path, self.nodes_explored = self.solve_func(
+                self.puzzle, budget=self.budget, **self.params)
+        except Exception as e:  # Chuyển lỗi về cho luồng gọi
+            self.error = e
+        finally:
+            self.solve_time = time.perf_counter() - start_time
+            self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Chờ lần giải kết thúc, trả về done"""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        self.budget.cancel()
+
+    @property
+    def cancelled(self):
+        return self.budget.cancelled
+
+    @property
+    def status(self):
+        return self.budget.status
+
+    def progress(self):
+        """(nodes_explored, resident_states, elapsed) tại thời điểm gọi"""
+        budget = self.budget
+        return budget.nodes_explored, budget.resident_states, budget.elapsed
+
+
+class SolverExecutor:
+    """
+    Chạy từng lần giải trên một luồng nền (hoặc trong pool nếu có), mỗi lúc
+    nhiều nhất một lần giải
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool
+        self.job = None
+
+    @property
+    def busy(self):
+        return self.job is not None and not self.job.done
+
+    def submit(self, algorithm, puzzle, budget=None, **params):
+        """
+        Bắt đầu giải puzzle bằng thuật toán algorithm (tên trong
+        algorithms.registry) với params, trả về job theo dõi được. Lần giải
+        trước (nếu còn chạy) bị hủy.
+        """
+        if self.busy:
+            self.job.cancel()
+        if self.pool is not None:
+            limits = {}
+            if budget is not None:
+                limits = dict(time_limit=budget.time_limit, max_nodes=budget.max_nodes,
+                              max_states=budget.max_states)
+            job = self.pool.submit(puzzle.initial_state, puzzle.goal_state, algorithm,
+                                   **limits, **params)
+        else:
+            solve_func = get_algorithm(algorithm)
+            job = SolveJob(solve_func, puzzle, budget or SearchBudget(), params)
+            job._thread.start()
+        self.job = job
+        return job
+
+    def cancel(self):
+        """Hủy lần giải đang chạy (nếu có)"""
+        if self.busy:
+            self.job.cancel()
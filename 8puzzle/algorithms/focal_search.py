@@ -0,0 +1,102 @@
+"""Focal Search (A*ε) implementation for 8-puzzle"""
+import heapq
+from .heuristics import manhattan_distance, get_incremental_heuristic
+from .budget import budgeted, closest_path
+from .node import Node
+
+DEFAULT_EPSILON = 0.5
+
+@budgeted
+def focal_search(puzzle, epsilon=DEFAULT_EPSILON, heuristic_func=manhattan_distance, budget=None):
+    """
+    Focal search với cận dưới tối ưu ε: FOCAL gồm các nút open có
+    f <= (1 + ε)·f_min, và nút được mở rộng là nút trong FOCAL có h nhỏ nhất
+    (gần đích nhất). Độ dài đường đi không vượt quá (1 + ε) lần tối ưu khi
+    heuristic chấp nhận được.
+    Returns (path from initial to goal, nodes explored) or (None, nodes explored)
+    """
+    if not puzzle.is_solvable():
+        return None, 0
+    if epsilon < 0:
+        raise ValueError(f"Epsilon must be non-negative, got {epsilon}")
+
+    get_successors = puzzle.layout.get_successors
+    goal = puzzle.pack_state(puzzle.goal_state)
+    heuristic = get_incremental_heuristic(puzzle.goal_state, heuristic_func)
+    start = puzzle.pack_state(puzzle.initial_state)
+    start_node = Node(start, h=heuristic.initial(start))
+
+    # Nút tốt nhất đã biết của mỗi trạng thái; trạng thái có trong best mà không
+    # có trong closed là đang open
+    best = {start: start_node}
+    closed = set()
+    # open_counts[f]: số nút open có giá trị f (f là số nguyên nhỏ)
+    open_counts = [0] * (start_node.f + 1)
+    open_counts[start_node.f] = 1
+    # waiting[f]: nút open có f vượt quá cận của FOCAL, chờ cận tăng lên
+    waiting = [[] for _ in range(start_node.f + 1)]
+    f_min = start_node.f
+    bound = int((1 + epsilon) * f_min)
+    # FOCAL: heap (h, -g, thứ tự sinh, nút); mục cũ bị bỏ qua khi lấy ra
+    focal = [(start_node.h, 0, 0, start_node)]
+    order = 1
+    nodes_explored = 1
+
+    while focal:
+        if budget is not None and budget.exceeded(nodes_explored, len(best)):
+            return closest_path(puzzle, best.values()), nodes_explored
+        h, negative_g, _, current = heapq.heappop(focal)
+        state = current.state
+        if best[state] is not current or state in closed:
+            continue
+
+        if state == goal:
+            return [puzzle.unpack_state(s) for s in current.path()], nodes_explored
+
+        closed.add(state)
+        open_counts[current.f] -= 1
+
+        new_cost = current.g + 1
+        for move, target, new_state in get_successors(state):
+            old_node = best.get(new_state)
+            if old_node is not None:
+                if new_cost >= old_node.g:
+                    continue
+                # Tìm được g tốt hơn: bỏ nút cũ khỏi open, hoặc mở lại nếu đã đóng
+                if new_state in closed:
+                    closed.discard(new_state)
+                else:
+                    open_counts[old_node.f] -= 1
+                new_h = old_node.h
+            else:
+                new_h = heuristic.delta(state, target, current.h)
+            new_node = Node(new_state, current, new_cost, new_h)
+            best[new_state] = new_node
+            nodes_explored += 1
+
+            f = new_cost + new_h
+            if f >= len(open_counts):
+                grow = f + 1 - len(open_counts)
+                open_counts.extend([0] * grow)
+                waiting.extend([] for _ in range(grow))
+            open_counts[f] += 1
+            if f <= bound:
+                heapq.heappush(focal, (new_h, -new_cost, order, new_node))
+                order += 1
+            else:
+                waiting[f].append(new_node)
+
+        # Cập nhật f_min; cận tăng thì chuyển các nút đang chờ vào FOCAL
+        while f_min < len(open_counts) and not open_counts[f_min]:
+            f_min += 1
+        new_bound = min(int((1 + epsilon) * f_min), len(waiting) - 1)
+        for f in range(bound + 1, new_bound + 1):
+            for node in waiting[f]:
+                if best[node.state] is node and node.state not in closed:
+                    heapq.heappush(focal, (node.h, -node.g, order, node))
+                    order += 1
+            waiting[f] = []
+        if new_bound > bound:
+            bound = new_bound
+
+    return None, nodes_explored
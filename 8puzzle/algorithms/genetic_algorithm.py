@@ -1,5 +1,6 @@
 """Thuật toán Di truyền (Genetic Algorithm) cho bài toán 8-puzzle"""
 from .heuristics import manhattan_distance, misplaced_tiles
+from .budget import budgeted
 import random
 import time
 import numpy as np
@@ -382,7 +383,8 @@ def mutation(chromosome, mutation_rate=0.1, max_length_change=3):
     mutated = Chromosome(moves=moves, puzzle=chromosome.puzzle, initial_state=chromosome.initial_state)
     return mutated
 
-def genetic_algorithm(puzzle, heuristic_func=manhattan_distance, pop_size=100, max_generations=100, tournament_size=5, elite_size=10, mutation_rate=0.1, crossover_rate=0.7, max_chromosome_length=50, early_stopping=20, max_time=30):
+@budgeted
+def genetic_algorithm(puzzle, heuristic_func=manhattan_distance, pop_size=100, max_generations=100, tournament_size=5, elite_size=10, mutation_rate=0.1, crossover_rate=0.7, max_chromosome_length=50, early_stopping=20, max_time=30, budget=None):
     
     if not puzzle.is_solvable():
         return None, 0
@@ -403,6 +405,11 @@ def genetic_algorithm(puzzle, heuristic_func=manhattan_distance, pop_size=100, m
         # Kiểm tra thời gian chạy
         if time.time() - start_time > max_time:
             break
+        # Hết budget: trả về đường đi của cá thể tốt nhất hiện có (chưa phải lời
+        # giải - lời giải đã được trả về ngay khi tìm thấy), như các thuật toán
+        # có heuristic khác (xem algorithms.budget)
+        if budget is not None and budget.exceeded(nodes_explored, len(population)):
+            return (best_chromosome.get_path() if best_chromosome else None), nodes_explored
         
         # Đánh giá độ thích nghi của toàn bộ quần thể
         for chromosome in population:
@@ -1,64 +1,52 @@
 """Greedy Search implementation for 8-puzzle"""
-import heapq
-from .heuristics import manhattan_distance
+from models.bucket_queue import BucketQueue
+from .heuristics import manhattan_distance, get_incremental_heuristic
+from .budget import budgeted, closest_path
+from .node import Node
 
-class Node:
-    def __init__(self, state, parent=None):
-        self.state = state
-        self.parent = parent
-        self.h = 0      # Giá trị heuristic (khoảng cách Manhattan)
-        
-    def __lt__(self, other):
-        return self.h < other.h
-        
-    def __eq__(self, other):
-        return isinstance(other, Node) and self.state == other.state
-
-def greedy_search(puzzle):
+@budgeted
+def greedy_search(puzzle, heuristic_func=manhattan_distance, budget=None):
    
     if not puzzle.is_solvable():
         return None, 0
-    # Khởi tạo nút bắt đầu
-    start_node = Node(puzzle.initial_state)
-    start_node.h = manhattan_distance(start_node.state, puzzle.goal_state)
+    # Khởi tạo nút bắt đầu (trạng thái là số nguyên đã nén, xem models.packed_state)
+    get_successors = puzzle.layout.get_successors
+    goal = puzzle.pack_state(puzzle.goal_state)
+    heuristic = get_incremental_heuristic(puzzle.goal_state, heuristic_func)
+    start = puzzle.pack_state(puzzle.initial_state)
+    start_node = Node(start, h=heuristic.initial(start))
     
-    # Hàng đợi ưu tiên (dựa trên giá trị heuristic)
-    frontier = []
-    heapq.heappush(frontier, start_node)
-    visited = {puzzle.get_state_string(start_node.state)}
+    # Hàng đợi ưu tiên theo bucket giá trị heuristic (cùng h thì LIFO)
+    frontier = BucketQueue()
+    frontier.push(start_node, start_node.h)
+    visited = {start_node.state}
     nodes_explored = 1
+    # Nút có h nhỏ nhất đã mở rộng (kết quả tốt nhất khi hết budget)
+    closest = start_node
     
     while frontier:
+        if budget is not None and budget.exceeded(nodes_explored, len(visited)):
+            return closest_path(puzzle, [closest]), nodes_explored
         # Lấy nút có giá trị heuristic thấp nhất từ hàng đợi
-        current = heapq.heappop(frontier)
+        current = frontier.pop()
+        if current.h < closest.h:
+            closest = current
         
         # Kiểm tra xem trạng thái hiện tại có phải là trạng thái đích không
-        if puzzle.is_goal(current.state):
+        if current.state == goal:
             # Tạo đường đi từ trạng thái đầu đến đích
-            path = []
-            while current:
-                path.append(current.state)
-                current = current.parent
-            return path[::-1], nodes_explored
+            return [puzzle.unpack_state(state) for state in current.path()], nodes_explored
         
         # Khám phá tất cả các trạng thái kế tiếp có thể
-        for move in puzzle.get_possible_moves(current.state):
-            try:
-                # Áp dụng bước di chuyển để có trạng thái mới
-                new_state = puzzle.apply_move(current.state, move)
-                state_string = puzzle.get_state_string(new_state)
-                
-                # Nếu trạng thái mới chưa được khám phá
-                if state_string not in visited:
-                    visited.add(state_string)
-                    # Tạo nút mới và tính toán giá trị heuristic của nó
-                    new_node = Node(new_state, current)
-                    new_node.h = manhattan_distance(new_state, puzzle.goal_state)
-                    # Thêm vào hàng đợi ưu tiên
-                    heapq.heappush(frontier, new_node)
-                    nodes_explored += 1
-            except ValueError:
-                continue  # Bỏ qua các bước đi không hợp lệ
+        for move, target, new_state in get_successors(current.state):
+            # Nếu trạng thái mới chưa được khám phá
+            if new_state not in visited:
+                visited.add(new_state)
+                # Tạo nút mới và cập nhật giá trị heuristic từ nút cha
+                new_node = Node(new_state, current, h=heuristic.delta(current.state, target, current.h))
+                # Thêm vào hàng đợi ưu tiên
+                frontier.push(new_node, new_node.h)
+                nodes_explored += 1
     
     # Không tìm thấy đường đi
     return None, nodes_explored
\ No newline at end of file
@@ -1,21 +1,25 @@
 """
-Heuristic functions for 8-puzzle
+Heuristic functions for 8-puzzle (and other N x N sliding puzzles)
 """
+from collections import deque
+from functools import lru_cache
+from models.packed_state import layout_of
 
 def manhattan_distance(state, goal_state):
     """
     Tính tổng khoảng cách Manhattan từ mỗi số đến vị trí đích của nó
     """
+    size = len(goal_state)
     distance = 0
     # Tạo dictionary vị trí các số trong goal state
     goal_positions = {}
-    for i in range(3):
-        for j in range(3):
+    for i in range(size):
+        for j in range(size):
             goal_positions[goal_state[i][j]] = (i, j)
     
     # Tính tổng khoảng cách Manhattan
-    for i in range(3):
-        for j in range(3):
+    for i in range(size):
+        for j in range(size):
             if state[i][j] != 0:  # Bỏ qua ô trống
                 goal_i, goal_j = goal_positions[state[i][j]]
                 distance += abs(i - goal_i) + abs(j - goal_j)
@@ -25,9 +29,323 @@ def misplaced_tiles(state, goal_state):
     """
     Đếm số ô không đúng vị trí (không tính ô trống)
     """
+    size = len(goal_state)
     count = 0
-    for i in range(3):
-        for j in range(3):
+    for i in range(size):
+        for j in range(size):
             if state[i][j] != 0 and state[i][j] != goal_state[i][j]:
                 count += 1
-    return count 
\ No newline at end of file
+    return count
+
+
+def linear_conflict(state, goal_state):
+    """
+    Khoảng cách Manhattan cộng thêm 2 bước cho mỗi ô phải tránh đường trong
+    các xung đột tuyến tính (hai ô cùng nằm trên hàng/cột đích nhưng ngược thứ tự)
+    """
+    return get_incremental_heuristic(goal_state, linear_conflict).initial(layout_of(state).pack(state))
+
+
+def walking_distance(state, goal_state):
+    """
+    Walking distance: số bước tối thiểu theo chiều dọc và chiều ngang khi chỉ
+    quan tâm mỗi ô đang ở hàng (cột) nào so với hàng (cột) đích của nó,
+    tra từ bảng được tính trước bằng BFS
+    """
+    return get_incremental_heuristic(goal_state, walking_distance).initial(layout_of(state).pack(state))
+
+
+def _goal_positions(goal_state):
+    """Dictionary tile -> (hàng, cột) đích"""
+    size = len(goal_state)
+    return {goal_state[i][j]: (i, j) for i in range(size) for j in range(size)}
+
+
+class IncrementalManhattan:
+    """
+    Khoảng cách Manhattan cập nhật theo từng bước đi trên trạng thái đã nén
+    (xem models.packed_state). Bảng khoảng cách của từng ô số tới vị trí đích
+    được tạo một lần cho mỗi goal_state.
+    """
+    
+    def __init__(self, goal_state):
+        layout = layout_of(goal_state)
+        self.layout = layout
+        self.size = size = layout.size
+        self.cells = cells = layout.cells
+        self.tile_mask = layout.tile_mask
+        self.blank_shift = layout.blank_shift
+        # shifts[index]: vị trí bit của ô index trong số nguyên đã nén
+        self.shifts = [index * layout.tile_bits for index in range(cells)]
+        goal_positions = _goal_positions(goal_state)
+        
+        # distance[tile][index]: khoảng cách từ ô index tới vị trí đích của tile
+        self.distance = []
+        for tile in range(cells):
+            goal_i, goal_j = goal_positions[tile]
+            if tile == 0:  # Bỏ qua ô trống
+                self.distance.append([0] * cells)
+            else:
+                self.distance.append([abs(index // size - goal_i) + abs(index % size - goal_j)
+                                      for index in range(cells)])
+    
+    def initial(self, state):
+        """Tính h đầy đủ cho trạng thái đã nén"""
+        distance = self.distance
+        tile_mask = self.tile_mask
+        h = 0
+        for index, shift in enumerate(self.shifts):
+            h += distance[(state >> shift) & tile_mask][index]
+        return h
+    
+    def delta(self, state, move, parent_h):
+        """
+        Tính h của trạng thái con trong O(1): move là chỉ số ô mà ô trống của
+        state đi vào (target trong MOVE_TABLE), parent_h là h của state.
+        Chỉ có một ô số đổi vị trí nên chỉ cần điều chỉnh khoảng cách của ô đó.
+        """
+        tile_distance = self.distance[(state >> self.shifts[move]) & self.tile_mask]
+        return parent_h - tile_distance[move] + tile_distance[state >> self.blank_shift]
+
+
+def _line_conflict(goal_offsets):
+    """
+    Số bước cộng thêm cho một hàng/cột: goal_offsets là vị trí đích (trong cùng
+    hàng/cột) của các ô đang nằm trên hàng/cột đích của chúng, theo thứ tự hiện tại.
+    Các ô không thuộc dãy con tăng dài nhất phải rời khỏi hàng rồi quay lại (+2 mỗi ô).
+    """
+    longest = []
+    for i in range(len(goal_offsets)):
+        longest.append(1 + max([longest[k] for k in range(i) if goal_offsets[k] < goal_offsets[i]], default=0))
+    return 2 * (len(goal_offsets) - max(longest, default=0))
+
+
+class _LineConflictTable(dict):
+    """
+    Bảng xung đột của một hàng/cột, khóa là state & mask của hàng/cột đó (giữ
+    nguyên các ô của hàng/cột, xóa phần còn lại) nên lấy khóa chỉ tốn một phép AND.
+    Giá trị được tính khi gặp khóa lần đầu, nên dùng được cho cả lưới lớn.
+    """
+    
+    def __init__(self, shifts, tile_mask, goal_offsets):
+        super().__init__()
+        self.shifts = shifts                # vị trí bit của các ô trên hàng/cột, theo thứ tự
+        self.tile_mask = tile_mask
+        self.goal_offsets = goal_offsets    # tile -> vị trí đích trong hàng/cột (nếu thuộc hàng/cột)
+    
+    def __missing__(self, key):
+        tiles = [(key >> shift) & self.tile_mask for shift in self.shifts]
+        value = _line_conflict([self.goal_offsets[tile] for tile in tiles if tile in self.goal_offsets])
+        self[key] = value
+        return value
+
+
+class IncrementalLinearConflict(IncrementalManhattan):
+    """
+    Manhattan + linear conflict trên trạng thái đã nén. Một bước đi ngang không
+    đổi thứ tự các ô trong hàng nên chỉ hai cột liên quan cần tính lại (ngược lại
+    với bước đi dọc), mỗi cột/hàng tra từ bảng xung đột của goal_state.
+    """
+    
+    def __init__(self, goal_state):
+        super().__init__(goal_state)
+        size = self.size
+        tile_mask = self.tile_mask
+        goal_positions = _goal_positions(goal_state)
+        
+        self.row_masks = []
+        self.column_masks = []
+        self.row_conflict = []
+        self.column_conflict = []
+        for line in range(size):
+            row_shifts = [self.shifts[line * size + k] for k in range(size)]
+            column_shifts = [self.shifts[k * size + line] for k in range(size)]
+            self.row_masks.append(sum(tile_mask << shift for shift in row_shifts))
+            self.column_masks.append(sum(tile_mask << shift for shift in column_shifts))
+            self.row_conflict.append(_LineConflictTable(row_shifts, tile_mask, {
+                tile: j for tile, (i, j) in goal_positions.items() if tile != 0 and i == line}))
+            self.column_conflict.append(_LineConflictTable(column_shifts, tile_mask, {
+                tile: i for tile, (i, j) in goal_positions.items() if tile != 0 and j == line}))
+    
+    def initial(self, state):
+        h = super().initial(state)
+        for line in range(self.size):
+            h += self.row_conflict[line][state & self.row_masks[line]]
+            h += self.column_conflict[line][state & self.column_masks[line]]
+        return h
+    
+    def delta(self, state, move, parent_h):
+        size = self.size
+        blank = state >> self.blank_shift
+        tile_distance = self.distance[(state >> self.shifts[move]) & self.tile_mask]
+        h = parent_h - tile_distance[move] + tile_distance[blank]
+        child = self.layout.move_blank(state, move)
+        
+        if blank // size == move // size:
+            # Bước đi ngang: ô số đổi cột
+            for col in (blank % size, move % size):
+                table = self.column_conflict[col]
+                mask = self.column_masks[col]
+                h += table[child & mask] - table[state & mask]
+        else:
+            # Bước đi dọc: ô số đổi hàng
+            for row in (blank // size, move // size):
+                table = self.row_conflict[row]
+                mask = self.row_masks[row]
+                h += table[child & mask] - table[state & mask]
+        return h
+
+
+# Bảng walking distance của 5x5 có quá nhiều trạng thái để tạo bằng BFS trong Python
+WALKING_DISTANCE_MAX_SIZE = 4
+
+
+@lru_cache(maxsize=8)
+def _build_walking_table(size, blank_line):
+    """
+    BFS trên các trạng thái walking distance của một chiều: ô đếm (r, g) là số ô
+    đang ở hàng r có hàng đích g; ô trống được lưu riêng. blank_line là hàng đích
+    của ô trống (hàng đó chỉ có size-1 ô số). Trả về dict mã trạng thái -> số bước.
+    """
+    walk_bits = size.bit_length()  # Mỗi ô đếm nhận giá trị 0..size
+    blank_shift = size * size * walk_bits
+    counts = [0] * (size * size)
+    for line in range(size):
+        counts[line * size + line] = size - 1 if line == blank_line else size
+    
+    def encode(counts, blank):
+        code = blank << blank_shift
+        for cell, count in enumerate(counts):
+            code |= count << (cell * walk_bits)
+        return code
+    
+    start = encode(counts, blank_line)
+    table = {start: 0}
+    frontier = deque([(counts, blank_line)])
+    while frontier:
+        counts, blank = frontier.popleft()
+        distance = table[encode(counts, blank)]
+        for line in (blank - 1, blank + 1):
+            if not 0 <= line < size:
+                continue
+            # Một ô số có hàng đích group đi từ hàng line vào hàng của ô trống
+            for group in range(size):
+                if counts[line * size + group] == 0:
+                    continue
+                new_counts = counts[:]
+                new_counts[line * size + group] -= 1
+                new_counts[blank * size + group] += 1
+                code = encode(new_counts, line)
+                if code not in table:
+                    table[code] = distance + 1
+                    frontier.append((new_counts, line))
+    return table
+
+
+class IncrementalWalkingDistance:
+    """
+    Walking distance trên trạng thái đã nén. Mã trạng thái theo chiều dọc (hàng)
+    và chiều ngang (cột) được cộng dồn từ bảng đóng góp của từng ô; một bước đi
+    chỉ làm thay đổi một chiều nên delta chỉ tính lại chiều đó.
+    """
+    
+    def __init__(self, goal_state):
+        layout = layout_of(goal_state)
+        if layout.size > WALKING_DISTANCE_MAX_SIZE:
+            raise ValueError(f"Walking distance is not supported for {layout.size}x{layout.size} puzzles")
+        self.layout = layout
+        self.size = size = layout.size
+        cells = layout.cells
+        self.tile_mask = layout.tile_mask
+        self.blank_shift = layout.blank_shift
+        self.shifts = [index * layout.tile_bits for index in range(cells)]
+        walk_bits = size.bit_length()
+        self.walk_blank_shift = cells * walk_bits
+        
+        goal_positions = _goal_positions(goal_state)
+        blank_row, blank_col = goal_positions[0]
+        self.vertical_table = _build_walking_table(size, blank_row)
+        self.horizontal_table = _build_walking_table(size, blank_col)
+        
+        # Đóng góp của tile tại index vào mã dọc/ngang (ô trống không đóng góp)
+        self.vertical_code = [[0] * cells]
+        self.horizontal_code = [[0] * cells]
+        for tile in range(1, cells):
+            goal_i, goal_j = goal_positions[tile]
+            self.vertical_code.append([1 << (((index // size) * size + goal_i) * walk_bits)
+                                       for index in range(cells)])
+            self.horizontal_code.append([1 << (((index % size) * size + goal_j) * walk_bits)
+                                         for index in range(cells)])
+    
+    def _vertical(self, state):
+        code = (state >> self.blank_shift) // self.size << self.walk_blank_shift
+        vertical_code = self.vertical_code
+        tile_mask = self.tile_mask
+        for index, shift in enumerate(self.shifts):
+            code += vertical_code[(state >> shift) & tile_mask][index]
+        return self.vertical_table[code]
+    
+    def _horizontal(self, state):
+        code = (state >> self.blank_shift) % self.size << self.walk_blank_shift
+        horizontal_code = self.horizontal_code
+        tile_mask = self.tile_mask
+        for index, shift in enumerate(self.shifts):
+            code += horizontal_code[(state >> shift) & tile_mask][index]
+        return self.horizontal_table[code]
+    
+    def initial(self, state):
+        return self._vertical(state) + self._horizontal(state)
+    
+    def delta(self, state, move, parent_h):
+        child = self.layout.move_blank(state, move)
+        if (state >> self.blank_shift) // self.size == move // self.size:
+            # Bước đi ngang: phần walking distance theo hàng không đổi
+            return parent_h - self._horizontal(state) + self._horizontal(child)
+        return parent_h - self._vertical(state) + self._vertical(child)
+
+
+class FullHeuristic:
+    """
+    Bọc một heuristic_func(state, goal_state) bất kỳ theo cùng giao diện
+    initial/delta bằng cách tính lại h đầy đủ cho trạng thái con
+    """
+    
+    def __init__(self, heuristic_func, goal_state):
+        self.heuristic_func = heuristic_func
+        self.goal_state = goal_state
+        self.layout = layout_of(goal_state)
+    
+    def initial(self, state):
+        return self.heuristic_func(self.layout.unpack(state), self.goal_state)
+    
+    def delta(self, state, move, parent_h):
+        layout = self.layout
+        return self.heuristic_func(layout.unpack(layout.move_blank(state, move)), self.goal_state)
+
+
+# Heuristic có phiên bản cập nhật tăng dần: heuristic_func -> hàm tạo theo goal_state
+INCREMENTAL_HEURISTICS = {
+    manhattan_distance: IncrementalManhattan,
+    linear_conflict: IncrementalLinearConflict,
+    walking_distance: IncrementalWalkingDistance
+}
+
+
+@lru_cache(maxsize=32)
+def _build_incremental_heuristic(heuristic_func, goal_key):
+    goal_state = [list(row) for row in goal_key]
+    if hasattr(heuristic_func, 'for_goal'):
+        # Đối tượng heuristic tự cung cấp initial/delta (ví dụ pattern database)
+        return heuristic_func.for_goal(goal_state)
+    incremental_class = INCREMENTAL_HEURISTICS.get(heuristic_func)
+    if incremental_class is None:
+        return FullHeuristic(heuristic_func, goal_state)
+    return incremental_class(goal_state)
+
+
+def get_incremental_heuristic(goal_state, heuristic_func=manhattan_distance):
+    """
+    Trả về đối tượng heuristic có initial(state) và delta(state, move, parent_h)
+    cho goal_state, được tạo một lần và dùng lại giữa các lần tìm kiếm
+    """
+    return _build_incremental_heuristic(heuristic_func, tuple(tuple(row) for row in goal_state))
@@ -1,78 +1,119 @@
 """IDA* Search implementation for 8-puzzle"""
-from .heuristics import manhattan_distance
+from .heuristics import manhattan_distance, get_incremental_heuristic
+from .budget import budgeted
 
-class Node:
-    def __init__(self, state, parent=None, move=None, g=0):
-        self.state = state          # Trạng thái hiện tại của puzzle
-        self.parent = parent        # Nút cha
-        self.move = move            # Bước đi dẫn đến trạng thái này
-        self.g = g                  # Chi phí từ trạng thái đầu đến trạng thái hiện tại
-        self.h = 0                  # Giá trị heuristic (khoảng cách Manhattan đến đích)
-        self.f = 0                  # Tổng chi phí (f = g + h)
+# Số trạng thái tối đa của bảng chuyển vị (transposition table) trong một lần lặp
+DEFAULT_TABLE_SIZE = 1 << 18
 
-def ida_star_search(puzzle):
-   
+@budgeted
+def ida_star_search(puzzle, heuristic_func=manhattan_distance, table_size=DEFAULT_TABLE_SIZE,
+                    budget=None):
+    """
+    IDA* trên trạng thái đã nén, dùng được cho mọi kích thước N x N.
+    table_size: số trạng thái tối đa của bảng chuyển vị (0 để tắt).
+    Returns (path from initial to goal, nodes explored) or (None, nodes explored)
+    """
     if not puzzle.is_solvable():
         return None, 0
-    threshold = manhattan_distance(puzzle.initial_state, puzzle.goal_state)
-    path = [puzzle.initial_state]
-    nodes_explored = [0]
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    # Heuristic (mặc định Manhattan) được cập nhật tăng dần theo từng bước đi
+    heuristic = get_incremental_heuristic(puzzle.goal_state, heuristic_func)
+    path, nodes_explored = ida_star(start, goal, puzzle.layout, heuristic, table_size, budget)
+    if path is None:
+        return None, nodes_explored
+    return [puzzle.unpack_state(state) for state in path], nodes_explored
 
-    def search(path, g, threshold):
-        """Hàm tìm kiếm đệ quy cho IDA*"""
-        # Lấy trạng thái hiện tại từ cuối đường đi
-        node = path[-1]
-        # Tính tổng chi phí f = g + h
-        # g: Chi phí từ trạng thái đầu đến hiện tại
-        # h: Ước lượng khoảng cách từ hiện tại đến đích (heuristic)
-        f = g + manhattan_distance(node, puzzle.goal_state)
+def ida_star(start, goal, layout, heuristic, table_size=DEFAULT_TABLE_SIZE, budget=None):
+    """
+    Vòng lặp IDA* trên trạng thái đã nén (xem models.packed_state).
 
-        # Nếu f vượt quá ngưỡng, trả về giá trị f để cập nhật ngưỡng mới
-        if f > threshold:
-            return f
+    - Duyệt theo chiều sâu bằng ngăn xếp tường minh: không bị giới hạn đệ quy
+      của Python khi ngưỡng lớn. path[g] là trạng thái ở độ sâu g trên nhánh
+      hiện tại.
+    - Bỏ bước đi ngược lại bước vừa đi (ô trống quay về vị trí của nút cha):
+      chỉ là một phép so sánh chỉ số, thay cho việc quét cả đường đi.
+    - Bảng chuyển vị (tùy chọn, giới hạn table_size trạng thái) lưu g nhỏ nhất
+      đã gặp của mỗi trạng thái trong lần lặp hiện tại; gặp lại với g không nhỏ
+      hơn thì cây con đó đã được duyệt với ngưỡng rộng hơn nên bỏ qua.
+    - h được tính tăng dần qua heuristic.delta.
 
-        # Nếu đạt đến trạng thái đích, trả về kết quả thành công
-        if puzzle.is_goal(node):
-            return "FOUND"
+    Khi hết budget (algorithms.budget), trả về đường đi tới trạng thái có h nhỏ
+    nhất đã gặp.
+    Returns (packed path from start to goal, nodes explored) or (None, nodes explored)
+    """
+    move_table = layout.move_table
+    tile_bits = layout.tile_bits
+    tile_mask = layout.tile_mask
+    blank_shift = layout.blank_shift
+    tiles_mask = layout.tiles_mask
+    delta = heuristic.delta
 
-        # Khởi tạo ngưỡng nhỏ nhất tiếp theo
-        min_threshold = float('inf')
-        # Khám phá tất cả các bước đi có thể từ trạng thái hiện tại
-        for move in puzzle.get_possible_moves(node):
-            try:
-                # Tạo trạng thái mới từ bước đi
-                new_state = puzzle.apply_move(node, move)
-                # Tránh trường hợp quay lại trạng thái đã đi qua trên đường đi hiện tại
-                if new_state not in path:  # Tránh vòng lặp
-                    # Thêm trạng thái mới vào đường đi
-                    path.append(new_state)
-                    # Tăng số nút đã khám phá
-                    nodes_explored[0] += 1
-                    # Tiếp tục tìm kiếm đệ quy với độ sâu tăng thêm 1
-                    temp = search(path, g + 1, threshold)
-                    # Nếu tìm thấy đường đi tới đích, trả về kết quả
-                    if temp == "FOUND":
-                        return "FOUND"
-                    # Cập nhật ngưỡng nhỏ nhất cho lần lặp tiếp theo
-                    if temp < min_threshold:
-                        min_threshold = temp
-                    # Quay lại: loại bỏ trạng thái hiện tại khỏi đường đi
-                    path.pop()
-            except ValueError:
-                continue  # Bỏ qua các bước đi không hợp lệ
-
-        # Trả về ngưỡng mới cho lần lặp tiếp theo
-        return min_threshold
+    start_h = heuristic.initial(start)
+    threshold = start_h
+    nodes_explored = 0
+    # Đường đi tới trạng thái có h nhỏ nhất đã gặp (kết quả tốt nhất khi hết budget)
+    closest = [start]
+    closest_h = start_h
 
     # Vòng lặp chính của thuật toán IDA*
     while True:
-        # Thực hiện tìm kiếm với ngưỡng hiện tại
-        temp = search(path, 0, threshold)
-        # Nếu tìm thấy đường đi đến đích
-        if temp == "FOUND":
-            return path, nodes_explored[0]
+        next_threshold = float('inf')
+        table = {start: 0} if table_size else {}
+        path = []
+        # Mỗi phần tử: (trạng thái, g, h) - nút đã sinh, chờ mở rộng
+        stack = [(start, 0, start_h)]
+        while stack:
+            if budget is not None and budget.exceeded(nodes_explored, len(table) + len(stack)):
+                return closest, nodes_explored
+            state, g, h = stack.pop()
+            # Cắt nhánh hiện tại về độ sâu của nút và thêm nút vào cuối
+            del path[g:]
+            path.append(state)
+            if h < closest_h:
+                closest_h = h
+                closest = path[:]
+
+            if state == goal:
+                return path, nodes_explored
+
+            blank = state >> blank_shift
+            parent_blank = path[g - 1] >> blank_shift if g else -1
+            tiles = state & tiles_mask
+            blank_tile_shift = blank * tile_bits
+            child_g = g + 1
+            children = []
+            for move, target in move_table[blank]:
+                # Bỏ qua bước đi làm ô trống quay lại vị trí cũ
+                if target == parent_blank:
+                    continue
+                target_shift = target * tile_bits
+                tile = (tiles >> target_shift) & tile_mask
+                new_state = (tiles + (tile << blank_tile_shift)
+                             - (tile << target_shift)) | (target << blank_shift)
+                nodes_explored += 1
+                new_h = delta(state, target, h)
+                f = child_g + new_h
+                # Nếu f vượt quá ngưỡng, ghi nhận làm ứng viên cho ngưỡng mới
+                if f > threshold:
+                    if f < next_threshold:
+                        next_threshold = f
+                    continue
+                # Trạng thái đã gặp với g không lớn hơn trong lần lặp này
+                seen_g = table.get(new_state)
+                if seen_g is not None:
+                    if seen_g <= child_g:
+                        continue
+                    table[new_state] = child_g
+                elif len(table) < table_size:
+                    table[new_state] = child_g
+                children.append((new_state, child_g, new_h))
+            # Đẩy theo thứ tự ngược để mở rộng theo thứ tự up, down, left, right
+            children.reverse()
+            stack.extend(children)
+
         # Nếu không còn đường đi nào để khám phá
-        if temp == float('inf'):
-            return None, nodes_explored[0]
+        if next_threshold == float('inf'):
+            return None, nodes_explored
         # Tăng ngưỡng lên giá trị mới tìm được cho lần lặp tiếp theo
-        threshold = temp
+        threshold = next_threshold
@@ -1,6 +1,10 @@
 """Iterative Deepening Search implementation for 8-puzzle"""
+from models.permutation_rank import new_state_table
+from models.search_arena import SearchArena
+from .budget import budgeted
 
-def ids_search(puzzle, max_depth=50):
+@budgeted
+def ids_search(puzzle, max_depth=50, budget=None):
    
     if not puzzle.is_solvable():
         return None, 0
@@ -8,9 +12,13 @@ def ids_search(puzzle, max_depth=50):
     total_nodes_explored = 0
     
     for depth_limit in range(max_depth + 1):
-        result, nodes = depth_limited_search(puzzle, depth_limit)
+        result, nodes = depth_limited_search(puzzle, depth_limit, budget, total_nodes_explored)
         total_nodes_explored += nodes
         
+        # Dừng sớm vì hết budget
+        if budget is not None and budget.stopped:
+            return None, total_nodes_explored
+        
         # Nếu tìm thấy đường đi, trả về kết quả
         if result is not None:
             return result, total_nodes_explored
@@ -18,40 +26,43 @@ def ids_search(puzzle, max_depth=50):
     # Không tìm thấy đường đi trong giới hạn độ sâu
     return None, total_nodes_explored
 
-def depth_limited_search(puzzle, depth_limit):
+def depth_limited_search(puzzle, depth_limit, budget=None, explored_before=0):
+    """explored_before: số nút đã sinh ở các lần lặp trước, để so với budget"""
    
-    stack = [[puzzle.initial_state]]
-    visited = {puzzle.get_state_string(puzzle.initial_state)}
+    # Trạng thái đã nén, tập đã thăm là bitset đánh chỉ số theo hạng Lehmer
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    layout = puzzle.layout
+    arena = SearchArena(start, layout)
+    stack = [0]
+    state_key, visited = new_state_table(layout)
+    visited[state_key(start)] = 1
     nodes_explored = 1
     
     while stack:
-        # Lấy đường đi từ đỉnh ngăn xếp
-        path = stack.pop()
-        state = path[-1]
+        if budget is not None and budget.exceeded(explored_before + nodes_explored, len(arena)):
+            return None, nodes_explored
+        # Lấy chỉ số nút từ đỉnh ngăn xếp
+        index = stack.pop()
+        state = arena.states[index]
         
         # Kiểm tra nếu đã đạt đến trạng thái đích
-        if puzzle.is_goal(state):
-            return path, nodes_explored
+        if state == goal:
+            return [puzzle.unpack_state(s) for s in arena.path(index)], nodes_explored
         
         # Nếu chưa đạt đến độ sâu giới hạn, tiếp tục khám phá
-        if len(path) <= depth_limit:
+        if arena.depths[index] < depth_limit:
             # Khám phá tất cả các trạng thái kế tiếp có thể
             # Lưu ý: Ngược với DFS thông thường, ta duyệt các bước đi theo thứ tự ngược
             # để ưu tiên khám phá theo thứ tự các bước đi tự nhiên
-            for move in reversed(puzzle.get_possible_moves(state)):
-                try:
-                    new_state = puzzle.apply_move(state, move)
-                    state_string = puzzle.get_state_string(new_state)
-                    
-                    # Nếu trạng thái mới chưa được khám phá, thêm vào ngăn xếp
-                    if state_string not in visited:
-                        visited.add(state_string)
-                        new_path = list(path)
-                        new_path.append(new_state)
-                        stack.append(new_path)
-                        nodes_explored += 1
-                except ValueError:
-                    continue  # Bỏ qua các bước đi không hợp lệ
+            for move, target, new_state in reversed(layout.get_successors(state)):
+                rank = state_key(new_state)
+                
+                # Nếu trạng thái mới chưa được khám phá, thêm vào ngăn xếp
+                if not visited[rank]:
+                    visited[rank] = 1
+                    stack.append(arena.add(new_state, index))
+                    nodes_explored += 1
     
     # Không tìm thấy đường đi với độ sâu giới hạn hiện tại
     return None, nodes_explored
@@ -0,0 +1,31 @@
+"""Search tree node shared by the informed and local searches"""
+
+
+class Node:
+    """
+    Nút của cây tìm kiếm. Dùng __slots__ (không có __dict__) vì đây là đối
+    tượng được tạo nhiều nhất trong các lần chạy A*/UCS dài.
+    """
+
+    __slots__ = ('state', 'parent', 'g', 'h')
+
+    def __init__(self, state, parent=None, g=0, h=0):
+        self.state = state      # Trạng thái (số nguyên đã nén hoặc ma trận, tùy thuật toán)
+        self.parent = parent    # Nút cha (None với nút gốc)
+        self.g = g              # Chi phí từ trạng thái đầu đến nút này
+        self.h = h              # Giá trị heuristic
+
+    @property
+    def f(self):
+        """Tổng chi phí f = g + h"""
+        return self.g + self.h
+
+    def path(self):
+        """Các trạng thái từ nút gốc tới nút này"""
+        path = []
+        node = self
+        while node is not None:
+            path.append(node.state)
+            node = node.parent
+        path.reverse()
+        return path
@@ -0,0 +1,211 @@
+"""
+Additive pattern database heuristic for 8-puzzle (and the 15-puzzle)
+
+Các ô số được chia thành các nhóm rời nhau (mặc định 4-4). Với mỗi nhóm, bảng
+lưu số bước tối thiểu để đưa các ô của nhóm về đúng vị trí đích, chỉ tính các
+bước di chuyển ô thuộc nhóm (bước đi của ô ngoài nhóm có chi phí 0). Vì vậy tổng
+giá trị của các nhóm vẫn là heuristic chấp nhận được (admissible).
+
+Mỗi bảng được tạo bằng BFS ngược từ trạng thái đích, lưu dưới dạng mảng byte
+(một byte cho mỗi trạng thái trừu tượng) và được ghi vào thư mục cache rồi
+memory-map lại, nên chỉ phải tạo một lần cho mỗi goal_state. Cách chia nhóm
+mặc định có cho lưới 3x3 (4-4) và 4x4 (5-5-5, mỗi bảng 5.7 MB, lần tạo đầu tiên
+mất vài phút); các kích thước khác cần truyền partition.
+"""
+import mmap
+import os
+from collections import deque
+from functools import lru_cache
+from models.packed_state import layout_of
+from models.permutation_rank import lower_count_table
+from .heuristics import INCREMENTAL_HEURISTICS
+
+DEFAULT_PARTITION = ((1, 2, 3, 4), (5, 6, 7, 8))
+DEFAULT_PARTITIONS = {
+    3: DEFAULT_PARTITION,
+    4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+}
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', '8puzzle', 'pdb')
+
+
+def _table_size(length, cells):
+    """Số cách đặt length đối tượng phân biệt vào cells vị trí"""
+    size = 1
+    for i in range(length):
+        size *= cells - i
+    return size
+
+
+def _rank_positions(positions, cells, lower_count):
+    """Xếp hạng (dày đặc) một dãy vị trí phân biệt - mã Lehmer cho hoán vị từng phần"""
+    rank = 0
+    used = 0
+    for i, position in enumerate(positions):
+        rank = rank * (cells - i) + lower_count[used][position]
+        used |= 1 << position
+    return rank
+
+
+def _build_table(pattern, goal_state):
+    """
+    BFS 0-1 ngược từ trạng thái đích trên không gian trừu tượng
+    (vị trí các ô của nhóm + vị trí ô trống)
+    """
+    layout = layout_of(goal_state)
+    size, cells = layout.size, layout.cells
+    lower_count = lower_count_table(cells)
+    goal_positions = {}
+    for i in range(size):
+        for j in range(size):
+            goal_positions[goal_state[i][j]] = i * size + j
+
+    # Trạng thái trừu tượng: tuple vị trí của các ô trong nhóm, ô trống ở cuối
+    start = tuple(goal_positions[tile] for tile in pattern) + (goal_positions[0],)
+    blank_slot = len(pattern)
+
+    unvisited = 255
+    table = bytearray([unvisited]) * _table_size(len(start), cells)
+    table[_rank_positions(start, cells, lower_count)] = 0
+
+    frontier = deque([(start, 0)])
+    while frontier:
+        positions, cost = frontier.popleft()
+        if table[_rank_positions(positions, cells, lower_count)] < cost:
+            continue
+        blank = positions[blank_slot]
+        for move, target in layout.move_table[blank]:
+            new_positions = list(positions)
+            new_positions[blank_slot] = target
+            step = 0
+            if target in positions:
+                # Ô trống đổi chỗ với một ô thuộc nhóm: bước đi có chi phí 1
+                new_positions[positions.index(target)] = blank
+                step = 1
+            new_positions = tuple(new_positions)
+            rank = _rank_positions(new_positions, cells, lower_count)
+            new_cost = cost + step
+            if new_cost < table[rank]:
+                table[rank] = new_cost
+                # BFS 0-1: bước chi phí 0 được xét trước
+                if step:
+                    frontier.append((new_positions, new_cost))
+                else:
+                    frontier.appendleft((new_positions, new_cost))
+    return table
+
+
+def _load_table(pattern, goal_state, cache_dir):
+    """Đọc bảng từ cache (memory-map) hoặc tạo mới và ghi vào cache"""
+    if cache_dir is None:
+        return _build_table(pattern, goal_state)
+
+    # Số từ 10 trở lên cần dấu phân cách để tên file không bị nhập nhằng
+    separator = '' if len(goal_state) <= 3 else '-'
+    goal_key = separator.join(str(num) for row in goal_state for num in row)
+    pattern_key = ''.join(str(tile) for tile in pattern)
+    filename = os.path.join(cache_dir, f"pdb_{goal_key}_{pattern_key}.bin")
+    expected_size = _table_size(len(pattern) + 1, layout_of(goal_state).cells)
+
+    if not os.path.exists(filename) or os.path.getsize(filename) != expected_size:
+        table = _build_table(pattern, goal_state)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_filename = f"{filename}.{os.getpid()}.tmp"
+            with open(temp_filename, 'wb') as f:
+                f.write(table)
+            os.replace(temp_filename, filename)
+        except OSError:
+            # Không ghi được cache: dùng bảng trong bộ nhớ
+            return table
+
+    with open(filename, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class AdditivePatternDatabase:
+    """
+    Heuristic pattern database cộng dồn cho một goal_state.
+
+    Có thể truyền trực tiếp làm heuristic_func (gọi với (state, goal_state)) hoặc
+    dùng initial/delta trên trạng thái đã nén như các heuristic tăng dần khác.
+    """
+
+    def __init__(self, goal_state, partition=None, cache_dir=DEFAULT_CACHE_DIR):
+        layout = layout_of(goal_state)
+        if partition is None:
+            partition = DEFAULT_PARTITIONS.get(layout.size)
+            if partition is None:
+                raise ValueError(f"No default partition for {layout.size}x{layout.size} puzzles")
+        tiles = sorted(tile for pattern in partition for tile in pattern)
+        if len(tiles) != len(set(tiles)) or not set(tiles) <= set(range(1, layout.cells)):
+            raise ValueError(f"Invalid partition: {partition}")
+
+        self.layout = layout
+        self.cells = layout.cells
+        self.lower_count = lower_count_table(layout.cells)
+        self.goal_state = [row[:] for row in goal_state]
+        self.partition = tuple(tuple(pattern) for pattern in partition)
+        self.cache_dir = cache_dir
+        self.tables = [_load_table(pattern, goal_state, cache_dir) for pattern in self.partition]
+
+    def evaluate(self, positions):
+        """Tổng giá trị các bảng, positions[tile] là vị trí hiện tại của tile"""
+        cells = self.cells
+        lower_count = self.lower_count
+        blank = positions[0]
+        h = 0
+        for pattern, table in zip(self.partition, self.tables):
+            rank = 0
+            used = 0
+            for i, tile in enumerate(pattern):
+                position = positions[tile]
+                rank = rank * (cells - i) + lower_count[used][position]
+                used |= 1 << position
+            h += table[rank * (cells - len(pattern)) + lower_count[used][blank]]
+        return h
+
+    def initial(self, state):
+        """Tính h cho trạng thái đã nén"""
+        layout = self.layout
+        tile_bits, tile_mask = layout.tile_bits, layout.tile_mask
+        positions = [0] * self.cells
+        for index in range(self.cells):
+            positions[(state >> (index * tile_bits)) & tile_mask] = index
+        return self.evaluate(positions)
+
+    def delta(self, state, move, parent_h):
+        """Vị trí ô trống thay đổi ảnh hưởng tới mọi nhóm nên tính lại cho trạng thái con"""
+        return self.initial(self.layout.move_blank(state, move))
+
+    def for_goal(self, goal_state):
+        """Trả về pattern database (cùng cách chia nhóm) cho goal_state"""
+        if goal_state == self.goal_state:
+            return self
+        return get_pattern_database(goal_state, self.partition, self.cache_dir)
+
+    def __call__(self, state, goal_state=None):
+        if goal_state is not None and goal_state != self.goal_state:
+            return self.for_goal(goal_state)(state)
+        return self.initial(self.layout.pack(state))
+
+
+@lru_cache(maxsize=16)
+def _get_pattern_database(goal_key, partition, cache_dir):
+    return AdditivePatternDatabase([list(row) for row in goal_key], partition, cache_dir)
+
+
+def get_pattern_database(goal_state, partition=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Pattern database cho goal_state, được tạo (hoặc đọc từ cache) một lần"""
+    if partition is not None:
+        partition = tuple(tuple(pattern) for pattern in partition)
+    return _get_pattern_database(tuple(tuple(row) for row in goal_state), partition, cache_dir)
+
+
+def pattern_database(state, goal_state):
+    """
+    Heuristic pattern database cộng dồn (4-4 cho 3x3, 5-5-5 cho 4x4), dùng như manhattan_distance
+    """
+    return get_pattern_database(goal_state)(state)
+
+
+INCREMENTAL_HEURISTICS[pattern_database] = get_pattern_database
@@ -1,5 +1,6 @@
 
 import numpy as np
+import os
 import random
 import time
 import copy
@@ -7,56 +8,74 @@ import tkinter as tk
 from tkinter import Toplevel, Frame, Label, Button, BOTH
 from tkinter import scrolledtext, ttk
 from models.puzzle import Puzzle
+from models.packed_state import default_goal_state
+from .q_table import new_q_table, q_table_filename, DenseQTable, DIRECTIONS, DEFAULT_CACHE_DIR
+from .q_learning_vectorized import VectorizedQTrainer, DEFAULT_ENVS
+from .value_iteration import ValueIterationPlanner
 
 class QLearning:
-    """Thuật toán Q-learning cho bài toán 8-puzzle"""
+    """Thuật toán Q-learning cho bài toán 8-puzzle (và lưới N x N)"""
     
-    def __init__(self, learning_rate=0.1, discount_factor=0.9, exploration_rate=0.3, goal_state=None):
+    def __init__(self, learning_rate=0.1, discount_factor=0.9, exploration_rate=0.3, goal_state=None, size=3,
+                 dense=True):
         
-        self.q_table = {}  # Bảng Q lưu giá trị Q(s,a)
         self.alpha = learning_rate
         self.gamma = discount_factor
         self.epsilon = exploration_rate
         
-        # Trạng thái đích
+        # Trạng thái đích (kích thước lưới lấy theo goal_state nếu có)
         if goal_state is None:
-            self.goal_state = [
-                [1, 2, 3],
-                [4, 5, 6],
-                [7, 8, 0]
-            ]
+            self.goal_state = default_goal_state(size)
         else:
             self.goal_state = goal_state
+        self.size = len(self.goal_state)
+        
+        # Bảng Q lưu giá trị Q(s,a): mảng float32 đánh chỉ số theo hạng hoán vị
+        # cho lưới 3x3 (dense), dict cho lưới lớn hơn (xem algorithms.q_table)
+        self.q_table = new_q_table(self.size, dense)
+        if isinstance(self.q_table, DenseQTable):
+            self._init_packed_training()
         
         # Thống kê huấn luyện
         self.episodes_completed = 0
         self.success_count = 0
         self.avg_steps = 0
         
+    def _init_packed_training(self):
+        """Dữ liệu cho vòng huấn luyện trên trạng thái đã nén (_train_packed)"""
+        layout = self.q_table.layout
+        self._goal_packed = layout.pack(self.goal_state)
+        self._goal_cells = [num for row in self.goal_state for num in row]
+        self._actions_at = [
+            [(action, blank + dx * self.size + dy)
+             for action, (dx, dy) in enumerate(DIRECTIONS) if legal[action]]
+            for blank, legal in enumerate(self.q_table.legal.tolist())
+        ]
+        
     def get_state_key(self, state):
         """
-        Chuyển đổi ma trận state thành tuple để làm khóa cho q_table
+        Chuyển đổi ma trận state thành khóa cho q_table
         
         Args:
-            state (list): Ma trận 3x3 biểu diễn trạng thái
+            state (list): Ma trận size x size biểu diễn trạng thái
             
         Returns:
-            tuple: Tuple biểu diễn trạng thái
+            Khóa của trạng thái (chỉ số hàng với bảng dày đặc, tuple với dict)
         """
-        return tuple(tuple(row) for row in state)
+        return self.q_table.key(state)
         
     def get_empty_position(self, state):
         """
         Tìm vị trí ô trống (giá trị 0) trong trạng thái
         
         Args:
-            state (list): Ma trận 3x3 biểu diễn trạng thái
+            state (list): Ma trận size x size biểu diễn trạng thái
             
         Returns:
             tuple: Tọa độ (row, col) của ô trống
         """
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.size):
+            for j in range(self.size):
                 if state[i][j] == 0:
                     return (i, j)
         return None
@@ -72,7 +91,7 @@ class QLearning:
         
         for action, (dx, dy) in enumerate(directions):
             new_x, new_y = empty_pos[0] + dx, empty_pos[1] + dy
-            if 0 <= new_x < 3 and 0 <= new_y < 3:  # Kiểm tra biên
+            if 0 <= new_x < self.size and 0 <= new_y < self.size:  # Kiểm tra biên
                 valid_actions.append(action)
                 
         return valid_actions, empty_pos
@@ -138,7 +157,7 @@ class QLearning:
             return -5 * abs(tile_diff)  # Phần phạt lớn hơn nếu làm tương trạng tài
         else:
             # Khuyến khích các bước tiến gần với trạng thái đích
-            if correct_tiles_after >= 7:  # Nếu đã có nhiều ô đúng vị trí
+            if correct_tiles_after >= self.size * self.size - 2:  # Nếu đã có nhiều ô đúng vị trí
                 return 0  # Không phạt nặng
             
             return -1  # Phần thưởng âm nhỏ cho các bước không thay đổi số ô đúng
@@ -166,8 +185,8 @@ class QLearning:
             int: Số ô đúng vị trí
         """
         count = 0
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.size):
+            for j in range(self.size):
                 if state[i][j] == self.goal_state[i][j]:
                     count += 1
         return count
@@ -193,22 +212,14 @@ class QLearning:
         state_key = self.get_state_key(state)
         
         # Nếu trạng thái chưa có trong bảng Q, khởi tạo giá trị
-        if state_key not in self.q_table:
-            self.q_table[state_key] = {}
-            for a in range(4):  # 4 hành động có thể
-                self.q_table[state_key][a] = 0.0
+        self.q_table.add(state_key)
         
         # Chiến lược epsilon-greedy
         if random.random() < self.epsilon:  # Khám phá
             return random.choice(valid_actions), empty_pos
         else:  # Khai thác
-            # Lấy giá trị Q cho các hành động hợp lệ
-            q_values = [(action, self.q_table[state_key].get(action, 0.0)) 
-                      for action in valid_actions]
-            
-            # Chọn hành động có giá trị Q cao nhất
-            best_action = max(q_values, key=lambda x: x[1])[0]
-            return best_action, empty_pos
+            # Chọn hành động hợp lệ có giá trị Q cao nhất
+            return self.q_table.best_action(state_key, valid_actions), empty_pos
     
     def update_q_value(self, state, action, reward, next_state):
         """
@@ -224,29 +235,9 @@ class QLearning:
         state_key = self.get_state_key(state)
         next_state_key = self.get_state_key(next_state)
         
-        # Khởi tạo nếu chưa có
-        if state_key not in self.q_table:
-            self.q_table[state_key] = {}
-            for a in range(4):
-                self.q_table[state_key][a] = 0.0
-                
-        if next_state_key not in self.q_table:
-            self.q_table[next_state_key] = {}
-            for a in range(4):
-                self.q_table[next_state_key][a] = 0.0
-        
-        # Tính giá trị Q mới dựa trên công thức Q-learning
+        # Tính giá trị Q mới dựa trên công thức Q-learning (khởi tạo nếu chưa có)
         # Q(s,a) = Q(s,a) + α * [r + γ * max(Q(s',a')) - Q(s,a)]
-        old_value = self.q_table[state_key].get(action, 0.0)
-        
-        # Tìm giá trị Q lớn nhất cho trạng thái tiếp theo
-        next_max = max(self.q_table[next_state_key].values()) if self.q_table[next_state_key] else 0
-        
-        # Tính giá trị mới
-        new_value = old_value + self.alpha * (reward + self.gamma * next_max - old_value)
-        
-        # Cập nhật vào bảng Q
-        self.q_table[state_key][action] = new_value
+        self.q_table.update(state_key, action, reward, next_state_key, self.alpha, self.gamma)
     
     def create_initial_state(self, goal_state=None, shuffle_steps=20):
         """
@@ -309,6 +300,9 @@ class QLearning:
         if status_callback:
             status_callback(f"Bắt đầu huấn luyện một tập từ trạng thái ban đầu...")
         
+        if isinstance(self.q_table, DenseQTable):
+            return self._train_packed(state, max_steps, status_callback)
+        
         # Huấn luyện trên trạng thái ban đầu đã cho
         while steps < max_steps:
             # Chọn hành động dựa trên chiến lược epsilon-greedy
@@ -352,6 +346,182 @@ class QLearning:
         
         return False, steps, state, path
     
+    def policy_filename(self, cache_dir=DEFAULT_CACHE_DIR):
+        """File mặc định lưu bảng Q của agent (theo goal_state và các siêu tham số)"""
+        return q_table_filename(self.goal_state, self.alpha, self.gamma, self.epsilon, cache_dir)
+    
+    def save(self, filename=None):
+        """
+        Lưu bảng Q (chỉ bảng dày đặc 3x3) ra file .npy
+        
+        Args:
+            filename (str, optional): Đường dẫn file. Nếu None, dùng policy_filename()
+            
+        Returns:
+            str: Đường dẫn file đã lưu
+        """
+        if not isinstance(self.q_table, DenseQTable):
+            raise ValueError("Only dense Q-tables (3x3 puzzle) can be saved")
+        if filename is None:
+            filename = self.policy_filename()
+        self.q_table.save(filename)
+        return filename
+    
+    def load(self, filename=None, mmap_mode='c'):
+        """
+        Nạp bảng Q đã lưu để giải hoặc huấn luyện tiếp (warm start)
+        
+        Args:
+            filename (str, optional): Đường dẫn file. Nếu None, dùng policy_filename()
+            mmap_mode (str, optional): Cách memory-map file (xem DenseQTable.load)
+            
+        Returns:
+            bool: True nếu đã nạp, False nếu chưa có file
+        """
+        if self.size != 3:
+            raise ValueError("Only dense Q-tables (3x3 puzzle) can be loaded")
+        if filename is None:
+            filename = self.policy_filename()
+        if not os.path.exists(filename):
+            return False
+        self.q_table = DenseQTable.load(filename, mmap_mode)
+        self._init_packed_training()
+        return True
+    
+    def train_batch(self, episodes, shuffle_steps=20, max_steps=100, num_envs=DEFAULT_ENVS,
+                    progress_callback=None, seed=None):
+        """
+        Huấn luyện nhiều episode cùng lúc trên num_envs môi trường bằng NumPy
+        (xem algorithms.q_learning_vectorized), chỉ dùng được với bảng Q dày đặc
+        
+        Args:
+            episodes (int): Tổng số episode, mỗi episode bắt đầu từ một trạng thái xáo trộn
+            shuffle_steps (int): Số bước xáo trộn trạng thái ban đầu
+            max_steps (int): Số bước tối đa cho mỗi episode
+            num_envs (int): Số môi trường chạy song song
+            progress_callback (function, optional): Nhận TrainingStats trong khi huấn luyện
+            seed (int, optional): Hạt giống cho bộ sinh số ngẫu nhiên
+            
+        Returns:
+            TrainingStats: số episode, tỷ lệ thành công, episodes/giây...
+        """
+        trainer = VectorizedQTrainer(self, num_envs, seed)
+        return trainer.train(episodes, shuffle_steps, max_steps, progress_callback)
+    
+    def train_parallel(self, episodes, shuffle_steps=20, max_steps=100, workers=None, mode="hogwild",
+                       sync_every=None, num_envs=DEFAULT_ENVS, progress_callback=None, seed=None):
+        """
+        Huấn luyện như train_batch trên nhiều tiến trình worker dùng chung bảng Q
+        trong bộ nhớ chung (xem algorithms.q_learning_parallel)
+        
+        Args:
+            episodes (int): Tổng số episode, chia đều cho các worker
+            shuffle_steps (int): Số bước xáo trộn trạng thái ban đầu
+            max_steps (int): Số bước tối đa cho mỗi episode
+            workers (int, optional): Số tiến trình. Nếu None, dùng số nhân CPU
+            mode (str): "hogwild" (cùng ghi bảng chung) hoặc "average" (lấy trung bình định kỳ)
+            sync_every (int, optional): Số episode mỗi worker giữa hai lần lấy trung bình
+            num_envs (int): Số môi trường chạy song song trong mỗi worker
+            progress_callback (function, optional): Nhận TrainingStats tổng hợp trong khi huấn luyện
+            seed (int, optional): Hạt giống cho bộ sinh số ngẫu nhiên của các worker
+            
+        Returns:
+            TrainingStats: số episode, tỷ lệ thành công, episodes/giây...
+        """
+        from .q_learning_parallel import ParallelQTrainer, DEFAULT_SYNC_EVERY
+        trainer = ParallelQTrainer(self, workers, mode, sync_every or DEFAULT_SYNC_EVERY, num_envs, seed)
+        return trainer.train(episodes, shuffle_steps, max_steps, progress_callback)
+    
+    def _train_packed(self, state, max_steps, status_callback=None):
+        """
+        Vòng huấn luyện của train() cho bảng Q dày đặc: trạng thái là số nguyên
+        đã nén, chỉ số hàng được tính một lần mỗi bước, phần thưởng được cập nhật
+        theo ô vừa di chuyển thay vì đếm lại cả lưới. Cùng chuỗi số ngẫu nhiên và
+        cùng kết quả với các bước choose_action/apply_action/get_reward/update_q_value.
+        """
+        q_table = self.q_table
+        layout = q_table.layout
+        tile_bits, tile_mask = layout.tile_bits, layout.tile_mask
+        blank_shift, tiles_mask = layout.blank_shift, layout.tiles_mask
+        q, visited, packed_key = q_table.flat, q_table.visited_flat, q_table.packed_key
+        goal, goal_cells, actions_at = self._goal_packed, self._goal_cells, self._actions_at
+        alpha, gamma, epsilon = self.alpha, self.gamma, self.epsilon
+        near_goal = self.size * self.size - 2
+        rand, choice = random.random, random.choice
+        
+        packed = layout.pack(state)
+        key = packed_key(packed)
+        correct = self.count_correct_tiles(state)
+        packed_path = [packed]
+        steps = 0
+        
+        while steps < max_steps:
+            blank = packed >> blank_shift
+            moves = actions_at[blank]
+            base = key * 4
+            visited[key] = 1
+            
+            # Chiến lược epsilon-greedy
+            if rand() < epsilon:
+                action, target = choice(moves)
+            else:
+                action, target = moves[0]
+                best = q[base + action]
+                for move in moves[1:]:
+                    value = q[base + move[0]]
+                    if value > best:
+                        best = value
+                        action, target = move
+            
+            # Thực hiện hành động: ô số tại target chuyển vào vị trí ô trống
+            tile = (packed >> (target * tile_bits)) & tile_mask
+            next_packed = (((packed & tiles_mask) + (tile << (blank * tile_bits))
+                            - (tile << (target * tile_bits))) | (target << blank_shift))
+            
+            # Phần thưởng (như get_reward): chỉ hai ô blank và target thay đổi
+            if next_packed == goal:
+                reward = 100
+            else:
+                tile_diff = ((goal_cells[blank] == tile) + (goal_cells[target] == 0)
+                             - (goal_cells[blank] == 0) - (goal_cells[target] == tile))
+                correct += tile_diff
+                if tile_diff > 0:
+                    reward = 10 * tile_diff
+                elif tile_diff < 0:
+                    reward = 5 * tile_diff
+                elif correct >= near_goal:
+                    reward = 0
+                else:
+                    reward = -1
+            
+            # Cập nhật giá trị Q
+            next_key = packed_key(next_packed)
+            visited[next_key] = 1
+            start = next_key * 4
+            next_max = max(q[start:start + 4].tolist())
+            index = base + action
+            old_value = q[index]
+            q[index] = old_value + alpha * (reward + gamma * next_max - old_value)
+            
+            packed, key = next_packed, next_key
+            packed_path.append(packed)
+            steps += 1
+            
+            # Cập nhật tiến trình
+            if status_callback and steps % 10 == 0:
+                status_callback(f"Bước huấn luyện {steps}/{max_steps}")
+            
+            if packed == goal:
+                if status_callback:
+                    status_callback(f"Đã tìm được trạng thái đích sau {steps} bước!")
+                break
+        else:
+            if status_callback:
+                status_callback(f"Không tìm được trạng thái đích sau {max_steps} bước!")
+        
+        path = [layout.unpack(p) for p in packed_path]
+        return packed == goal, steps, path[-1], path
+    
     def solve(self, initial_state, visualization_callback=None, status_callback=None, delay=0.5):
         """
         Giải quyết puzzle bằng cách sử dụng bảng Q đã học
@@ -413,9 +583,7 @@ class QLearning:
             state_key = self.get_state_key(state)
             if state_key not in self.q_table:
                 # Nếu trạng thái chưa có trong bảng Q, khởi tạo nó
-                self.q_table[state_key] = {}
-                for a in range(4):
-                    self.q_table[state_key][a] = 0.0
+                self.q_table.add(state_key)
                     
                 # Nếu không có giá trị nào trong bảng Q, thử huấn luyện từ trạng thái này
                 if status_callback:
@@ -704,18 +872,16 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
         # Vô hiệu hóa các nút trong quá trình huấn luyện
         start_training_button.config(state="disabled")
         solve_button.config(state="disabled")
+        plan_button.config(state="disabled")
         close_button.config(state="disabled")
         
         # Cập nhật trạng thái huấn luyện
         training_status_label.config(text="Đang huấn luyện...")
         
-        # Khởi tạo agent
-        agent_var["instance"] = QLearning(
-            learning_rate=learning_params["alpha"],
-            discount_factor=learning_params["gamma"],
-            exploration_rate=learning_params["epsilon"],
-            goal_state=goal_state
-        )
+        # Khởi tạo agent, huấn luyện tiếp từ bảng Q đã lưu nếu có
+        agent_var["instance"] = create_agent()
+        if agent_var["instance"].load():
+            update_log(f"Huấn luyện tiếp từ bảng Q đã lưu ({len(agent_var['instance'].q_table)} trạng thái)")
         
         # Reset tiến trình
         progress_bar["value"] = 0
@@ -728,37 +894,69 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
         thread = threading.Thread(target=training_process, daemon=True)
         thread.start()
     
+    def create_agent():
+        """Agent Q-learning với các thông số huấn luyện của cửa sổ"""
+        return QLearning(
+            learning_rate=learning_params["alpha"],
+            discount_factor=learning_params["gamma"],
+            exploration_rate=learning_params["epsilon"],
+            goal_state=goal_state
+        )
+    
     def training_process():
         """Tiến trình huấn luyện"""
         agent = agent_var["instance"]
         episodes = learning_params["episodes"]
         shuffle_steps = learning_params["shuffle_steps"]
         
-        for i in range(episodes):
-            # Cập nhật tiến trình
-            progress_bar["value"] = (i / episodes) * 100
-            episodes_label.config(text=f"Số episodes: {i}/{episodes}")
-            training_stats_var["episode_count"] = i
-            
-            # Tạo trạng thái ban đầu
-            episode_initial = agent.create_initial_state(goal_state, shuffle_steps)
-            
-            # Huấn luyện một tập
-            success, steps, _, _ = agent.train(episode_initial)
+        if isinstance(agent.q_table, DenseQTable):
+            # Huấn luyện song song nhiều môi trường bằng NumPy
+            def report_progress(stats):
+                progress_bar["value"] = (stats.episodes / episodes) * 100
+                episodes_label.config(text=f"Số episodes: {stats.episodes}/{episodes} "
+                                           f"({stats.episodes_per_second:.0f} episodes/s)")
+                training_stats_var["episode_count"] = stats.episodes
+                training_stats_var["success_count"] = stats.successes
+                training_stats_var["total_steps"] = stats.success_steps
+                if stats.successes > 0:
+                    success_rate_label.config(text=f"Tỷ lệ thành công: {stats.success_rate * 100:.1f}%")
+                    avg_steps_label.config(text=f"Số bước trung bình: {stats.avg_steps:.1f}")
+                window.update()
             
-            if success:
-                training_stats_var["success_count"] += 1
-                training_stats_var["total_steps"] += steps
-            
-            # Cập nhật thống kê
-            if training_stats_var["success_count"] > 0:
-                success_rate = (training_stats_var["success_count"] / (i+1)) * 100
-                avg_steps = training_stats_var["total_steps"] / training_stats_var["success_count"]
-                success_rate_label.config(text=f"Tỷ lệ thành công: {success_rate:.1f}%")
-                avg_steps_label.config(text=f"Số bước trung bình: {avg_steps:.1f}")
-            
-            # Cập nhật giao diện
-            window.update()
+            workers = learning_params.get("workers", 1)
+            if workers > 1:
+                # Nhiều tiến trình dùng chung bảng Q, tiến độ đọc từ bộ nhớ chung
+                update_log(f"Huấn luyện song song trên {workers} tiến trình")
+                agent.train_parallel(episodes, shuffle_steps, workers=workers,
+                                     progress_callback=report_progress)
+            else:
+                agent.train_batch(episodes, shuffle_steps, progress_callback=report_progress)
+        else:
+            for i in range(episodes):
+                # Cập nhật tiến trình
+                progress_bar["value"] = (i / episodes) * 100
+                episodes_label.config(text=f"Số episodes: {i}/{episodes}")
+                training_stats_var["episode_count"] = i
+                
+                # Tạo trạng thái ban đầu
+                episode_initial = agent.create_initial_state(goal_state, shuffle_steps)
+                
+                # Huấn luyện một tập
+                success, steps, _, _ = agent.train(episode_initial)
+                
+                if success:
+                    training_stats_var["success_count"] += 1
+                    training_stats_var["total_steps"] += steps
+                
+                # Cập nhật thống kê
+                if training_stats_var["success_count"] > 0:
+                    success_rate = (training_stats_var["success_count"] / (i+1)) * 100
+                    avg_steps = training_stats_var["total_steps"] / training_stats_var["success_count"]
+                    success_rate_label.config(text=f"Tỷ lệ thành công: {success_rate:.1f}%")
+                    avg_steps_label.config(text=f"Số bước trung bình: {avg_steps:.1f}")
+                
+                # Cập nhật giao diện
+                window.update()
         
         # Hoàn thành huấn luyện
         progress_bar["value"] = 100
@@ -804,11 +1002,53 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
         log_text.insert("end", "\nBạn có thể bắt đầu giải quyết puzzle bằng nút 'Giải Puzzle'\n")
         log_text.config(state="disabled")
         
+        # Lưu bảng Q để dùng lại ở lần mở sau
+        if isinstance(agent.q_table, DenseQTable):
+            try:
+                update_log(f"Đã lưu bảng Q vào {agent.save()}")
+            except OSError as e:
+                update_log(f"Không lưu được bảng Q: {e}")
+        
         # Kích hoạt lại các nút
         start_training_button.config(state="normal")
         solve_button.config(state="normal")
+        plan_button.config(state="normal")
         close_button.config(state="normal")
     
+    def start_planning():
+        """Tính chính sách tối ưu bằng lặp giá trị thay cho huấn luyện"""
+        log_text.config(state="normal")
+        log_text.delete(1.0, "end")
+        log_text.insert("end", "Bắt đầu lặp giá trị (value iteration) trên toàn bộ không gian trạng thái...\n")
+        log_text.config(state="disabled")
+        
+        start_training_button.config(state="disabled")
+        plan_button.config(state="disabled")
+        solve_button.config(state="disabled")
+        close_button.config(state="disabled")
+        training_status_label.config(text="Đang lặp giá trị...")
+        progress_bar["value"] = 0
+        
+        def planning_process():
+            planner = ValueIterationPlanner(goal_state)
+            if planner.plan(status_callback=update_log):
+                agent_var["instance"] = planner
+                training_status_label.config(text="Đã có chính sách tối ưu!")
+                update_log("\nBạn có thể bắt đầu giải quyết puzzle bằng nút 'Giải Puzzle'")
+            else:
+                training_status_label.config(text="Lặp giá trị chưa hội tụ")
+            progress_bar["value"] = 100
+            
+            start_training_button.config(state="normal")
+            plan_button.config(state="normal")
+            close_button.config(state="normal")
+            if agent_var["instance"] is not None:
+                solve_button.config(state="normal")
+        
+        import threading
+        thread = threading.Thread(target=planning_process, daemon=True)
+        thread.start()
+    
     def start_solving():
         """Bắt đầu giải quyết puzzle"""
         agent = agent_var["instance"]
@@ -862,6 +1102,7 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
         # Vô hiệu hóa nút giải quyết
         solve_button.config(state="disabled")
         start_training_button.config(state="disabled")
+        plan_button.config(state="disabled")
         
         # Đọc trạng thái hiện tại từ bảng hiển thị
         current_state = []
@@ -887,9 +1128,7 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
             # Tạo một số trạng thái cơ bản và thêm vào bảng Q
             # Tạo và huấn luyện trạng thái hiện tại
             state_key = agent.get_state_key(current_state)
-            agent.q_table[state_key] = {}
-            for a in range(4):
-                agent.q_table[state_key][a] = 0.0
+            agent.q_table.add(state_key)
                 
             # Thực hiện 100 bước huấn luyện nhanh
             success, _, _, _ = agent.train(current_state, max_steps=100)
@@ -917,6 +1156,7 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
         # Kích hoạt lại các nút
         solve_button.config(state="normal")
         start_training_button.config(state="normal")
+        plan_button.config(state="normal")
     
     # Nút huấn luyện
     start_training_button = Button(button_frame, text="Huấn luyện Model", 
@@ -927,6 +1167,15 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
                          padx=15, pady=6)
     start_training_button.pack(side="left", padx=10)
     
+    # Nút lặp giá trị (chính sách tối ưu, không cần huấn luyện)
+    plan_button = Button(button_frame, text="Lặp giá trị",
+                         command=start_planning,
+                         font=("Arial", 11, "bold"),
+                         bg="#9C27B0", fg="white",
+                         relief="raised", borderwidth=2,
+                         padx=15, pady=6)
+    plan_button.pack(side="left", padx=10)
+    
     # Nút giải quyết
     solve_button = Button(button_frame, text="Giải Puzzle", 
                          command=start_solving,
@@ -949,5 +1198,12 @@ def show_qlearning_visualization(initial_state, goal_state, learning_params=None
     # Hiển thị trạng thái ban đầu
     update_visualization(initial_state)
     
+    # Nạp bảng Q đã lưu (nếu có) để giải ngay mà không cần huấn luyện lại
+    saved_agent = create_agent()
+    if isinstance(saved_agent.q_table, DenseQTable) and saved_agent.load():
+        agent_var["instance"] = saved_agent
+        solve_button.config(state="normal")
+        update_log(f"Đã nạp bảng Q đã lưu ({len(saved_agent.q_table)} trạng thái) từ {saved_agent.policy_filename()}")
+    
     # Cập nhật UI
     window.mainloop()
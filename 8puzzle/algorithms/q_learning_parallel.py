@@ -0,0 +1,182 @@
+"""
+Parallel Q-learning workers over a shared-memory Q-table
+
+ParallelQTrainer chia các episode huấn luyện của một QLearning (bảng Q dày đặc
+3x3) cho nhiều tiến trình worker; mỗi worker chạy VectorizedQTrainer với hạt
+giống xáo trộn riêng. Bảng Q nằm trong một khối multiprocessing.shared_memory
+nên không phải gửi qua lại giữa các tiến trình. Hai chế độ:
+
+- MODE_HOGWILD: mọi worker cập nhật thẳng bảng Q chung, không khóa (Hogwild);
+  các lần ghi đè nhau hiếm khi xảy ra vì mỗi worker ở một vùng trạng thái khác.
+- MODE_AVERAGE: huấn luyện theo vòng; đầu mỗi vòng, worker chép bảng chung vào
+  bảng riêng, huấn luyện sync_every episode rồi tiến trình chính lấy trung bình
+  các bảng riêng làm bảng chung mới (đồng bộ định kỳ).
+
+Khối bộ nhớ chung gồm bảng chung, các bảng riêng (chỉ với MODE_AVERAGE), bộ
+đếm tiến độ của từng worker (episode, thành công, tổng bước, số cập nhật) mà
+tiến trình chính đọc định kỳ để báo tiến độ trong khi chờ, và một mask đã ghé
+qua dùng chung cho mọi worker (hợp các trạng thái đã ghé qua).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from multiprocessing import shared_memory
+import numpy as np
+from models.permutation_rank import REACHABLE_COUNT
+from .q_table import DenseQTable, ACTION_COUNT
+from .q_learning_vectorized import TrainingStats, DEFAULT_ENVS
+
+MODE_HOGWILD = "hogwild"
+MODE_AVERAGE = "average"
+
+# Số episode mỗi worker huấn luyện giữa hai lần lấy trung bình (MODE_AVERAGE)
+DEFAULT_SYNC_EVERY = 2000
+
+# Khoảng thời gian (giây) giữa hai lần đọc bộ đếm tiến độ
+PROGRESS_POLL_INTERVAL = 0.1
+
+# Các cột của bộ đếm tiến độ
+_COUNTER_FIELDS = 4
+
+
+def _shared_size(workers, private_tables):
+    """Số byte của khối bộ nhớ chung"""
+    return ((1 + private_tables) * REACHABLE_COUNT * ACTION_COUNT * 4
+            + workers * _COUNTER_FIELDS * 8 + REACHABLE_COUNT)
+
+
+def _shared_arrays(buffer, workers, private_tables):
+    """Bảng Q (1 + private_tables, 9!/2, 4), bộ đếm (workers, 4) và mask đã ghé qua trên buffer"""
+    tables = np.ndarray((1 + private_tables, REACHABLE_COUNT, ACTION_COUNT),
+                        dtype=np.float32, buffer=buffer)
+    counters = np.ndarray((workers, _COUNTER_FIELDS), dtype=np.int64, buffer=buffer,
+                          offset=tables.nbytes)
+    visited = np.ndarray(REACHABLE_COUNT, dtype=bool, buffer=buffer,
+                         offset=tables.nbytes + counters.nbytes)
+    return tables, counters, visited
+
+
+def _train_worker(name, workers, mode, slot, agent_params, episodes, shuffle_steps, max_steps,
+                  num_envs, seed):
+    """Huấn luyện episodes episode trong tiến trình worker, trên bảng chung hoặc bảng riêng slot"""
+    from .q_learning import QLearning
+    shm = shared_memory.SharedMemory(name=name)
+    agent = values = tables = counters = visited = None
+    try:
+        private_tables = workers if mode == MODE_AVERAGE else 0
+        tables, counters, visited = _shared_arrays(shm.buf, workers, private_tables)
+        if mode == MODE_AVERAGE:
+            values = tables[1 + slot]
+            values[:] = tables[0]
+        else:
+            values = tables[0]
+
+        agent = QLearning(goal_state=agent_params["goal_state"], learning_rate=agent_params["alpha"],
+                          discount_factor=agent_params["gamma"], exploration_rate=agent_params["epsilon"])
+        agent.q_table = DenseQTable(values, visited)
+        base = counters[slot].copy()
+
+        def report_progress(stats):
+            counters[slot] = base + (stats.episodes, stats.successes, stats.success_steps, stats.updates)
+
+        agent.train_batch(episodes, shuffle_steps, max_steps, num_envs, report_progress, seed)
+    finally:
+        # Giải phóng các view trước khi đóng khối bộ nhớ chung
+        agent = values = tables = counters = visited = None
+        shm.close()
+
+
+class ParallelQTrainer:
+    """
+    Huấn luyện bảng Q dày đặc của agent (QLearning) trên workers tiến trình.
+    workers=None dùng os.cpu_count(); mode là MODE_HOGWILD hoặc MODE_AVERAGE.
+    """
+
+    def __init__(self, agent, workers=None, mode=MODE_HOGWILD, sync_every=DEFAULT_SYNC_EVERY,
+                 num_envs=DEFAULT_ENVS, seed=None):
+        if not isinstance(agent.q_table, DenseQTable):
+            raise ValueError("Parallel training needs a dense Q-table (3x3 puzzle)")
+        if mode not in (MODE_HOGWILD, MODE_AVERAGE):
+            raise ValueError(f"Unknown parallel training mode: {mode}")
+        self.agent = agent
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.sync_every = sync_every
+        self.num_envs = num_envs
+        self.seed = seed
+
+    def _split(self, episodes):
+        """Chia episodes cho các worker, lệch nhau nhiều nhất 1"""
+        share, extra = divmod(episodes, self.workers)
+        return [share + (slot < extra) for slot in range(self.workers)]
+
+    def train(self, episodes, shuffle_steps=20, max_steps=100, progress_callback=None):
+        """
+        Huấn luyện episodes episode trên mọi worker rồi chép bảng Q chung về
+        agent. progress_callback(stats) nhận TrainingStats tổng hợp từ các worker
+        trong khi chờ. Trả về TrainingStats.
+        """
+        agent = self.agent
+        workers = self.workers
+        private_tables = workers if self.mode == MODE_AVERAGE else 0
+        size = _shared_size(workers, private_tables)
+        agent_params = dict(goal_state=agent.goal_state, alpha=agent.alpha, gamma=agent.gamma,
+                            epsilon=agent.epsilon)
+
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        tables = counters = visited = None
+        try:
+            tables, counters, visited = _shared_arrays(shm.buf, workers, private_tables)
+            tables[0] = agent.q_table.values
+            counters[:] = 0
+            visited[:] = agent.q_table.visited
+            start_time = time.perf_counter()
+
+            def current_stats():
+                totals = counters.sum(axis=0).tolist()
+                return TrainingStats(*totals, time.perf_counter() - start_time)
+
+            if self.mode == MODE_AVERAGE:
+                rounds = []
+                remaining = self._split(episodes)
+                while any(remaining):
+                    rounds.append([min(count, self.sync_every) for count in remaining])
+                    remaining = [count - done for count, done in zip(remaining, rounds[-1])]
+            else:
+                rounds = [self._split(episodes)]
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for round_index, shares in enumerate(rounds):
+                    futures = []
+                    for slot, share in enumerate(shares):
+                        if not share:
+                            continue
+                        seed = None if self.seed is None else [self.seed, round_index, slot]
+                        futures.append(executor.submit(
+                            _train_worker, shm.name, workers, self.mode, slot, agent_params,
+                            share, shuffle_steps, max_steps, self.num_envs, seed))
+                    pending = futures
+                    while pending:
+                        _, pending = wait(pending, PROGRESS_POLL_INTERVAL, FIRST_EXCEPTION)
+                        if progress_callback is not None:
+                            progress_callback(current_stats())
+                        if any(future.done() and future.exception() for future in futures):
+                            break
+                    for future in futures:
+                        # Báo lỗi của worker (nếu có) cho luồng gọi
+                        future.result()
+                    if self.mode == MODE_AVERAGE:
+                        active = [1 + slot for slot, share in enumerate(shares) if share]
+                        tables[0] = tables[active].mean(axis=0)
+
+            agent.q_table.values[:] = tables[0]
+            agent.q_table.visited[:] = visited
+            stats = current_stats()
+        finally:
+            tables = counters = visited = None
+            shm.close()
+            shm.unlink()
+
+        if progress_callback is not None:
+            progress_callback(stats)
+        return stats
@@ -0,0 +1,192 @@
+"""
+Vectorized multi-environment Q-learning trainer
+
+VectorizedQTrainer chạy hàng nghìn môi trường 8-puzzle song song theo từng bước
+(lock-step) bằng NumPy trên bảng Q dày đặc (algorithms.q_table.DenseQTable) của
+một QLearning: chọn hành động epsilon-greedy, tính phần thưởng và cập nhật TD
+cho mọi môi trường bằng các phép toán mảng, thay cho vòng lặp Python từng bước
+của QLearning.train.
+
+Mỗi môi trường là một hàng của mảng cells (n, 9) - giá trị của từng ô - cùng vị
+trí ô trống, số ô đúng vị trí và chỉ số hàng Q (hạng rank_reachable, tính lại
+bằng mã Lehmer vector hóa - algorithms.q_table.rank_cells). Phần thưởng giống QLearning.get_reward. Khi nhiều
+môi trường cập nhật cùng một cặp (trạng thái, hành động) trong một bước, giá trị
+ghi sau cùng được giữ lại.
+"""
+import time
+from collections import namedtuple
+import numpy as np
+from .q_table import DenseQTable, DIRECTIONS, ACTION_COUNT, rank_cells
+
+DEFAULT_ENVS = 4096
+
+# Số bước lock-step giữa hai lần gọi progress_callback
+DEFAULT_PROGRESS_EVERY = 20
+
+
+class TrainingStats(namedtuple("TrainingStats", "episodes successes success_steps updates elapsed")):
+    """Thống kê huấn luyện: số episode, số episode tới đích, tổng số bước của chúng, số lần cập nhật Q"""
+    __slots__ = ()
+
+    @property
+    def success_rate(self):
+        return self.successes / self.episodes if self.episodes else 0.0
+
+    @property
+    def avg_steps(self):
+        return self.success_steps / self.successes if self.successes else 0.0
+
+    @property
+    def episodes_per_second(self):
+        return self.episodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def updates_per_second(self):
+        return self.updates / self.elapsed if self.elapsed else 0.0
+
+
+class VectorizedQTrainer:
+    """Huấn luyện bảng Q dày đặc của agent (QLearning) trên num_envs môi trường cùng lúc"""
+
+    def __init__(self, agent, num_envs=DEFAULT_ENVS, seed=None):
+        if not isinstance(agent.q_table, DenseQTable):
+            raise ValueError("Vectorized training needs a dense Q-table (3x3 puzzle)")
+        self.agent = agent
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+
+        size = agent.size
+        cells = size * size
+        self.goal_cells = np.array([num for row in agent.goal_state for num in row], dtype=np.int8)
+        self.goal_blank = int(np.flatnonzero(self.goal_cells == 0)[0])
+
+        # Hành động hợp lệ theo vị trí ô trống: legal_actions[blank, :legal_count[blank]]
+        legal = agent.q_table.legal
+        self.legal_count = legal.sum(axis=1)
+        self.legal_actions = np.zeros((cells, ACTION_COUNT), dtype=np.intp)
+        for blank in range(cells):
+            actions = np.flatnonzero(legal[blank])
+            self.legal_actions[blank, :len(actions)] = actions
+        # Độ dời chỉ số ô của ô trống theo từng hành động
+        self.action_offsets = np.array([dx * size + dy for dx, dy in DIRECTIONS], dtype=np.intp)
+
+    def random_actions(self, blank):
+        """Một hành động hợp lệ ngẫu nhiên cho mỗi vị trí ô trống"""
+        pick = (self.rng.random(len(blank)) * self.legal_count[blank]).astype(np.intp)
+        return self.legal_actions[blank, pick]
+
+    def scramble(self, count, shuffle_steps):
+        """
+        count trạng thái xáo trộn từ goal_state bằng shuffle_steps bước ngẫu
+        nhiên (như create_initial_state); trạng thái quay về đích được xáo lại
+        """
+        cells = np.tile(self.goal_cells, (count, 1))
+        blank = np.full(count, self.goal_blank, dtype=np.intp)
+        rows = np.arange(count)
+        while len(rows):
+            for _ in range(shuffle_steps):
+                target = blank[rows] + self.action_offsets[self.random_actions(blank[rows])]
+                cells[rows, blank[rows]] = cells[rows, target]
+                cells[rows, target] = 0
+                blank[rows] = target
+            rows = rows[(cells[rows] == self.goal_cells).all(axis=1)]
+            if shuffle_steps == 0:
+                break
+        return cells, blank
+
+    def train(self, episodes, shuffle_steps=20, max_steps=100, progress_callback=None,
+              progress_every=DEFAULT_PROGRESS_EVERY):
+        """
+        Huấn luyện episodes episode, mỗi episode bắt đầu từ một trạng thái xáo
+        trộn và dừng khi tới đích hoặc sau max_steps bước. progress_callback(stats)
+        được gọi sau mỗi progress_every bước. Trả về TrainingStats.
+        """
+        agent = self.agent
+        q_table = agent.q_table
+        values, visited = q_table.values, q_table.visited
+        alpha = np.float32(agent.alpha)
+        gamma = np.float32(agent.gamma)
+        epsilon = agent.epsilon
+        goal_cells = self.goal_cells
+        solved_count = len(goal_cells)
+        near_goal = solved_count - 2
+        rng = self.rng
+
+        count = min(self.num_envs, episodes)
+        cells, blank = self.scramble(count, shuffle_steps)
+        correct = (cells == goal_cells).sum(axis=1)
+        steps = np.zeros(count, dtype=np.int64)
+        key = rank_cells(cells, blank)
+        started = count
+        finished = successes = success_steps = updates = 0
+        lock_steps = 0
+        start_time = time.perf_counter()
+
+        while len(blank):
+            rows = np.arange(len(blank))
+
+            # Chọn hành động epsilon-greedy (ô không hợp lệ có Q = -inf)
+            action = values[key].argmax(axis=1)
+            explore = rng.random(len(blank)) < epsilon
+            if explore.any():
+                action[explore] = self.random_actions(blank[explore])
+            target = blank + self.action_offsets[action]
+
+            # Thực hiện hành động: ô số tại target chuyển vào vị trí ô trống
+            tile = cells[rows, target]
+            cells[rows, blank] = tile
+            cells[rows, target] = 0
+
+            # Phần thưởng như QLearning.get_reward: chỉ hai ô blank và target thay đổi
+            tile_diff = ((goal_cells[blank] == tile).astype(np.int64) + (goal_cells[target] == 0)
+                         - (goal_cells[blank] == 0) - (goal_cells[target] == tile))
+            correct += tile_diff
+            done = correct == solved_count
+            reward = np.where(tile_diff > 0, 10 * tile_diff,
+                              np.where(tile_diff < 0, 5 * tile_diff,
+                                       np.where(correct >= near_goal, 0, -1)))
+            reward = np.where(done, 100, reward).astype(np.float32)
+            blank = target
+
+            # Cập nhật TD: Q(s,a) += α * [r + γ * max(Q(s',a')) - Q(s,a)]
+            next_key = rank_cells(cells, blank)
+            next_max = values[next_key].max(axis=1)
+            old_value = values[key, action]
+            values[key, action] = old_value + alpha * (reward + gamma * next_max - old_value)
+            visited[key] = True
+            visited[next_key] = True
+            key = next_key
+            steps += 1
+            updates += len(rows)
+            lock_steps += 1
+
+            # Kết thúc episode: ghi thống kê, bắt đầu episode mới hoặc bỏ môi trường
+            ended = done | (steps >= max_steps)
+            if ended.any():
+                ended_rows = np.flatnonzero(ended)
+                finished += len(ended_rows)
+                successes += int(done.sum())
+                success_steps += int(steps[done].sum())
+                restart = min(len(ended_rows), episodes - started)
+                if restart:
+                    restart_rows = ended_rows[:restart]
+                    cells[restart_rows], blank[restart_rows] = self.scramble(restart, shuffle_steps)
+                    correct[restart_rows] = (cells[restart_rows] == goal_cells).sum(axis=1)
+                    steps[restart_rows] = 0
+                    key[restart_rows] = rank_cells(cells[restart_rows], blank[restart_rows])
+                    started += restart
+                if restart < len(ended_rows):
+                    keep = np.ones(len(blank), dtype=bool)
+                    keep[ended_rows[restart:]] = False
+                    cells, blank, correct, steps, key = (
+                        cells[keep], blank[keep], correct[keep], steps[keep], key[keep])
+
+            if progress_callback is not None and lock_steps % progress_every == 0:
+                progress_callback(TrainingStats(finished, successes, success_steps, updates,
+                                                time.perf_counter() - start_time))
+
+        stats = TrainingStats(finished, successes, success_steps, updates,
+                              time.perf_counter() - start_time)
+        if progress_callback is not None:
+            progress_callback(stats)
+        return stats
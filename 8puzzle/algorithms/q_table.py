@@ -0,0 +1,231 @@
+"""
+Q-table backends for QLearning
+
+DenseQTable (lưới 3x3): mảng NumPy float32 kích thước (9!/2, 4), mỗi hàng là
+một trạng thái đánh chỉ số bằng models.permutation_rank.rank_reachable - cả không
+gian trạng thái chỉ chiếm khoảng 2.9 MB và mỗi lần tra Q là một phép chỉ số
+mảng, không tạo tuple hay dict. Hành động không hợp lệ (ô trống ở biên) mang
+giá trị -inf nên max/argmax trên cả hàng luôn bỏ qua chúng. Từ Python, các giá
+trị được đọc/ghi qua memoryview phẳng (flat[key * 4 + action]) dùng chung bộ
+nhớ với mảng - nhanh hơn nhiều so với chỉ số NumPy cho từng phần tử.
+
+DictQTable (lưới lớn hơn, không gian trạng thái quá lớn để cấp phát trước):
+dict khóa là tuple các hàng, giá trị là list 4 phần tử.
+
+Hai lớp có cùng giao diện: key(state) chuyển ma trận thành khóa; các phương
+thức còn lại nhận khóa. Hành động theo thứ tự lên, phải, xuống, trái (hướng di
+chuyển của ô trống) như trong QLearning.
+
+Bảng dày đặc được lưu thành file .npy (mảng float32 thô, 2.9 MB) trong thư mục
+cache, tên file gồm goal_state và các siêu tham số (q_table_filename), cùng một
+file .visited.npy bên cạnh chứa mask các trạng thái đã ghé qua. Khi nạp, file
+giá trị được memory-map (mặc định copy-on-write: đọc trực tiếp từ file, ghi khi
+huấn luyện tiếp chỉ nằm trong bộ nhớ cho đến lần save() sau).
+"""
+import os
+import numpy as np
+from models.packed_state import get_layout, CELLS
+from models.permutation_rank import rank_reachable, FACTORIALS, REACHABLE_COUNT, REACHABLE_PER_BLANK
+from models.move_table import SIZE
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', '8puzzle', 'qtable')
+
+ACTION_COUNT = 4
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # lên, phải, xuống, trái
+
+
+# Xếp hạng vector hóa (rank_cells): bỏ cột ô trống, đếm số ô nhỏ hơn ở phía sau (mã Lehmer)
+_OTHER_CELLS = np.array([[cell for cell in range(CELLS) if cell != blank]
+                         for blank in range(CELLS)], dtype=np.intp)
+_LEHMER_WEIGHTS = np.array([FACTORIALS[CELLS - 2 - index] for index in range(CELLS - 2)] + [0],
+                           dtype=np.int64)
+_LATER = np.triu(np.ones((CELLS - 1, CELLS - 1), dtype=bool), k=1)
+
+
+def rank_cells(cells, blank):
+    """
+    Chỉ số hàng Q (như rank_reachable) của nhiều trạng thái 3x3 cùng lúc:
+    cells (n, 9) là giá trị từng ô, blank (n,) là vị trí ô trống
+    """
+    tiles = np.take_along_axis(cells, _OTHER_CELLS[blank], axis=1)
+    smaller_later = (tiles[:, None, :] < tiles[:, :, None]) & _LATER
+    digits = smaller_later.sum(axis=2)
+    return blank * REACHABLE_PER_BLANK + ((digits @ _LEHMER_WEIGHTS) >> 1)
+
+
+def legal_action_mask(size):
+    """mask[blank][action]: hành động có hợp lệ khi ô trống ở chỉ số blank không"""
+    mask = np.zeros((size * size, ACTION_COUNT), dtype=bool)
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        for action, (dx, dy) in enumerate(DIRECTIONS):
+            mask[blank, action] = 0 <= row + dx < size and 0 <= col + dy < size
+    return mask
+
+
+class DenseQTable:
+    """Bảng Q dày đặc float32 (9!/2, 4) cho lưới 3x3"""
+
+    def __init__(self, values=None, visited=None):
+        self.layout = get_layout(SIZE)
+        self.legal = legal_action_mask(SIZE)
+        if values is None:
+            values = np.where(self.legal, np.float32(0), np.float32(-np.inf))
+            values = np.repeat(values, REACHABLE_PER_BLANK, axis=0)
+        if values.shape != (REACHABLE_COUNT, ACTION_COUNT):
+            raise ValueError(f"Q-table must have shape {(REACHABLE_COUNT, ACTION_COUNT)}, "
+                             f"got {values.shape}")
+        self.values = values
+        self.flat = memoryview(values).cast('B').cast('f')
+        # Các hàng đã được agent ghé qua (tương đương khóa có trong dict)
+        if visited is None:
+            visited = np.zeros(REACHABLE_COUNT, dtype=bool)
+        self.visited = visited
+        self.visited_flat = memoryview(self.visited).cast('B')
+
+    def save(self, filename):
+        """
+        Ghi bảng Q ra file .npy và mask đã ghé qua ra visited_filename(filename)
+        (mỗi file được ghi vào file tạm rồi đổi tên)
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        for target, array in ((filename, self.values),
+                              (visited_filename(filename), self.visited)):
+            temp_filename = f"{target}.{os.getpid()}.tmp"
+            with open(temp_filename, 'wb') as f:
+                np.save(f, array)
+            os.replace(temp_filename, target)
+
+    @classmethod
+    def load(cls, filename, mmap_mode='c'):
+        """
+        Nạp bảng Q đã lưu. mmap_mode như numpy.load: 'c' (mặc định) memory-map
+        copy-on-write, 'r' chỉ đọc, 'r+' ghi thẳng vào file, None đọc cả vào bộ
+        nhớ. Mask đã ghé qua được nạp từ visited_filename(filename); file cũ
+        không có mask thì các hàng khác giá trị ban đầu được coi là đã ghé qua.
+        """
+        values = np.load(filename, mmap_mode=mmap_mode)
+        if values.dtype != np.float32:
+            raise ValueError(f"Q-table must be float32, got {values.dtype}")
+        table = cls(values)
+        mask_filename = visited_filename(filename)
+        if os.path.exists(mask_filename):
+            visited = np.load(mask_filename)
+            if visited.shape != table.visited.shape or visited.dtype != np.bool_:
+                raise ValueError(f"Visited mask must be bool with shape {table.visited.shape}, "
+                                 f"got {visited.dtype} {visited.shape}")
+            table.visited[:] = visited
+        else:
+            table.refresh_visited()
+        return table
+
+    def refresh_visited(self):
+        """Đánh dấu đã ghé qua các hàng khác giá trị ban đầu (sau khi values được ghi từ ngoài)"""
+        initial = np.repeat(np.where(self.legal, np.float32(0), np.float32(-np.inf)),
+                            REACHABLE_PER_BLANK, axis=0)
+        self.visited[:] = (self.values != initial).any(axis=1)
+
+    def key(self, state):
+        """Chỉ số hàng của ma trận state"""
+        return rank_reachable(self.layout.pack(state))
+
+    # Chỉ số hàng của trạng thái đã nén
+    packed_key = staticmethod(rank_reachable)
+
+    def __contains__(self, key):
+        return bool(self.visited_flat[key])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.visited))
+
+    def add(self, key):
+        """Đánh dấu trạng thái đã được ghé qua (hàng đã có sẵn giá trị 0)"""
+        self.visited_flat[key] = 1
+
+    def get(self, key, action):
+        return self.flat[key * ACTION_COUNT + action]
+
+    def best_action(self, key, valid_actions=None):
+        """Hành động có Q lớn nhất (hành động đầu tiên khi bằng nhau)"""
+        start = key * ACTION_COUNT
+        row = self.flat[start:start + ACTION_COUNT].tolist()
+        return row.index(max(row))
+
+    def max_value(self, key):
+        start = key * ACTION_COUNT
+        return max(self.flat[start:start + ACTION_COUNT].tolist())
+
+    def update(self, key, action, reward, next_key, alpha, gamma):
+        """Q(s,a) = Q(s,a) + α * [r + γ * max(Q(s',a')) - Q(s,a)]"""
+        flat = self.flat
+        self.visited_flat[key] = 1
+        self.visited_flat[next_key] = 1
+        index = key * ACTION_COUNT + action
+        start = next_key * ACTION_COUNT
+        old_value = flat[index]
+        next_max = max(flat[start:start + ACTION_COUNT].tolist())
+        flat[index] = old_value + alpha * (reward + gamma * next_max - old_value)
+
+
+class DictQTable:
+    """Bảng Q thưa (dict) cho lưới bất kỳ"""
+
+    def __init__(self):
+        self.values = {}
+
+    def key(self, state):
+        return tuple(tuple(row) for row in state)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, key):
+        if key not in self.values:
+            self.values[key] = [0.0] * ACTION_COUNT
+
+    def get(self, key, action):
+        row = self.values.get(key)
+        return 0.0 if row is None else row[action]
+
+    def best_action(self, key, valid_actions):
+        """Hành động hợp lệ có Q lớn nhất (hành động đầu tiên khi bằng nhau)"""
+        row = self.values.get(key)
+        if row is None:
+            return valid_actions[0]
+        return max(valid_actions, key=row.__getitem__)
+
+    def max_value(self, key):
+        row = self.values.get(key)
+        return 0.0 if row is None else max(row)
+
+    def update(self, key, action, reward, next_key, alpha, gamma):
+        """Q(s,a) = Q(s,a) + α * [r + γ * max(Q(s',a')) - Q(s,a)]"""
+        self.add(key)
+        self.add(next_key)
+        row = self.values[key]
+        old_value = row[action]
+        row[action] = old_value + alpha * (reward + gamma * max(self.values[next_key]) - old_value)
+
+
+def visited_filename(filename):
+    """File chứa mask đã ghé qua đi kèm file bảng Q filename"""
+    root, _ = os.path.splitext(filename)
+    return f"{root}.visited.npy"
+
+
+def q_table_filename(goal_state, alpha, gamma, epsilon, cache_dir=DEFAULT_CACHE_DIR):
+    """File lưu bảng Q cho goal_state và bộ siêu tham số (alpha, gamma, epsilon)"""
+    goal_key = ''.join(str(num) for row in goal_state for num in row)
+    return os.path.join(cache_dir, f"q_{goal_key}_a{alpha:g}_g{gamma:g}_e{epsilon:g}.npy")
+
+
+def new_q_table(size=SIZE, dense=True):
+    """Bảng Q cho lưới size x size: DenseQTable cho 3x3 (nếu dense), ngược lại DictQTable"""
+    if dense and size == SIZE:
+        return DenseQTable()
+    return DictQTable()
@@ -0,0 +1,45 @@
+"""
+Bảng tra tên thuật toán -> hàm giải
+
+Mọi hàm trong bảng nhận một Puzzle (cùng các tham số tùy chọn) và trả về
+(path, nodes_explored). Tên trùng với khóa thuật toán dùng trong giao diện.
+Module của thuật toán chỉ được import khi cần, nên tiến trình worker chỉ nạp
+những gì nó thực sự dùng.
+"""
+from importlib import import_module
+
+ALGORITHMS = {
+    "BFS": ("bfs", "bfs_search"),
+    "BIBFS": ("bidirectional_bfs", "bidirectional_bfs"),
+    "DFS": ("dfs", "dfs_search"),
+    "IDS": ("ids", "ids_search"),
+    "UCS": ("ucs", "ucs_search"),
+    "GREEDY": ("greedy", "greedy_search"),
+    "ASTAR": ("astar", "astar_search"),
+    "IDA": ("ida", "ida_star_search"),
+    "WASTAR": ("weighted_astar", "weighted_astar_search"),
+    "ARA": ("weighted_astar", "ara_star_search"),
+    "FOCAL": ("focal_search", "focal_search"),
+    "SHC": ("simple_hill_climbing", "simple_hill_climbing"),
+    "SAHC": ("steepest_hill_climbing", "steepest_hill_climbing"),
+    "BEAM": ("beam_search", "beam_search"),
+    "SA": ("simulated_annealing", "simulated_annealing"),
+    "STOCH": ("stochastic_hill_climbing", "stochastic_hill_climbing"),
+    "GA": ("genetic_algorithm", "genetic_algorithm"),
+    "TABLE": ("distance_table", "table_search"),
+}
+
+
+def algorithm_name(name):
+    """Tên chuẩn (chữ hoa) của thuật toán, không import module của nó"""
+    key = name.upper()
+    if key not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    return key
+
+
+def get_algorithm(name):
+    """Hàm giải ứng với tên thuật toán (không phân biệt hoa thường)"""
+    module_name, function_name = ALGORITHMS[algorithm_name(name)]
+    module = import_module(f"{__package__}.{module_name}")
+    return getattr(module, function_name)
@@ -1,23 +1,12 @@
 """Thuật toán Mô phỏng Luyện kim (Simulated Annealing) cho bài toán 8-puzzle"""
 from .heuristics import manhattan_distance, misplaced_tiles
+from .budget import budgeted
+from .node import Node
 import random
 import math
 
-class Node:
-    """
-    Lớp Node đại diện cho một trạng thái của puzzle
-    """
-    def __init__(self, state, parent=None, move=None):
-        self.state = state  # Trạng thái hiện tại của puzzle
-        self.parent = parent  # Node cha (trạng thái trước đó)
-        self.move = move  # Bước di chuyển từ trạng thái cha đến trạng thái hiện tại
-        self.h = 0  # Giá trị hàm heuristic (khoảng cách Manhattan hoặc số ô sai vị trí)
-        
-    def __eq__(self, other):
-        # Hai node được coi là bằng nhau nếu có cùng trạng thái
-        return isinstance(other, Node) and self.state == other.state
-
-def simulated_annealing(puzzle, heuristic_func=manhattan_distance, initial_temp=1000, cooling_rate=0.97, min_temp=0.01, max_iterations=10000):
+@budgeted
+def simulated_annealing(puzzle, heuristic_func=manhattan_distance, initial_temp=1000, cooling_rate=0.97, min_temp=0.01, max_iterations=10000, budget=None):
    
     # Kiểm tra xem puzzle có thể giải được không
     if not puzzle.is_solvable():
@@ -44,22 +33,21 @@ def simulated_annealing(puzzle, heuristic_func=manhattan_distance, initial_temp=
     
     # Vòng lặp chính của thuật toán
     while temp > min_temp and iterations < max_iterations:
+        # Hết budget: trả về đường đi tới node tốt nhất đã thấy
+        if budget is not None and budget.exceeded(nodes_explored, len(visited)):
+            return best_node.path(), nodes_explored
+        
         # Kiểm tra xem đã đạt đến trạng thái đích chưa
         if puzzle.is_goal(current_node.state):
             # Tái tạo đường đi
-            path = []
-            while current_node:
-                path.append(current_node.state)
-                current_node = current_node.parent
-            
-            # Đảo ngược đường đi để có thứ tự đúng: từ trạng thái ban đầu đến đích
-            return path[::-1], nodes_explored
+            path = current_node.path()
+            return path, nodes_explored
         
         # Lấy tất cả các bước đi có thể từ trạng thái hiện tại
-        possible_moves = puzzle.get_possible_moves(current_node.state)
+        successors = puzzle.get_successors(current_node.state)
         
         # Nếu bị kẹt (không có bước đi hợp lệ), thử quay lại trạng thái tốt nhất
-        if not possible_moves:
+        if not successors:
             if best_h < current_node.h:
                 current_node = best_node
             continue
@@ -68,41 +56,30 @@ def simulated_annealing(puzzle, heuristic_func=manhattan_distance, initial_temp=
         found_better_state = False  # Đánh dấu nếu tìm thấy trạng thái tốt hơn
         valid_neighbors = []  # Danh sách các trạng thái kề hợp lệ
         
-        for move in possible_moves:
-            try:
-                # Áp dụng bước đi để có trạng thái mới
-                new_state = puzzle.apply_move(current_node.state, move)
-                state_str = puzzle.get_state_string(new_state)
-                
-                # Bỏ qua nếu đã thăm (tránh chu trình)
-                if state_str in visited:
-                    continue
-                    
-                # Tạo node mới và tính giá trị heuristic
-                new_node = Node(new_state, current_node, move)
-                new_node.h = heuristic_func(new_state, puzzle.goal_state)
-                nodes_explored += 1
-                
-                # Thêm vào danh sách láng giềng hợp lệ
-                valid_neighbors.append((new_node, new_node.h))
-                
-                # Nếu tìm thấy đích, trả về ngay lập tức
-                if puzzle.is_goal(new_state):
-                    path = []
-                    current_node = new_node
-                    while current_node:
-                        path.append(current_node.state)
-                        current_node = current_node.parent
-                    return path[::-1], nodes_explored
-                
-                # Cập nhật node tốt nhất nếu tìm thấy trạng thái tốt hơn
-                if new_node.h < best_h:
-                    best_node = new_node
-                    best_h = new_node.h
-                    found_better_state = True
+        for move, new_state in successors:
+            state_str = puzzle.get_state_string(new_state)
+            
+            # Bỏ qua nếu đã thăm (tránh chu trình)
+            if state_str in visited:
+                continue
                 
-            except ValueError:
-                continue  # Bỏ qua các bước đi không hợp lệ
+            # Tạo node mới và tính giá trị heuristic
+            new_node = Node(new_state, current_node, h=heuristic_func(new_state, puzzle.goal_state))
+            nodes_explored += 1
+            
+            # Thêm vào danh sách láng giềng hợp lệ
+            valid_neighbors.append((new_node, new_node.h))
+            
+            # Nếu tìm thấy đích, trả về ngay lập tức
+            if puzzle.is_goal(new_state):
+                path = new_node.path()
+                return path, nodes_explored
+            
+            # Cập nhật node tốt nhất nếu tìm thấy trạng thái tốt hơn
+            if new_node.h < best_h:
+                best_node = new_node
+                best_h = new_node.h
+                found_better_state = True
         
         # Nếu tìm thấy láng giềng hợp lệ, chọn một dựa trên xác suất của Simulated Annealing
         if valid_neighbors:
@@ -155,11 +132,8 @@ def simulated_annealing(puzzle, heuristic_func=manhattan_distance, initial_temp=
     
     # Nếu đang ở trạng thái đích, trả về đường đi
     if puzzle.is_goal(current_node.state):
-        path = []
-        while current_node:
-            path.append(current_node.state)
-            current_node = current_node.parent
-        return path[::-1], nodes_explored
+        path = current_node.path()
+        return path, nodes_explored
     
     # Không tìm thấy lời giải
     return None, nodes_explored
@@ -0,0 +1,322 @@
+"""
+Persistent process pool for concurrent solves
+
+Các thuật toán là Python thuần và dùng nhiều CPU, nên chạy song song bằng luồng
+không nhanh hơn (GIL). SolverPool giữ một ProcessPoolExecutor sống suốt phiên
+làm việc; mỗi tiến trình worker được làm nóng một lần: import các module thuật
+toán và tạo sẵn bảng heuristic tăng dần, pattern database cho các goal_state
+cho trước. Các bảng được cache trong module, nên mọi lời giải sau đó dùng lại.
+
+Mỗi công việc là (initial, goal, algorithm, params); kết quả trả về gọn
+(SolveResult): đường đi dạng các số nguyên đã nén thay cho ma trận. Với
+submit(), tiến độ (số nút, số trạng thái trong bộ nhớ) và cờ hủy đi qua một
+mảng bộ nhớ chung giữa các tiến trình, nên giao diện vẫn theo dõi và hủy được
+như với SolverExecutor.
+"""
+import os
+import threading
+import time
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import RawArray
+from models.packed_state import get_layout, default_goal_state
+from models.puzzle import Puzzle
+from .budget import SearchBudget, SOLVED, NO_SOLUTION, CANCELLED
+from .heuristics import manhattan_distance, linear_conflict, get_incremental_heuristic
+from .pattern_database import pattern_database
+from .registry import ALGORITHMS, algorithm_name, get_algorithm
+
+# Heuristic được tạo sẵn cho mỗi goal_state khi làm nóng worker
+WARM_HEURISTICS = (manhattan_distance, linear_conflict, pattern_database)
+
+# Số công việc submit() được theo dõi tiến độ / hủy cùng lúc
+DEFAULT_TRACKED_JOBS = 64
+
+# Số giây giữa hai lần ghi tiến độ vào mảng bộ nhớ chung
+_PROGRESS_INTERVAL = 0.05
+
+# Mảng bộ nhớ chung của tiến trình worker, được gán bởi _init_worker
+_cancel_flags = None
+_progress = None
+
+
+class SolveResult(namedtuple("SolveResult", "algorithm steps nodes_explored solve_time "
+                                            "status size packed_path")):
+    """
+    Kết quả gọn của một lần giải: steps là số bước (None nếu không có đường
+    đi), packed_path là tuple các trạng thái đã nén
+    """
+    __slots__ = ()
+
+    def path(self):
+        """Đường đi dạng danh sách ma trận, hoặc None"""
+        if self.packed_path is None:
+            return None
+        unpack = get_layout(self.size).unpack
+        return [unpack(state) for state in self.packed_path]
+
+
+class _SharedBudget(SearchBudget):
+    """
+    SearchBudget báo tiến độ và nhận lệnh hủy qua ô slot của mảng bộ nhớ chung.
+    Cờ hủy được đọc ở mỗi lần gọi; tiến độ được ghi theo thời gian (mỗi
+    _PROGRESS_INTERVAL giây) chứ không theo số lần gọi, vì các thuật toán như GA
+    hay leo đồi chỉ gọi exceeded() một lần mỗi thế hệ / vòng lặp.
+    """
+
+    def __init__(self, slot, time_limit=None, max_nodes=None, max_states=None):
+        super().__init__(time_limit, max_nodes, max_states)
+        self.slot = slot
+        self._next_sync = 0.0
+
+    def exceeded(self, nodes_explored=0, resident_states=0):
+        slot = self.slot
+        if _cancel_flags[slot]:
+            self.cancelled = True
+        now = time.perf_counter()
+        if now >= self._next_sync:
+            self._next_sync = now + _PROGRESS_INTERVAL
+            _progress[2 * slot] = nodes_explored
+            _progress[2 * slot + 1] = resident_states
+        return SearchBudget.exceeded(self, nodes_explored, resident_states)
+
+
+def _init_worker(algorithms, goal_states, heuristics, cancel_flags, progress):
+    """Làm nóng tiến trình worker: nạp module thuật toán và các bảng heuristic"""
+    global _cancel_flags, _progress
+    _cancel_flags = cancel_flags
+    _progress = progress
+    for name in algorithms:
+        try:
+            get_algorithm(name)
+        except ImportError:
+            # Thiếu thư viện tùy chọn (ví dụ numpy cho GA): lỗi chỉ báo khi dùng
+            pass
+    for goal_state in goal_states:
+        get_layout(len(goal_state))
+        for heuristic_func in heuristics:
+            get_incremental_heuristic(goal_state, heuristic_func)
+
+
+def _solve(initial, goal, algorithm, params, limits=None, slot=None):
+    """Giải một công việc trong worker, trả về SolveResult"""
+    solve_func = get_algorithm(algorithm)
+    puzzle = Puzzle(initial)
+    puzzle.goal_state = goal
+    budget = None
+    if slot is not None:
+        budget = _SharedBudget(slot, **(limits or {}))
+    elif limits:
+        budget = SearchBudget(**limits)
+
+    start_time = time.perf_counter()
+    if budget is None:
+        path, nodes_explored = solve_func(puzzle, **params)
+    else:
+        path, nodes_explored = solve_func(puzzle, budget=budget, **params)
+    solve_time = time.perf_counter() - start_time
+
+    if budget is not None and budget.status is not None:
+        status = budget.status
+    else:
+        status = SOLVED if path else NO_SOLUTION
+    if path:
+        pack = puzzle.layout.pack
+        return SolveResult(algorithm, len(path) - 1, nodes_explored, solve_time, status,
+                           puzzle.size, tuple(pack(state) for state in path))
+    return SolveResult(algorithm, None, nodes_explored, solve_time, status, puzzle.size, None)
+
+
+def _solve_chunk(chunk):
+    """Giải một nhóm (index, initial, goal, algorithm, params, limits)"""
+    return [(job[0], _solve(*job[1:])) for job in chunk]
+
+
+def _budget_limits(time_limit, max_nodes, max_states):
+    limits = {}
+    if time_limit is not None:
+        limits["time_limit"] = time_limit
+    if max_nodes is not None:
+        limits["max_nodes"] = max_nodes
+    if max_states is not None:
+        limits["max_states"] = max_states
+    return limits
+
+
+class PoolJob:
+    """
+    Một công việc submit() vào SolverPool, cùng giao diện với SolveJob:
+    done, wait(), cancel(), progress(), status, path, nodes_explored...
+    """
+
+    def __init__(self, pool, future, slot):
+        self.pool = pool
+        self.future = future
+        # Ô của mảng bộ nhớ chung, chỉ thuộc về job cho đến khi job kết thúc
+        self.slot = slot
+        self.submitted_at = time.perf_counter()
+        self.finished_at = None
+        self._final_progress = (0, 0)
+        self._finished_event = threading.Event()
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future):
+        self.finished_at = time.perf_counter()
+        pool = self.pool
+        with pool._lock:
+            slot, self.slot = self.slot, None
+            if slot is not None:
+                # Giữ tiến độ cuối trước khi ô được giao cho job khác
+                self._final_progress = (pool._progress[2 * slot], pool._progress[2 * slot + 1])
+                pool._free_slots.append(slot)
+        self._finished_event.set()
+
+    @property
+    def done(self):
+        return self._finished_event.is_set()
+
+    def wait(self, timeout=None):
+        """Chờ công việc kết thúc, trả về done"""
+        return self._finished_event.wait(timeout)
+
+    def cancel(self):
+        """Hủy công việc: bỏ khỏi hàng đợi, hoặc báo worker dừng nếu đang chạy"""
+        if self.future.cancel():
+            return
+        pool = self.pool
+        with pool._lock:
+            # Job đã kết thúc thì ô có thể đang thuộc về job khác
+            if self.slot is not None and not self.future.done():
+                pool._cancel_flags[self.slot] = 1
+
+    def progress(self):
+        """(nodes_explored, resident_states, elapsed) tại thời điểm gọi"""
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.submitted_at
+        with self.pool._lock:
+            slot = self.slot
+            if slot is None:
+                return self._final_progress + (elapsed,)
+            progress = self.pool._progress
+            return progress[2 * slot], progress[2 * slot + 1], elapsed
+
+    @property
+    def result(self):
+        """SolveResult, hoặc None nếu bị hủy trước khi chạy hay gặp lỗi"""
+        if self.future.cancelled() or self.future.exception() is not None:
+            return None
+        return self.future.result()
+
+    @property
+    def error(self):
+        if self.future.cancelled():
+            return None
+        return self.future.exception()
+
+    @property
+    def status(self):
+        if self.future.cancelled():
+            return CANCELLED
+        result = self.result
+        return None if result is None else result.status
+
+    @property
+    def path(self):
+        result = self.result
+        return None if result is None else result.path()
+
+    @property
+    def nodes_explored(self):
+        result = self.result
+        return 0 if result is None else result.nodes_explored
+
+    @property
+    def solve_time(self):
+        result = self.result
+        return 0.0 if result is None else result.solve_time
+
+
+class SolverPool:
+    """
+    Tiến trình worker dùng lại giữa các lần giải. max_workers=None dùng
+    os.cpu_count() tiến trình; goal_states là các goal được nạp sẵn bảng
+    heuristic (mặc định goal chuẩn 3x3), goal khác được nạp khi gặp lần đầu.
+    """
+
+    def __init__(self, max_workers=None, goal_states=None, algorithms=None,
+                 heuristics=WARM_HEURISTICS, tracked_jobs=DEFAULT_TRACKED_JOBS):
+        if goal_states is None:
+            goal_states = [default_goal_state(3)]
+        if algorithms is None:
+            algorithms = list(ALGORITHMS)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancel_flags = RawArray('b', tracked_jobs)
+        self._progress = RawArray('q', 2 * tracked_jobs)
+        self._free_slots = list(range(tracked_jobs - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_init_worker,
+            initargs=(algorithms, goal_states, heuristics, self._cancel_flags, self._progress))
+
+    def _acquire_slot(self):
+        with self._lock:
+            if not self._free_slots:
+                return None
+            slot = self._free_slots.pop()
+        self._cancel_flags[slot] = 0
+        self._progress[2 * slot] = 0
+        self._progress[2 * slot + 1] = 0
+        return slot
+
+    def submit(self, initial, goal, algorithm="ASTAR", time_limit=None, max_nodes=None,
+               max_states=None, **params):
+        """
+        Giải initial -> goal bằng thuật toán algorithm (tên trong
+        algorithms.registry) với params, trả về PoolJob theo dõi và hủy được.
+        Khi cả tracked_jobs ô đều đang dùng, job vẫn chạy nhưng không có tiến
+        độ và chỉ hủy được trước khi bắt đầu (kèm RuntimeWarning).
+        """
+        algorithm = algorithm_name(algorithm)
+        slot = self._acquire_slot()
+        if slot is None:
+            warnings.warn(f"All {len(self._cancel_flags)} tracked job slots are in use; "
+                          "this job reports no progress and cannot be cancelled once running "
+                          "(raise SolverPool(tracked_jobs=...))", RuntimeWarning, stacklevel=2)
+        limits = _budget_limits(time_limit, max_nodes, max_states)
+        future = self._executor.submit(_solve, initial, goal, algorithm, params, limits, slot)
+        return PoolJob(self, future, slot)
+
+    def map(self, jobs, chunk_size=1, time_limit=None, max_nodes=None, max_states=None):
+        """
+        Giải các công việc (initial, goal, algorithm, params) trên mọi worker.
+        Là generator, trả về (index, SolveResult) ngay khi từng nhóm chunk_size
+        công việc được giải xong - thứ tự không nhất thiết trùng với jobs.
+        """
+        limits = _budget_limits(time_limit, max_nodes, max_states)
+        indexed = []
+        for index, (initial, goal, algorithm, params) in enumerate(jobs):
+            algorithm = algorithm_name(algorithm)
+            indexed.append((index, initial, goal, algorithm, params, limits))
+        chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+        futures = [self._executor.submit(_solve_chunk, chunk) for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # Dừng giữa chừng (break, lỗi): bỏ các nhóm chưa chạy
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Dừng các worker; với cancel_futures, các công việc đang chạy cũng được báo hủy"""
+        if cancel_futures:
+            for slot in range(len(self._cancel_flags)):
+                self._cancel_flags[slot] = 1
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
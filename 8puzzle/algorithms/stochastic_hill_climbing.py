@@ -1,19 +1,12 @@
 """Stochastic Hill Climbing (Leo đồi ngẫu nhiên) implementation for 8-puzzle"""
 from .heuristics import manhattan_distance, misplaced_tiles
+from .budget import budgeted
+from .node import Node
 import random
 import math
 
-class Node:
-    def __init__(self, state, parent=None, move=None):
-        self.state = state          # Trạng thái hiện tại của puzzle
-        self.parent = parent        # Nút cha (trạng thái trước đó)
-        self.move = move            # Bước đi dẫn đến trạng thái này
-        self.h = 0                  # Giá trị heuristic (khoảng cách Manhattan hoặc số ô sai vị trí)
-        
-    def __eq__(self, other):
-        return isinstance(other, Node) and self.state == other.state
-
-def stochastic_hill_climbing(puzzle, heuristic_func=manhattan_distance, max_iterations=1000, probability_threshold=0.3, restart_limit=5):
+@budgeted
+def stochastic_hill_climbing(puzzle, heuristic_func=manhattan_distance, max_iterations=1000, probability_threshold=0.3, restart_limit=5, budget=None):
   
     # Kiểm tra xem puzzle có thể giải được không
     if not puzzle.is_solvable():
@@ -61,8 +54,12 @@ def stochastic_hill_climbing(puzzle, heuristic_func=manhattan_distance, max_iter
         
         # Vòng lặp chính của thuật toán
         while not puzzle.is_goal(current_node.state) and iterations < max_iterations:
+            # Hết budget: trả về lời giải tốt nhất, nếu chưa có thì đường đi tới node tốt nhất
+            if budget is not None and budget.exceeded(nodes_explored, len(visited)):
+                return best_solution or best_node.path(), nodes_explored
+            
             # Lấy tất cả các bước di chuyển có thể từ trạng thái hiện tại
-            possible_moves = puzzle.get_possible_moves(current_node.state)
+            successors = puzzle.get_successors(current_node.state)
             
             # Phân loại các láng giềng
             better_neighbors = []  # Láng giềng tốt hơn (h nhỏ hơn)
@@ -70,42 +67,35 @@ def stochastic_hill_climbing(puzzle, heuristic_func=manhattan_distance, max_iter
             uphill_neighbors = []  # Láng giềng xấu hơn (h lớn hơn)
             
             # Đánh giá tất cả các láng giềng có thể
-            for move in possible_moves:
-                try:
-                    # Áp dụng bước di chuyển để có trạng thái mới
-                    new_state = puzzle.apply_move(current_node.state, move)
-                    new_state_str = puzzle.get_state_string(new_state)
-                    
-                    # Bỏ qua nếu đã thăm để tránh chu trình
-                    if new_state_str in visited:
-                        continue
-                        
-                    # Tạo node mới và tính giá trị heuristic
-                    new_node = Node(new_state, current_node, move)
-                    new_node.h = heuristic_func(new_state, puzzle.goal_state)
-                    restart_nodes_explored += 1
-                    nodes_explored += 1
-                    
-                    # Xác định xem láng giềng này tốt hơn, ngang bằng hay xấu hơn
-                    if new_node.h < current_node.h:
-                        # Lưu trữ mức độ cải thiện (delta h)
-                        improvement = current_node.h - new_node.h
-                        better_neighbors.append((new_node, improvement))
-                    elif new_node.h == current_node.h:
-                        sideways_neighbors.append(new_node)
-                    else:
-                        # Đối với các bước đi đi lên đồi, tính mức độ xấu hơn
-                        worsening = new_node.h - current_node.h
-                        uphill_neighbors.append((new_node, worsening))
-                    
-                    # Cập nhật node tốt nhất nếu tìm thấy trạng thái tốt hơn
-                    if new_node.h < best_h:
-                        best_node = new_node
-                        best_h = new_node.h
-                        plateau_count = 0  # Đặt lại bộ đếm bình nguyên
+            for move, new_state in successors:
+                new_state_str = puzzle.get_state_string(new_state)
+                
+                # Bỏ qua nếu đã thăm để tránh chu trình
+                if new_state_str in visited:
+                    continue
                     
-                except ValueError:
-                    continue  # Bỏ qua các bước di chuyển không hợp lệ
+                # Tạo node mới và tính giá trị heuristic
+                new_node = Node(new_state, current_node, h=heuristic_func(new_state, puzzle.goal_state))
+                restart_nodes_explored += 1
+                nodes_explored += 1
+                
+                # Xác định xem láng giềng này tốt hơn, ngang bằng hay xấu hơn
+                if new_node.h < current_node.h:
+                    # Lưu trữ mức độ cải thiện (delta h)
+                    improvement = current_node.h - new_node.h
+                    better_neighbors.append((new_node, improvement))
+                elif new_node.h == current_node.h:
+                    sideways_neighbors.append(new_node)
+                else:
+                    # Đối với các bước đi đi lên đồi, tính mức độ xấu hơn
+                    worsening = new_node.h - current_node.h
+                    uphill_neighbors.append((new_node, worsening))
+                
+                # Cập nhật node tốt nhất nếu tìm thấy trạng thái tốt hơn
+                if new_node.h < best_h:
+                    best_node = new_node
+                    best_h = new_node.h
+                    plateau_count = 0  # Đặt lại bộ đếm bình nguyên
             
             iterations += 1
             
@@ -159,12 +149,7 @@ def stochastic_hill_climbing(puzzle, heuristic_func=manhattan_distance, max_iter
         
         # Nếu tìm thấy đích, tái tạo đường đi
         if puzzle.is_goal(current_node.state):
-            path = []
-            node = current_node
-            while node:
-                path.append(node.state)
-                node = node.parent
-            path.reverse()
+            path = current_node.path()
             
             # Nếu đây là lời giải tốt nhất cho đến nay, ghi nhớ nó
             if len(path) < best_solution_length:
@@ -1,57 +1,55 @@
 """Uniform Cost Search implementation for 8-puzzle"""
-import heapq
+from models.bucket_queue import BucketQueue
+from models.permutation_rank import new_state_table
+from .budget import budgeted
+from .node import Node
 
-class Node:
-    def __init__(self, state, parent=None, cost=0):
-        self.state = state
-        self.parent = parent
-        self.cost = cost    # Path cost from start
-        
-    def __lt__(self, other):
-        return self.cost < other.cost
-        
-    def __eq__(self, other):
-        return isinstance(other, Node) and self.state == other.state
-
-def ucs_search(puzzle):
+@budgeted
+def ucs_search(puzzle, budget=None):
     """Returns (path from initial to goal, nodes explored) or (None, nodes explored)"""
     if not puzzle.is_solvable():
         return None, 0
         
-    start_node = Node(puzzle.initial_state)
-    frontier = []
-    heapq.heappush(frontier, start_node)
+    # Trạng thái đã nén; chi phí tốt nhất lưu trong array('b') đánh chỉ số theo
+    # hạng Lehmer (-1: chưa thăm), độ sâu tối ưu của 8-puzzle không vượt quá 31;
+    # lưới lớn hơn 3x3 dùng dict (xem new_state_table)
+    start = puzzle.pack_state(puzzle.initial_state)
+    goal = puzzle.pack_state(puzzle.goal_state)
+    start_node = Node(start)
+    # Hàng đợi ưu tiên theo bucket chi phí đường đi
+    frontier = BucketQueue()
+    frontier.push(start_node, start_node.g)
     
-    visited = {puzzle.get_state_string(start_node.state): 0}
+    layout = puzzle.layout
+    state_key, visited = new_state_table(layout, 'b', -1)
+    visited[state_key(start)] = 0
+    visited_count = 1
     nodes_explored = 1
     
     while frontier:
-        current = heapq.heappop(frontier)
-        current_state_str = puzzle.get_state_string(current.state)
+        # Trạng thái trong bộ nhớ: các nút trong hàng đợi và các trạng thái đã thăm
+        if budget is not None and budget.exceeded(nodes_explored, len(frontier) + visited_count):
+            return None, nodes_explored
+        current = frontier.pop()
         
-        if puzzle.is_goal(current.state):
-            path = []
-            while current:
-                path.append(current.state)
-                current = current.parent
-            return path[::-1], nodes_explored
+        if current.state == goal:
+            return [puzzle.unpack_state(state) for state in current.path()], nodes_explored
             
         # Skip if we've found a better path to this state
-        if current.cost > visited[current_state_str]:
+        if current.g > visited[state_key(current.state)]:
             continue
             
-        for move in puzzle.get_possible_moves(current.state):
-            try:
-                new_state = puzzle.apply_move(current.state, move)
-                new_cost = current.cost + 1
-                state_string = puzzle.get_state_string(new_state)
-                
-                if state_string not in visited or new_cost < visited[state_string]:
-                    visited[state_string] = new_cost
-                    new_node = Node(new_state, current, new_cost)
-                    heapq.heappush(frontier, new_node)
-                    nodes_explored += 1
-            except ValueError:
-                continue  # Skip invalid moves
+        for move, target, new_state in layout.get_successors(current.state):
+            new_cost = current.g + 1
+            rank = state_key(new_state)
+            old_cost = visited[rank]
+            
+            if old_cost < 0 or new_cost < old_cost:
+                if old_cost < 0:
+                    visited_count += 1
+                visited[rank] = new_cost
+                new_node = Node(new_state, current, new_cost)
+                frontier.push(new_node, new_cost)
+                nodes_explored += 1
     
     return None, nodes_explored 
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Value iteration planner for the Q-learning window
+
+Không gian trạng thái 3x3 đến được từ goal_state chỉ có 9!/2 = 181440 trạng
+thái, đủ nhỏ để tính chính xác hàm giá trị tối ưu thay vì học dần bằng
+Q-learning. ValueIterationPlanner:
+
+1. Liệt kê mọi trạng thái bằng BFS vector hóa từ goal_state, đánh chỉ số như
+   bảng Q dày đặc (algorithms.q_table.rank_cells), và lập bảng successors
+   (9!/2, 4): chỉ số trạng thái kế tiếp theo từng hành động, -1 nếu không hợp lệ.
+2. Lặp giá trị với chi phí 1 mỗi bước (r = -1, γ = 1, V(đích) = 0): mỗi vòng
+   cập nhật V(s) = max_a [-1 + V(s')] cho mọi trạng thái cùng lúc bằng NumPy,
+   dừng khi V không đổi - sau đúng (độ sâu lớn nhất + 1) = 32 vòng.
+3. Ghi Q*(s, a) = -1 + V*(s') vào một DenseQTable, nên chính sách tham lam theo
+   Q* luôn đi theo đường ngắn nhất: V*(s) = -(số bước tối ưu từ s).
+
+Planner có cùng giao diện giải/hiển thị với QLearning (q_table, goal_state,
+get_state_key, solve) để cửa sổ Q-learning dùng thay cho agent đã huấn luyện.
+"""
+import time
+import numpy as np
+from models.packed_state import default_goal_state
+from models.solvability import is_solvable
+from .q_table import DenseQTable, DIRECTIONS, ACTION_COUNT, rank_cells
+
+# Số vòng lặp tối đa (bài 3x3 hội tụ sau 32 vòng)
+DEFAULT_MAX_SWEEPS = 100
+
+
+class ValueIterationPlanner:
+    """Chính sách tối ưu cho 8-puzzle tính bằng quy hoạch động trên bảng Q dày đặc"""
+
+    def __init__(self, goal_state=None):
+        if goal_state is None:
+            goal_state = default_goal_state(3)
+        self.goal_state = [row[:] for row in goal_state]
+        self.size = len(goal_state)
+        self.q_table = DenseQTable()
+        self.values = None
+        self.sweeps = 0
+        self.plan_time = 0.0
+
+        self.goal_cells = np.array([num for row in self.goal_state for num in row], dtype=np.int8)
+        self.goal_key = int(rank_cells(self.goal_cells[None, :],
+                                       np.flatnonzero(self.goal_cells == 0))[0])
+        self.action_offsets = np.array([dx * self.size + dy for dx, dy in DIRECTIONS], dtype=np.intp)
+        self.legal = self.q_table.legal
+
+    def get_state_key(self, state):
+        """Chỉ số hàng của trạng thái trong bảng Q"""
+        return self.q_table.key(state)
+
+    def is_goal_state(self, state):
+        return state == self.goal_state
+
+    def _expand(self, cells, blank):
+        """
+        Các trạng thái kế tiếp của (cells, blank) theo từng hành động:
+        trả về danh sách (action, rows, next_cells, next_blank) với rows là các
+        hàng có hành động hợp lệ
+        """
+        expanded = []
+        for action in range(ACTION_COUNT):
+            rows = np.flatnonzero(self.legal[blank, action])
+            next_blank = blank[rows] + self.action_offsets[action]
+            next_cells = cells[rows]
+            index = np.arange(len(rows))
+            next_cells[index, blank[rows]] = next_cells[index, next_blank]
+            next_cells[index, next_blank] = 0
+            expanded.append((action, rows, next_cells, next_blank))
+        return expanded
+
+    def enumerate_states(self):
+        """
+        BFS từ goal_state theo từng lớp độ sâu: trả về (cells, blank) của mọi
+        trạng thái đến được, hàng thứ k là trạng thái có chỉ số k
+        """
+        count = len(self.q_table.values)
+        all_cells = np.zeros((count, len(self.goal_cells)), dtype=np.int8)
+        all_blank = np.zeros(count, dtype=np.intp)
+        seen = np.zeros(count, dtype=bool)
+
+        cells = self.goal_cells[None, :].copy()
+        blank = np.flatnonzero(self.goal_cells == 0)
+        key = np.array([self.goal_key])
+        while len(key):
+            seen[key] = True
+            all_cells[key] = cells
+            all_blank[key] = blank
+
+            next_cells, next_blank = [], []
+            for _, _, action_cells, action_blank in self._expand(cells, blank):
+                next_cells.append(action_cells)
+                next_blank.append(action_blank)
+            cells = np.concatenate(next_cells)
+            blank = np.concatenate(next_blank)
+            key = rank_cells(cells, blank)
+
+            # Bỏ trạng thái đã gặp và trạng thái trùng trong cùng lớp
+            new = ~seen[key]
+            key, first = np.unique(key[new], return_index=True)
+            cells = cells[new][first]
+            blank = blank[new][first]
+        return all_cells, all_blank
+
+    def successor_table(self, cells, blank):
+        """successors[k, a]: chỉ số trạng thái sau hành động a từ trạng thái k, -1 nếu không hợp lệ"""
+        successors = np.full((len(blank), ACTION_COUNT), -1, dtype=np.int64)
+        for action, rows, next_cells, next_blank in self._expand(cells, blank):
+            successors[rows, action] = rank_cells(next_cells, next_blank)
+        return successors
+
+    def plan(self, status_callback=None, max_sweeps=DEFAULT_MAX_SWEEPS):
+        """
+        Tính V* và Q* cho mọi trạng thái, ghi Q* vào q_table.
+        Trả về True nếu hội tụ trong max_sweeps vòng.
+        """
+        start_time = time.perf_counter()
+        successors = self.successor_table(*self.enumerate_states())
+        legal = successors >= 0
+        successors[~legal] = 0
+        if status_callback:
+            status_callback(f"Đã lập bảng chuyển trạng thái cho {len(successors)} trạng thái "
+                            f"({time.perf_counter() - start_time:.2f}s)")
+
+        minus_inf = np.float32(-np.inf)
+        values = np.zeros(len(successors), dtype=np.float32)
+        converged = False
+        self.sweeps = 0
+        while self.sweeps < max_sweeps:
+            # V(s) = max_a [-1 + V(s')], trạng thái đích là trạng thái kết thúc
+            q_values = np.where(legal, values[successors] - 1, minus_inf)
+            new_values = q_values.max(axis=1)
+            new_values[self.goal_key] = 0
+            changed = int(np.count_nonzero(new_values != values))
+            values = new_values
+            self.sweeps += 1
+            if status_callback:
+                status_callback(f"Vòng lặp {self.sweeps}: {changed} trạng thái thay đổi giá trị")
+            if not changed:
+                converged = True
+                break
+
+        self.values = values
+        self.q_table.values[:] = np.where(legal, values[successors] - 1, minus_inf)
+        self.q_table.visited[:] = True
+        self.plan_time = time.perf_counter() - start_time
+        if status_callback:
+            if converged:
+                status_callback(f"Hội tụ sau {self.sweeps} vòng lặp ({self.plan_time:.2f}s), "
+                                f"số bước tối ưu lớn nhất: {int(-values.min())}")
+            else:
+                status_callback(f"Chưa hội tụ sau {self.sweeps} vòng lặp ({self.plan_time:.2f}s)")
+        return converged
+
+    def solve(self, initial_state, visualization_callback=None, status_callback=None, delay=0.5):
+        """
+        Giải puzzle bằng chính sách tham lam theo Q* (luôn là đường ngắn nhất)
+
+        Args:
+            initial_state (list): Trạng thái ban đầu của puzzle
+            visualization_callback (function, optional): Hàm cập nhật hiển thị trực quan
+            status_callback (function, optional): Hàm cập nhật trạng thái
+            delay (float): Thời gian trễ giữa các bước (giây)
+
+        Returns:
+            tuple: (thành công, số bước, trạng thái cuối cùng, đường đi)
+        """
+        state = [row[:] for row in initial_state]
+        if self.is_goal_state(state):
+            if status_callback:
+                status_callback("Đã ở trạng thái đích!")
+            return True, 0, state, [state]
+        if not is_solvable(state, self.goal_state):
+            if status_callback:
+                status_callback("Trạng thái này không thể đến được trạng thái đích!")
+            return False, 0, state, [state]
+        if self.values is None:
+            self.plan(status_callback)
+
+        q_table = self.q_table
+        layout = q_table.layout
+        packed = layout.pack(state)
+        key = q_table.packed_key(packed)
+        optimal_steps = int(-self.values[key])
+        path = [state]
+
+        if visualization_callback:
+            visualization_callback(state)
+        if status_callback:
+            status_callback(f"Bắt đầu giải puzzle theo chính sách tối ưu ({optimal_steps} bước)")
+
+        directions = ["lên", "phải", "xuống", "trái"]
+        offsets = self.action_offsets.tolist()
+        steps = 0
+        while steps < optimal_steps:
+            action = q_table.best_action(key)
+            blank = packed >> layout.blank_shift
+            packed = layout.move_blank(packed, blank + offsets[action])
+            key = q_table.packed_key(packed)
+            state = layout.unpack(packed)
+            path.append(state)
+            steps += 1
+
+            if status_callback:
+                status_callback(f"Bước {steps}: Di chuyển {directions[action]}")
+            if visualization_callback:
+                visualization_callback(state)
+                time.sleep(delay)
+
+        success = self.is_goal_state(state)
+        if status_callback:
+            if success:
+                status_callback(f"\nĐã tìm thấy trạng thái đích sau {steps} bước!")
+            else:
+                status_callback(f"\nKhông tìm được giải pháp trong {optimal_steps} bước!")
+        return success, steps, state, path
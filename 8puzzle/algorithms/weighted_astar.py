@@ -0,0 +1,161 @@
+"""Weighted A* and Anytime Repairing A* (ARA*) for 8-puzzle"""
+import time
+from models.indexed_heap import IndexedHeap
+from .heuristics import manhattan_distance, get_incremental_heuristic
+from .budget import budgeted, closest_path
+from .node import Node
+
+DEFAULT_WEIGHT = 1.5
+
+# Số nút mở rộng giữa hai lần kiểm tra hạn thời gian của ARA*
+_DEADLINE_CHECK_INTERVAL = 1024
+
+
+class _WeightedSearch:
+    """
+    Tìm kiếm theo khóa g + w·h dùng chung cho Weighted A* và ARA*.
+    Trạng thái là số nguyên đã nén; mỗi trạng thái có một nút tốt nhất (g nhỏ
+    nhất) trong best. Nút đã đóng mà tìm được g tốt hơn không được mở lại trong
+    cùng lần tìm mà đưa vào incons, chờ lần tìm với trọng số tiếp theo.
+    """
+
+    def __init__(self, puzzle, heuristic_func):
+        self.puzzle = puzzle
+        self.get_successors = puzzle.layout.get_successors
+        self.goal = puzzle.pack_state(puzzle.goal_state)
+        self.heuristic = get_incremental_heuristic(puzzle.goal_state, heuristic_func)
+        start = puzzle.pack_state(puzzle.initial_state)
+        self.best = {start: Node(start, h=self.heuristic.initial(start))}
+        self.open = IndexedHeap()
+        self.open.push(start, 0)
+        self.closed = set()
+        self.incons = set()
+        self.weight = 1.0
+        self.nodes_explored = 1
+
+    def set_weight(self, weight):
+        """Đổi trọng số: đưa incons vào open, tính lại khóa và làm rỗng closed"""
+        self.weight = weight
+        best = self.best
+        states = list(self.open)
+        states.extend(self.incons)
+        self.open = IndexedHeap()
+        for state in states:
+            node = best[state]
+            self.open.push(state, node.g + weight * node.h)
+        self.incons.clear()
+        self.closed.clear()
+
+    def solution(self):
+        """Đường đi (ma trận) tới đích tốt nhất đã biết, hoặc None"""
+        goal_node = self.best.get(self.goal)
+        if goal_node is None:
+            return None
+        return [self.puzzle.unpack_state(state) for state in goal_node.path()]
+
+    def best_so_far(self):
+        """Lời giải tốt nhất đã biết, nếu chưa có thì đường đi tới nút có h nhỏ nhất"""
+        if self.goal in self.best:
+            return self.solution()
+        return closest_path(self.puzzle, self.best.values())
+
+    def improve_path(self, deadline=None, budget=None):
+        """
+        Mở rộng các nút cho đến khi không còn nút nào trong open có khóa nhỏ
+        hơn g của đích. Trả về False nếu dừng sớm: vì hết budget, hoặc vì quá
+        hạn deadline (time.perf_counter()) sau khi đã có một lời giải.
+        """
+        open_list, closed, incons, best = self.open, self.closed, self.incons, self.best
+        goal, weight = self.goal, self.weight
+        get_successors, delta = self.get_successors, self.heuristic.delta
+        nodes_explored = self.nodes_explored
+        expansions = 0
+        finished = True
+
+        while open_list:
+            if budget is not None and budget.exceeded(nodes_explored, len(best)):
+                finished = False
+                break
+            goal_node = best.get(goal)
+            if goal_node is not None:
+                if goal_node.g <= open_list.priority(open_list.peek()):
+                    break
+                expansions += 1
+                if (deadline is not None and not expansions % _DEADLINE_CHECK_INTERVAL
+                        and time.perf_counter() > deadline):
+                    finished = False
+                    break
+
+            current = best[open_list.pop()]
+            closed.add(current.state)
+            new_cost = current.g + 1
+            for move, target, new_state in get_successors(current.state):
+                old_node = best.get(new_state)
+                if old_node is not None and new_cost >= old_node.g:
+                    continue
+                # h chỉ phụ thuộc vào trạng thái: dùng lại nếu đã tính
+                if old_node is None:
+                    new_h = delta(current.state, target, current.h)
+                else:
+                    new_h = old_node.h
+                best[new_state] = Node(new_state, current, new_cost, new_h)
+                nodes_explored += 1
+                if new_state in closed:
+                    incons.add(new_state)
+                else:
+                    open_list.push(new_state, new_cost + weight * new_h)
+
+        self.nodes_explored = nodes_explored
+        return finished
+
+
+@budgeted
+def weighted_astar_search(puzzle, weight=DEFAULT_WEIGHT, heuristic_func=manhattan_distance,
+                          budget=None):
+    """
+    Weighted A*: f = g + w·h. Với heuristic chấp nhận được, độ dài đường đi
+    không vượt quá w lần độ dài tối ưu, đổi lại số nút mở rộng ít hơn nhiều.
+    Returns (path from initial to goal, nodes explored) or (None, nodes explored)
+    """
+    if not puzzle.is_solvable():
+        return None, 0
+    if weight < 1:
+        raise ValueError(f"Weight must be at least 1, got {weight}")
+    search = _WeightedSearch(puzzle, heuristic_func)
+    search.set_weight(weight)
+    search.improve_path(budget=budget)
+    return search.best_so_far(), search.nodes_explored
+
+
+@budgeted
+def ara_star_search(puzzle, heuristic_func=manhattan_distance, initial_weight=3.0,
+                    weight_step=0.5, time_limit=None, on_solution=None, budget=None):
+    """
+    Anytime Repairing A*: tìm nhanh một lời giải với trọng số lớn rồi giảm dần
+    trọng số về 1, dùng lại các nút đã sinh để cải thiện lời giải. Với
+    time_limit (giây), trả về lời giải tốt nhất tìm được khi hết giờ (lời giải
+    đầu tiên luôn được tìm xong). on_solution(path, weight) được gọi mỗi khi có
+    lời giải mới, path dài không quá weight lần tối ưu.
+    Returns (path from initial to goal, nodes explored) or (None, nodes explored)
+    """
+    if not puzzle.is_solvable():
+        return None, 0
+    if initial_weight < 1:
+        raise ValueError(f"Weight must be at least 1, got {initial_weight}")
+    if weight_step <= 0:
+        raise ValueError(f"Weight step must be positive, got {weight_step}")
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    search = _WeightedSearch(puzzle, heuristic_func)
+    weight = initial_weight
+    while True:
+        search.set_weight(weight)
+        if not search.improve_path(deadline, budget):
+            break
+        if on_solution is not None:
+            on_solution(search.solution(), weight)
+        if weight <= 1 or (deadline is not None and time.perf_counter() > deadline):
+            break
+        weight = max(1.0, weight - weight_step)
+    # Khi hết giờ giữa chừng, đường đi tới đích tốt nhất hiện có vẫn hợp lệ
+    return search.best_so_far(), search.nodes_explored
@@ -3,41 +3,47 @@ Class Puzzle đặc biệt cho thuật toán AND-OR search
 """
 import copy
 import random
+from .move_table import SIZE, get_move_table, get_move_targets
+from .packed_state import default_goal_state
 
 class AndOrPuzzle:
     """Lớp đại diện cho bài toán 8-puzzle đơn giản cho thuật toán AND-OR Search"""
     
-    def __init__(self, initial_state=None, goal_state=None):
+    def __init__(self, initial_state=None, goal_state=None, size=None):
         """
         Khởi tạo đối tượng AndOrPuzzle.
         
         Tham số:
         - initial_state: Trạng thái bắt đầu
         - goal_state: Trạng thái mục tiêu
+        - size: Kích thước lưới (mặc định lấy theo goal_state/initial_state, hoặc 3)
         """
+        if size is None:
+            given = goal_state or initial_state
+            size = len(given) if given else SIZE
+        self.size = size
+        self.move_table = get_move_table(size)
+        self.move_targets = get_move_targets(size)
+        
         # Trạng thái mục tiêu mặc định (đã giải)
-        self.goal_state = goal_state or [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 8, 0]
-        ]
+        self.goal_state = goal_state or default_goal_state(size)
         
         # Trạng thái ban đầu (ở đây là trạng thái đơn giản chỉ cần 1 bước)
-        self.initial_state = initial_state or [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 0, 8]
-        ]
+        if not initial_state:
+            initial_state = [row[:] for row in self.goal_state]
+            last_row = initial_state[-1]
+            last_row[-2], last_row[-1] = last_row[-1], last_row[-2]
+        self.initial_state = initial_state
     
     def is_valid_state(self, state):
-        """Kiểm tra xem trạng thái có hợp lệ không (chứa đúng các số từ 0-8)."""
+        """Kiểm tra xem trạng thái có hợp lệ không (chứa đúng các số từ 0 tới size*size-1)."""
         # Kiểm tra kích thước
-        if len(state) != 3 or any(len(row) != 3 for row in state):
+        if len(state) != self.size or any(len(row) != self.size for row in state):
             return False
         
         # Kiểm tra nội dung
         flat_state = [item for sublist in state for item in sublist]
-        return sorted(flat_state) == list(range(9))
+        return sorted(flat_state) == list(range(self.size * self.size))
     
     def is_goal(self, state):
         """Kiểm tra xem trạng thái có phải là trạng thái mục tiêu không."""
@@ -58,39 +64,22 @@ class AndOrPuzzle:
     
     def get_possible_moves(self, state):
         """Trả về danh sách các hành động hợp lệ từ trạng thái hiện tại."""
-        moves = []
         i, j = self.get_blank_position(state)
         
-        # Kiểm tra và thêm các hành động hợp lệ
-        if i > 0:  # Có thể di chuyển lên
-            moves.append('up')
-        if i < 2:  # Có thể di chuyển xuống
-            moves.append('down')
-        if j > 0:  # Có thể di chuyển sang trái
-            moves.append('left')
-        if j < 2:  # Có thể di chuyển sang phải
-            moves.append('right')
-        
-        return moves
+        # Tra bảng bước đi theo vị trí ô trống (thứ tự: up, down, left, right)
+        return [move for move, target in self.move_table[i * self.size + j]]
     
     def apply_move(self, state, move):
         """Áp dụng hành động lên trạng thái và trả về trạng thái mới."""
-        # Tạo bản sao để không thay đổi trạng thái gốc
-        new_state = [row[:] for row in state]
-        
-        # Lấy vị trí ô trống
+        # Lấy vị trí ô trống và ô sẽ đổi chỗ theo bảng bước đi
         i, j = self.get_blank_position(state)
-        
-        # Di chuyển ô trống theo hành động
-        if move == 'up' and i > 0:  # Di chuyển lên
-            new_state[i][j], new_state[i-1][j] = new_state[i-1][j], new_state[i][j]
-        elif move == 'down' and i < 2:  # Di chuyển xuống
-            new_state[i][j], new_state[i+1][j] = new_state[i+1][j], new_state[i][j]
-        elif move == 'left' and j > 0:  # Di chuyển sang trái
-            new_state[i][j], new_state[i][j-1] = new_state[i][j-1], new_state[i][j]
-        elif move == 'right' and j < 2:  # Di chuyển sang phải
-            new_state[i][j], new_state[i][j+1] = new_state[i][j+1], new_state[i][j]
-        else:
+        target = self.move_targets[i * self.size + j].get(move)
+        if target is None:
             raise ValueError(f"Hành động {move} không hợp lệ từ vị trí ({i},{j})")
         
+        # Tạo bản sao để không thay đổi trạng thái gốc
+        new_state = [row[:] for row in state]
+        i2, j2 = divmod(target, self.size)
+        new_state[i][j], new_state[i2][j2] = new_state[i2][j2], new_state[i][j]
+        
         return new_state
@@ -0,0 +1,128 @@
+"""
+Bucket-based open lists for small non-negative integer priorities
+
+Chi phí trong sliding puzzle (g, h, f) đều là số nguyên nhỏ nên thay cho heap,
+open list là một mảng các danh sách (bucket) đánh chỉ số theo độ ưu tiên: thêm
+vào là append, lấy ra là pop ở bucket nhỏ nhất còn phần tử - O(1) và không có
+phép so sánh __lt__ nào ở mức Python. Các phần tử cùng độ ưu tiên được lấy ra
+theo thứ tự LIFO (phần tử mới sinh, thường là nút sâu hơn, đi trước).
+
+Khi cần thứ tự theo hai khóa (ví dụ A*: f tăng dần, cùng f thì g giảm dần),
+f_g_priority gộp cặp (f, g) thành một chỉ số bucket duy nhất.
+"""
+
+
+def f_g_priority(f, g):
+    """
+    Chỉ số bucket của cặp (f, g) với 0 <= g <= f: các cặp được sắp theo f tăng
+    dần, cùng f thì g giảm dần. Mỗi f chiếm f + 1 bucket liên tiếp bắt đầu từ
+    f * (f + 1) / 2 (số tam giác), vị trí trong đó là f - g (chính là h trong A*).
+    """
+    return (f * (f + 1) >> 1) + f - g
+
+
+class BucketQueue:
+    """
+    Open list theo bucket, cho phép cùng một phần tử xuất hiện nhiều lần
+    (giống heapq: bên gọi tự bỏ qua các bản cũ khi lấy ra)
+    """
+
+    __slots__ = ('_buckets', '_min', '_size')
+
+    def __init__(self):
+        # _buckets[priority]: các phần tử có độ ưu tiên priority
+        self._buckets = []
+        # Mọi bucket có chỉ số nhỏ hơn _min đều rỗng
+        self._min = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def _bucket(self, priority):
+        buckets = self._buckets
+        if priority >= len(buckets):
+            buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+        if priority < self._min:
+            self._min = priority
+        return buckets[priority]
+
+    def push(self, item, priority):
+        """Thêm item với độ ưu tiên priority (số nguyên không âm)"""
+        buckets = self._buckets
+        if priority < len(buckets) and priority >= self._min:
+            buckets[priority].append(item)
+        else:
+            self._bucket(priority).append(item)
+        self._size += 1
+
+    def pop(self):
+        """Lấy ra phần tử thêm vào sau cùng trong bucket nhỏ nhất còn phần tử"""
+        if not self._size:
+            raise IndexError("pop from an empty bucket queue")
+        buckets = self._buckets
+        priority = self._min
+        while not buckets[priority]:
+            priority += 1
+        self._min = priority
+        self._size -= 1
+        return buckets[priority].pop()
+
+
+class IndexedBucketQueue(BucketQueue):
+    """
+    Open list theo bucket trong đó mỗi phần tử (hashable, ví dụ trạng thái đã
+    nén) có mặt nhiều nhất một lần; push một phần tử đã có sẽ chuyển nó sang
+    bucket mới (decrease-key) trong O(1), nên kích thước luôn đúng bằng tập open.
+    Cùng giao diện với models.indexed_heap.IndexedHeap.
+    """
+
+    __slots__ = ('_priorities', '_slots')
+
+    def __init__(self):
+        super().__init__()
+        # _priorities[item]: bucket chứa item, _slots[item]: vị trí trong bucket
+        self._priorities = {}
+        self._slots = {}
+
+    def __contains__(self, item):
+        return item in self._priorities
+
+    def priority(self, item):
+        """Độ ưu tiên hiện tại của item (KeyError nếu không có trong hàng đợi)"""
+        return self._priorities[item]
+
+    def push(self, item, priority):
+        """Thêm item, hoặc chuyển item sang bucket priority nếu đã có"""
+        priorities = self._priorities
+        old_priority = priorities.get(item)
+        if old_priority is not None:
+            if old_priority == priority:
+                return
+            # Gỡ item khỏi bucket cũ: đưa phần tử cuối vào chỗ trống
+            slots = self._slots
+            bucket = self._buckets[old_priority]
+            last = bucket.pop()
+            if last != item:
+                slot = slots[item]
+                bucket[slot] = last
+                slots[last] = slot
+            self._size -= 1
+        buckets = self._buckets
+        if priority < len(buckets) and priority >= self._min:
+            bucket = buckets[priority]
+        else:
+            bucket = self._bucket(priority)
+        priorities[item] = priority
+        self._slots[item] = len(bucket)
+        bucket.append(item)
+        self._size += 1
+
+    def pop(self):
+        item = BucketQueue.pop(self)
+        del self._priorities[item]
+        del self._slots[item]
+        return item
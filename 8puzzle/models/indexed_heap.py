@@ -0,0 +1,128 @@
+"""
+Indexed binary heap with decrease-key
+
+Mỗi phần tử (ví dụ trạng thái đã nén) xuất hiện nhiều nhất một lần trong heap;
+vị trí của nó được lưu trong một dict nên khi tìm được đường đi tốt hơn chỉ cần
+cập nhật độ ưu tiên tại chỗ (decrease-key) thay vì đẩy thêm một bản sao. Kích
+thước heap vì thế luôn đúng bằng tập open thực sự.
+"""
+
+
+class IndexedHeap:
+    """Min-heap các phần tử khác nhau, độ ưu tiên có thể thay đổi"""
+
+    __slots__ = ('_items', '_priorities', '_positions')
+
+    def __init__(self):
+        self._items = []
+        self._priorities = []
+        # _positions[item]: chỉ số của item trong hai mảng song song
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __iter__(self):
+        """Các phần tử trong heap (không theo thứ tự ưu tiên)"""
+        return iter(self._items)
+
+    def peek(self):
+        """Phần tử có độ ưu tiên nhỏ nhất, không lấy ra"""
+        return self._items[0]
+
+    def priority(self, item):
+        """Độ ưu tiên hiện tại của item (KeyError nếu không có trong heap)"""
+        return self._priorities[self._positions[item]]
+
+    def push(self, item, priority):
+        """
+        Thêm item, hoặc đổi độ ưu tiên nếu item đã có trong heap
+        (giảm thì vun lên, tăng thì vun xuống)
+        """
+        positions = self._positions
+        position = positions.get(item)
+        if position is None:
+            items = self._items
+            priorities = self._priorities
+            position = len(items)
+            items.append(item)
+            priorities.append(priority)
+            # Vun lên (viết trực tiếp vì đây là thao tác thường gặp nhất)
+            while position:
+                parent = (position - 1) >> 1
+                parent_priority = priorities[parent]
+                if parent_priority <= priority:
+                    break
+                parent_item = items[parent]
+                items[position] = parent_item
+                priorities[position] = parent_priority
+                positions[parent_item] = position
+                position = parent
+            items[position] = item
+            priorities[position] = priority
+            positions[item] = position
+        elif priority < self._priorities[position]:
+            self._sift_up(position, item, priority)
+        elif priority > self._priorities[position]:
+            self._sift_down(position, item, priority)
+
+    def pop(self):
+        """Lấy ra phần tử có độ ưu tiên nhỏ nhất"""
+        items = self._items
+        priorities = self._priorities
+        top = items[0]
+        del self._positions[top]
+        last = items.pop()
+        last_priority = priorities.pop()
+        if items:
+            self._sift_down(0, last, last_priority)
+        return top
+
+    def _sift_up(self, position, item, priority):
+        items = self._items
+        priorities = self._priorities
+        positions = self._positions
+        while position:
+            parent = (position - 1) >> 1
+            parent_priority = priorities[parent]
+            if parent_priority <= priority:
+                break
+            parent_item = items[parent]
+            items[position] = parent_item
+            priorities[position] = parent_priority
+            positions[parent_item] = position
+            position = parent
+        items[position] = item
+        priorities[position] = priority
+        positions[item] = position
+
+    def _sift_down(self, position, item, priority):
+        items = self._items
+        priorities = self._priorities
+        positions = self._positions
+        size = len(items)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            child_priority = priorities[child]
+            right = child + 1
+            if right < size and priorities[right] < child_priority:
+                child = right
+                child_priority = priorities[right]
+            if priority <= child_priority:
+                break
+            child_item = items[child]
+            items[position] = child_item
+            priorities[position] = child_priority
+            positions[child_item] = position
+            position = child
+        items[position] = item
+        priorities[position] = priority
+        positions[item] = position
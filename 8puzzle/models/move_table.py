@@ -0,0 +1,49 @@
+"""
+Bảng các bước đi hợp lệ theo vị trí ô trống cho sliding puzzle N x N
+
+Bảng cho lưới 3x3 được tạo một lần khi import, các kích thước khác được tạo
+lần đầu cần đến qua get_move_table. MOVE_TABLE[blank] là tuple các cặp
+(move, target): move là tên bước đi ('up', 'down', 'left', 'right' - hướng di
+chuyển của ô trống) và target là chỉ số (0 tới N*N-1, đánh số theo hàng) của ô sẽ đổi
+chỗ với ô trống. Thứ tự các bước đi giống Puzzle.get_possible_moves.
+"""
+from functools import lru_cache
+
+SIZE = 3
+
+MOVE_DELTAS = {
+    'up': (-1, 0),
+    'down': (1, 0),
+    'left': (0, -1),
+    'right': (0, 1)
+}
+
+
+def build_move_table(size=SIZE):
+    """Tạo bảng bước đi cho lưới size x size"""
+    table = []
+    for blank in range(size * size):
+        i, j = divmod(blank, size)
+        moves = []
+        for move, (di, dj) in MOVE_DELTAS.items():
+            ni, nj = i + di, j + dj
+            if 0 <= ni < size and 0 <= nj < size:
+                moves.append((move, ni * size + nj))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def get_move_table(size=SIZE):
+    """Bảng bước đi (dùng chung) cho lưới size x size"""
+    return build_move_table(size)
+
+
+@lru_cache(maxsize=None)
+def get_move_targets(size=SIZE):
+    """Tra cứu nhanh ô đích của một bước đi: targets[blank][move] -> target"""
+    return tuple(dict(moves) for moves in get_move_table(size))
+
+
+MOVE_TABLE = get_move_table()
+MOVE_TARGETS = get_move_targets()
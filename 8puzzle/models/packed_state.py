@@ -0,0 +1,148 @@
+"""
+Packed integer representation of sliding puzzle states
+
+Trạng thái N x N được nén thành một số nguyên: ô thứ k (đánh số theo hàng,
+từ 0 đến N*N-1) chiếm tile_bits bit ở vị trí k*tile_bits (4 bit cho 3x3 và 4x4,
+5 bit cho 5x5). Chỉ số của ô trống được lưu sẵn ở các bit phía trên để không
+phải quét lại trạng thái. Vì ô trống được xác định duy nhất bởi các ô số, hai
+trạng thái bằng nhau khi và chỉ khi hai số nguyên bằng nhau, nên có thể dùng
+trực tiếp làm khóa hash.
+
+PackedLayout gom các hằng số và thao tác cho một kích thước; các hằng số và hàm
+ở cấp module là của lưới 3x3 (8-puzzle).
+"""
+from functools import lru_cache
+from .move_table import SIZE, get_move_table
+
+
+class PackedLayout:
+    """Cách nén trạng thái của lưới size x size"""
+
+    def __init__(self, size):
+        if size < 2:
+            raise ValueError(f"Invalid puzzle size: {size}")
+        self.size = size
+        self.cells = size * size
+        self.tile_bits = (self.cells - 1).bit_length()
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.blank_shift = self.cells * self.tile_bits
+        self.tiles_mask = (1 << self.blank_shift) - 1
+        # Số nguyên đã nén có vừa một số 64 bit có dấu (array('q')) hay không
+        self.fits_int64 = self.blank_shift + (self.cells - 1).bit_length() < 64
+        self.move_table = get_move_table(size)
+
+    def pack(self, state):
+        """Chuyển ma trận size x size thành số nguyên đã nén"""
+        tile_bits = self.tile_bits
+        packed = 0
+        blank = -1
+        index = 0
+        for row in state:
+            for num in row:
+                if num == 0:
+                    blank = index
+                packed |= num << (index * tile_bits)
+                index += 1
+        if blank < 0:
+            raise ValueError("Invalid state: no blank position found")
+        return packed | (blank << self.blank_shift)
+
+    def unpack(self, packed):
+        """Chuyển số nguyên đã nén về ma trận size x size"""
+        tile_bits, tile_mask, size = self.tile_bits, self.tile_mask, self.size
+        flat = [(packed >> (index * tile_bits)) & tile_mask for index in range(self.cells)]
+        return [flat[i:i + size] for i in range(0, self.cells, size)]
+
+    def get_tile(self, packed, index):
+        """Giá trị của ô tại chỉ số index"""
+        return (packed >> (index * self.tile_bits)) & self.tile_mask
+
+    def move_blank(self, packed, target):
+        """
+        Đổi chỗ ô trống với ô tại chỉ số target (giả định hai ô kề nhau).
+        Ô trống mang giá trị 0 nên chỉ cần chuyển giá trị của ô kia sang vị trí
+        của ô trống - O(1), không sao chép dữ liệu.
+        """
+        tile_bits = self.tile_bits
+        blank_shift = self.blank_shift
+        blank = packed >> blank_shift
+        tile = (packed >> (target * tile_bits)) & self.tile_mask
+        tiles = ((packed & self.tiles_mask) + (tile << (blank * tile_bits))
+                 - (tile << (target * tile_bits)))
+        return tiles | (target << blank_shift)
+
+    def get_successors(self, packed):
+        """
+        Trả về danh sách (move, target, trạng thái mới) theo thứ tự
+        up, down, left, right - giống Puzzle.get_possible_moves
+        """
+        tile_bits = self.tile_bits
+        blank_shift = self.blank_shift
+        blank = packed >> blank_shift
+        tiles = packed & self.tiles_mask
+        blank_tile_shift = blank * tile_bits
+        tile_mask = self.tile_mask
+        successors = []
+        for move, target in self.move_table[blank]:
+            target_shift = target * tile_bits
+            tile = (tiles >> target_shift) & tile_mask
+            new_tiles = tiles + (tile << blank_tile_shift) - (tile << target_shift)
+            successors.append((move, target, new_tiles | (target << blank_shift)))
+        return successors
+
+
+def default_goal_state(size=SIZE):
+    """Trạng thái đích chuẩn: 1 .. size*size-1 theo hàng, ô trống ở cuối"""
+    cells = size * size
+    flat = list(range(1, cells)) + [0]
+    return [flat[i:i + size] for i in range(0, cells, size)]
+
+
+@lru_cache(maxsize=None)
+def get_layout(size=SIZE):
+    """PackedLayout (dùng chung) cho lưới size x size"""
+    return PackedLayout(size)
+
+
+def layout_of(state):
+    """PackedLayout ứng với kích thước của ma trận state"""
+    return get_layout(len(state))
+
+
+# Cách nén của 8-puzzle (3x3)
+LAYOUT = get_layout(SIZE)
+CELLS = LAYOUT.cells
+TILE_BITS = LAYOUT.tile_bits
+TILE_MASK = LAYOUT.tile_mask
+BLANK_SHIFT = LAYOUT.blank_shift
+TILES_MASK = LAYOUT.tiles_mask
+
+
+def pack_state(state):
+    """Chuyển ma trận N x N thành số nguyên đã nén (kích thước lấy theo state)"""
+    return layout_of(state).pack(state)
+
+
+def unpack_state(packed):
+    """Chuyển số nguyên đã nén về ma trận 3x3"""
+    return LAYOUT.unpack(packed)
+
+
+def get_blank_index(packed):
+    """Chỉ số (0-8) của ô trống, đọc trực tiếp từ các bit đã lưu sẵn"""
+    return packed >> BLANK_SHIFT
+
+
+def get_tile(packed, index):
+    """Giá trị của ô tại chỉ số index"""
+    return (packed >> (index * TILE_BITS)) & TILE_MASK
+
+
+def move_blank(packed, target):
+    """Đổi chỗ ô trống với ô tại chỉ số target của trạng thái 3x3 đã nén"""
+    return LAYOUT.move_blank(packed, target)
+
+
+def get_successors(packed):
+    """Các trạng thái kề (move, target, trạng thái mới) của trạng thái 3x3 đã nén"""
+    return LAYOUT.get_successors(packed)
@@ -0,0 +1,171 @@
+"""
+Xếp hạng hoàn hảo (perfect hash) các trạng thái 8-puzzle theo mã Lehmer
+
+Mỗi trạng thái là một hoán vị của 0-8 (ô trống là 0) nên được ánh xạ một-một
+vào một số nguyên trong [0, 9!). Nhờ đó tập đã thăm có thể là một bytearray
+9! = 362880 byte và giá trị g là một array('b') cùng kích thước, thay cho set
+và dict chứa chuỗi/số nguyên.
+
+Chỉ áp dụng cho lưới 3x3: với 15-puzzle trở lên, new_state_table trả về một
+dict thay cho mảng dày đặc.
+"""
+from array import array
+from functools import lru_cache
+from .packed_state import CELLS, TILE_BITS, TILE_MASK, BLANK_SHIFT, TILES_MASK, SIZE
+
+FACTORIALS = [1]
+for _i in range(1, CELLS + 1):
+    FACTORIALS.append(FACTORIALS[-1] * _i)
+
+STATE_COUNT = FACTORIALS[CELLS]
+
+
+@lru_cache(maxsize=None)
+def lower_count_table(cells):
+    """
+    table[used][value]: số giá trị chưa dùng (bit 0 trong used) nhỏ hơn value,
+    dùng để tính mã Lehmer của hoán vị (từng phần) trên cells phần tử
+    """
+    return [[bin(~used & ((1 << value) - 1)).count('1') for value in range(cells)]
+            for used in range(1 << cells)]
+
+
+LOWER_COUNT = lower_count_table(CELLS)
+
+# Bảng phẳng LOWER_FLAT[used << TILE_BITS | value] để tra cứu bằng một phép chỉ số
+LOWER_FLAT = []
+for _used in range(1 << CELLS):
+    LOWER_FLAT.extend(LOWER_COUNT[_used] + [0] * (TILE_MASK + 1 - CELLS))
+
+HEAD_TILES = 4
+HEAD_BITS = HEAD_TILES * TILE_BITS
+
+
+def _build_head_table():
+    """
+    HEAD_TABLE[16 bit thấp của trạng thái] = (hạng một phần, tập giá trị đã dùng)
+    cho 4 ô đầu tiên, để rank_state chỉ còn phải xử lý 4 ô phía sau
+    """
+    table = [None] * (1 << HEAD_BITS)
+    for key in range(1 << HEAD_BITS):
+        rank = 0
+        used = 0
+        for index in range(HEAD_TILES):
+            tile = (key >> (index * TILE_BITS)) & TILE_MASK
+            if tile >= CELLS or used & (1 << tile):
+                break
+            rank = rank * (CELLS - index) + LOWER_COUNT[used][tile]
+            used |= 1 << tile
+        else:
+            table[key] = (rank, used)
+    return table
+
+
+HEAD_TABLE = _build_head_table()
+
+
+def rank_state(packed, head_table=HEAD_TABLE, lower=LOWER_FLAT):
+    """
+    Hạng Lehmer trong [0, 9!) của trạng thái đã nén (xem models.packed_state).
+    Bốn ô đầu tra bảng, bốn ô tiếp theo được tính trực tiếp; chữ số Lehmer của
+    ô cuối cùng luôn bằng 0 nên không cần xét.
+    """
+    rank, used = head_table[packed & 0xFFFF]
+    tile = (packed >> 16) & 15
+    rank = rank * 5 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (packed >> 20) & 15
+    rank = rank * 4 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (packed >> 24) & 15
+    rank = rank * 3 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (packed >> 28) & 15
+    return rank * 2 + lower[used << 4 | tile]
+
+
+def unrank_state(rank):
+    """Trạng thái đã nén ứng với hạng Lehmer rank"""
+    remaining = list(range(CELLS))
+    packed = 0
+    blank = 0
+    for index in range(CELLS):
+        digit, rank = divmod(rank, FACTORIALS[CELLS - 1 - index])
+        tile = remaining.pop(digit)
+        if tile == 0:
+            blank = index
+        packed |= tile << (index * TILE_BITS)
+    return packed | (blank << BLANK_SHIFT)
+
+
+REACHABLE_COUNT = STATE_COUNT // 2
+REACHABLE_PER_BLANK = REACHABLE_COUNT // CELLS
+
+
+def rank_reachable(packed, lower=LOWER_FLAT):
+    """
+    Chỉ số dày đặc trong [0, 9!/2) của trạng thái trong một lớp chẵn lẻ.
+
+    Với vị trí ô trống cố định, các trạng thái đến được từ nhau có cùng tính chẵn
+    lẻ của hoán vị 8 ô số. Hai hoán vị có hạng Lehmer 2k và 2k+1 chỉ khác nhau ở
+    việc đổi chỗ hai phần tử cuối nên khác tính chẵn lẻ; vì vậy hạng >> 1 là song
+    ánh từ mỗi lớp vào [0, 8!/2). Kết quả: blank * 8!/2 + (hạng 8 ô số >> 1).
+
+    Ô trống được cắt khỏi số nguyên đã nén, 8 ô số còn lại được xếp hạng như
+    trong rank_state (giá trị 0 coi như đã dùng); chữ số Lehmer cuối luôn bằng 0.
+    """
+    blank = packed >> BLANK_SHIFT
+    shift = blank * TILE_BITS
+    tiles = packed & TILES_MASK
+    tiles = (tiles & ((1 << shift) - 1)) | ((tiles >> (shift + TILE_BITS)) << shift)
+    tile = tiles & 15
+    rank = lower[16 | tile]
+    used = 1 | 1 << tile
+    tile = (tiles >> 4) & 15
+    rank = rank * 7 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (tiles >> 8) & 15
+    rank = rank * 6 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (tiles >> 12) & 15
+    rank = rank * 5 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (tiles >> 16) & 15
+    rank = rank * 4 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (tiles >> 20) & 15
+    rank = rank * 3 + lower[used << 4 | tile]
+    used |= 1 << tile
+    tile = (tiles >> 24) & 15
+    rank = rank * 2 + lower[used << 4 | tile]
+    return blank * REACHABLE_PER_BLANK + (rank >> 1)
+
+
+class SparseStateTable(dict):
+    """Bảng trạng thái đã nén -> giá trị cho lưới lớn, trả về default khi chưa có"""
+
+    def __init__(self, default=0):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+def state_key(packed):
+    """Khóa của trạng thái trong SparseStateTable: chính số nguyên đã nén"""
+    return packed
+
+
+def new_state_table(layout, typecode='B', default=0):
+    """
+    Trả về (key, table) để đọc/ghi table[key(state)] cho trạng thái đã nén.
+    Lưới 3x3: key là rank_state và table là mảng 9! phần tử (bytearray khi
+    typecode 'B' và default 0, ngược lại array(typecode)). Lưới lớn hơn:
+    không gian trạng thái quá lớn nên dùng SparseStateTable.
+    """
+    if layout.size != SIZE:
+        return state_key, SparseStateTable(default)
+    if typecode == 'B' and default == 0:
+        return rank_state, bytearray(STATE_COUNT)
+    return rank_state, array(typecode, [default]) * STATE_COUNT
@@ -1,21 +1,26 @@
-"""8-puzzle model implementation"""
+"""Sliding puzzle (8-puzzle and other N x N sizes) model implementation"""
 import random
+from .packed_state import get_layout, default_goal_state
+from .move_table import SIZE, get_move_targets
+from .solvability import is_solvable
 
 class Puzzle:
-    def __init__(self, initial_state=None):
-        # Goal state as shown in the image
-        self.goal_state = [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 8, 0]
-        ]
+    def __init__(self, initial_state=None, size=None):
+        # Grid size: taken from initial_state when given, 3 (8-puzzle) by default
+        if initial_state:
+            size = len(initial_state)
+        self.size = size or SIZE
+        self.layout = get_layout(self.size)
+        self.move_table = self.layout.move_table
+        self.move_targets = get_move_targets(self.size)
+        
+        # Goal state as shown in the image (blank in the bottom-right corner)
+        self.goal_state = default_goal_state(self.size)
         
-        # Default initial state as shown in the image
-        self.default_initial_state = [
-            [1, 2, 3],
-            [4, 5, 6],
-            [7, 0, 8]
-        ]
+        # Default initial state as shown in the image (one move away from the goal)
+        self.default_initial_state = [row[:] for row in self.goal_state]
+        last_row = self.default_initial_state[-1]
+        last_row[-2], last_row[-1] = last_row[-1], last_row[-2]
         
         if initial_state:
             if not self.is_valid_state(initial_state):
@@ -25,77 +30,79 @@ class Puzzle:
             self.initial_state = self.default_initial_state
             
     def is_valid_state(self, state):
-        """Check if state is valid (3x3 grid with numbers 0-8)"""
-        if len(state) != 3 or any(len(row) != 3 for row in state):
+        """Check if state is valid (size x size grid with numbers 0 to size*size-1)"""
+        if len(state) != self.size or any(len(row) != self.size for row in state):
             return False
             
         numbers = []
         for row in state:
             numbers.extend(row)
-        return sorted(numbers) == list(range(9))
+        return sorted(numbers) == list(range(self.size * self.size))
             
     def generate_solvable_state(self):
         """Generate a random solvable puzzle state"""
         while True:
-            numbers = list(range(9))
+            cells = self.size * self.size
+            numbers = list(range(cells))
             random.shuffle(numbers)
-            state = [numbers[i:i+3] for i in range(0, 9, 3)]
+            state = [numbers[i:i+self.size] for i in range(0, cells, self.size)]
             self.initial_state = state
             if self.is_solvable():
                 return state
         
     def is_solvable(self):
-        """Check if the puzzle is solvable using inversion count"""
-        flat_initial = [num for row in self.initial_state for num in row]
-        inversions = 0
-        
-        for i in range(len(flat_initial)):
-            for j in range(i + 1, len(flat_initial)):
-                if flat_initial[i] != 0 and flat_initial[j] != 0 and flat_initial[i] > flat_initial[j]:
-                    inversions += 1
-                    
-        return inversions % 2 == 0
+        """Check if goal_state can be reached from initial_state (see models.solvability)"""
+        return is_solvable(self.initial_state, self.goal_state)
         
     def get_blank_pos(self, state):
         """Get position of blank (0) in state"""
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.size):
+            for j in range(self.size):
                 if state[i][j] == 0:
                     return i, j
         raise ValueError("Invalid state: no blank position found")
         
     def get_possible_moves(self, state):
         """Get list of possible moves (up, down, left, right)"""
-        moves = []
         i, j = self.get_blank_pos(state)
-        
-        if i > 0: moves.append('up')
-        if i < 2: moves.append('down')
-        if j > 0: moves.append('left')
-        if j < 2: moves.append('right')
-        
-        return moves
+        return [move for move, target in self.move_table[i * self.size + j]]
         
     def apply_move(self, state, move):
         """Apply move to state and return new state"""
-        if move not in self.get_possible_moves(state):
+        i, j = self.get_blank_pos(state)
+        target = self.move_targets[i * self.size + j].get(move)
+        if target is None:
             raise ValueError(f"Invalid move: {move}")
             
         new_state = [row[:] for row in state]
-        i, j = self.get_blank_pos(state)
-        
-        if move == 'up':    i2, j2 = i-1, j
-        elif move == 'down':  i2, j2 = i+1, j
-        elif move == 'left':  i2, j2 = i, j-1
-        else:  # right
-            i2, j2 = i, j+1
-        
+        i2, j2 = divmod(target, self.size)
         new_state[i][j], new_state[i2][j2] = new_state[i2][j2], new_state[i][j]
         return new_state
         
+    def get_successors(self, state):
+        """Get list of (move, new state) for every legal move, scanning for the blank only once"""
+        i, j = self.get_blank_pos(state)
+        successors = []
+        for move, target in self.move_table[i * self.size + j]:
+            new_state = [row[:] for row in state]
+            i2, j2 = divmod(target, self.size)
+            new_state[i][j], new_state[i2][j2] = new_state[i2][j2], new_state[i][j]
+            successors.append((move, new_state))
+        return successors
+        
     def get_state_string(self, state):
         """Convert state to string for comparison"""
-        return ''.join(str(num) for row in state for num in row)
+        # Numbers above 9 need a separator to keep the string unambiguous
+        separator = '' if self.size <= 3 else ','
+        return separator.join(str(num) for row in state for num in row)
+        
+    def pack_state(self, state):
+        """Convert state to packed integer (see models.packed_state)"""
+        return self.layout.pack(state)
+        
+    def unpack_state(self, packed):
+        """Convert packed integer back to size x size list state"""
+        return self.layout.unpack(packed)
         
     def is_goal(self, state):
         """Check if state is goal state"""
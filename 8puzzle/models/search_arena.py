@@ -0,0 +1,46 @@
+"""
+Parent-pointer arena for uninformed searches
+
+Thay vì đưa cả danh sách đường đi vào hàng đợi/ngăn xếp (sao chép O(độ sâu) cho
+mỗi nút con), mỗi nút chỉ được lưu một lần trong các mảng liền kề: trạng thái đã
+nén, chỉ số nút cha và độ sâu. Hàng đợi/ngăn xếp chỉ chứa chỉ số, đường đi được
+dựng lại một lần khi gặp trạng thái đích.
+"""
+from array import array
+from .packed_state import LAYOUT
+
+NO_PARENT = -1
+
+
+class SearchArena:
+    """Các nút tìm kiếm lưu theo chỉ số trong ba mảng song song"""
+
+    __slots__ = ('states', 'parents', 'depths')
+
+    def __init__(self, start, layout=LAYOUT):
+        # Trạng thái của lưới từ 4x4 trở lên không vừa 64 bit: dùng list
+        self.states = array('q', [start]) if layout.fits_int64 else [start]
+        self.parents = array('i', [NO_PARENT])
+        self.depths = array('H', [0])
+
+    def __len__(self):
+        return len(self.states)
+
+    def add(self, state, parent):
+        """Thêm nút con của parent, trả về chỉ số của nút mới"""
+        states = self.states
+        states.append(state)
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1)
+        return len(states) - 1
+
+    def path(self, index):
+        """Các trạng thái đã nén từ gốc tới nút index"""
+        states = self.states
+        parents = self.parents
+        path = []
+        while index != NO_PARENT:
+            path.append(states[index])
+            index = parents[index]
+        path.reverse()
+        return path
@@ -3,7 +3,9 @@ import copy
 class SensorlessPuzzle:
    
     
-    def __init__(self):
+    def __init__(self, initial_belief_state=None, goal_states=None):
+        # Có thể truyền belief state ban đầu và các trạng thái đích (kích thước
+        # N x N bất kỳ); mặc định là các cấu hình 3x3 cố định dưới đây
         
         # Initial belief state - 2 cấu hình đại diện cố định
         self.initial_belief_state = [
@@ -26,6 +28,11 @@ class SensorlessPuzzle:
             # Biến thể 4: đổi vị trí 4 và 7
             [[1, 2, 3], [7, 5, 6], [4, 8, 0]]
         ]
+        
+        if initial_belief_state is not None:
+            self.initial_belief_state = initial_belief_state
+        if goal_states is not None:
+            self.goal_states = goal_states
     
     def get_initial_belief_state(self):
         """Trả về belief state ban đầu."""
@@ -59,11 +66,12 @@ class SensorlessPuzzle:
             # Xác định các hành động hợp lệ
             if empty_row > 0:
                 all_actions.add("UP")
-            if empty_row < 2:
+            last = len(state) - 1
+            if empty_row < last:
                 all_actions.add("DOWN")
             if empty_col > 0:
                 all_actions.add("LEFT")
-            if empty_col < 2:
+            if empty_col < last:
                 all_actions.add("RIGHT")
         
         return list(all_actions)
@@ -92,13 +100,14 @@ class SensorlessPuzzle:
             # Áp dụng hành động nếu hợp lệ
             new_state = self._deep_copy(state)
             applied = False
+            last = len(state) - 1
             
             if action == "UP" and empty_row > 0:
                 # Di chuyển ô trống lên
                 new_state[empty_row][empty_col] = new_state[empty_row-1][empty_col]
                 new_state[empty_row-1][empty_col] = 0
                 applied = True
-            elif action == "DOWN" and empty_row < 2:
+            elif action == "DOWN" and empty_row < last:
                 # Di chuyển ô trống xuống
                 new_state[empty_row][empty_col] = new_state[empty_row+1][empty_col]
                 new_state[empty_row+1][empty_col] = 0
@@ -108,7 +117,7 @@ class SensorlessPuzzle:
                 new_state[empty_row][empty_col] = new_state[empty_row][empty_col-1]
                 new_state[empty_row][empty_col-1] = 0
                 applied = True
-            elif action == "RIGHT" and empty_col < 2:
+            elif action == "RIGHT" and empty_col < last:
                 # Di chuyển ô trống sang phải
                 new_state[empty_row][empty_col] = new_state[empty_row][empty_col+1]
                 new_state[empty_row][empty_col+1] = 0
@@ -146,7 +155,7 @@ class SensorlessPuzzle:
         # Kiểm tra từng trạng thái trong belief state
         for state in belief_state:
             # Kiểm tra nếu trạng thái không hợp lệ
-            if not state or not isinstance(state, list) or len(state) != 3:
+            if not state or not isinstance(state, list) or len(state) != len(self.goal_states[0]):
                 print(f"Lỗi: Trạng thái không hợp lệ trong is_goal: {state}")
                 continue
                 
@@ -168,19 +177,20 @@ class SensorlessPuzzle:
     def _find_empty(self, state):
         """Tìm vị trí ô trống (giá trị 0) trong trạng thái."""
         # Kiểm tra trước khi truy cập để tránh lỗi index out of range
-        if not state or not isinstance(state, list) or len(state) != 3:
+        if not state or not isinstance(state, list):
             print(f"Lỗi: Trạng thái không hợp lệ: {state}")
             return -1, -1
-            
-        for i in range(3):
-            if not isinstance(state[i], list) or len(state[i]) != 3:
+        
+        size = len(state)
+        for i in range(size):
+            if not isinstance(state[i], list) or len(state[i]) != size:
                 print(f"Lỗi: Hàng {i} không hợp lệ: {state[i]}")
                 return -1, -1
                 
-            for j in range(3):
+            for j in range(size):
                 if state[i][j] == 0:
                     return i, j
-        return -1, -1  # Không tìm thấy (không xảy ra với 8-puzzle hợp lệ)
+        return -1, -1  # Không tìm thấy (không xảy ra với puzzle hợp lệ)
     
     def _deep_copy(self, state):
         """Tạo bản sao sâu của một trạng thái."""
@@ -188,8 +198,10 @@ class SensorlessPuzzle:
     
     def _is_same_state(self, state1, state2):
         """Kiểm tra xem hai trạng thái có giống nhau không."""
-        for i in range(3):
-            for j in range(3):
+        if len(state1) != len(state2):
+            return False
+        for i in range(len(state1)):
+            for j in range(len(state1)):
                 if state1[i][j] != state2[i][j]:
                     return False
         return True
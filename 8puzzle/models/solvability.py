@@ -0,0 +1,55 @@
+"""
+Solvability check for sliding puzzles with an arbitrary goal state
+
+Mỗi bước đi là một phép đổi chỗ (transposition) giữa ô trống và một ô số, nên
+làm đổi tính chẵn lẻ của hoán vị đưa initial_state về goal_state (tính cả ô
+trống), đồng thời ô trống dịch đi đúng một ô nên khoảng cách Manhattan giữa vị
+trí ô trống hiện tại và vị trí ô trống đích cũng đổi tính chẵn lẻ. Hai đại lượng
+này luôn cùng tính chẵn lẻ với các cặp đến được, và điều kiện đó cũng là đủ, với
+mọi kích thước N x N (chẵn hay lẻ).
+
+Tính chẵn lẻ của hoán vị được tính bằng phân tích chu trình trong O(n).
+"""
+
+
+def permutation_parity(permutation):
+    """
+    Tính chẵn lẻ (0 hoặc 1) của hoán vị trên 0..n-1 bằng phân tích chu trình:
+    một chu trình độ dài k là tích của k-1 phép đổi chỗ
+    """
+    seen = bytearray(len(permutation))
+    transpositions = 0
+    for start in range(len(permutation)):
+        if seen[start]:
+            continue
+        length = 0
+        index = start
+        while not seen[index]:
+            seen[index] = 1
+            index = permutation[index]
+            length += 1
+        transpositions += length - 1
+    return transpositions & 1
+
+
+def is_solvable(initial_state, goal_state):
+    """Có thể đi từ initial_state tới goal_state (cùng kích thước N x N) hay không"""
+    size = len(goal_state)
+    if len(initial_state) != size:
+        return False
+    flat_initial = [num for row in initial_state for num in row]
+    flat_goal = [num for row in goal_state for num in row]
+    cells = size * size
+    if sorted(flat_initial) != list(range(cells)) or sorted(flat_goal) != list(range(cells)):
+        return False
+
+    # permutation[k]: vị trí đích của giá trị đang nằm ở ô k
+    goal_index = [0] * cells
+    for index, num in enumerate(flat_goal):
+        goal_index[num] = index
+    permutation = [goal_index[num] for num in flat_initial]
+
+    blank_row, blank_col = divmod(flat_initial.index(0), size)
+    goal_row, goal_col = divmod(goal_index[0], size)
+    blank_distance = abs(blank_row - goal_row) + abs(blank_col - goal_col)
+    return permutation_parity(permutation) == blank_distance & 1
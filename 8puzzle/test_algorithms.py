@@ -1,12 +1,28 @@
 
+import os
+import tempfile
 import time
 from models.puzzle import Puzzle
 from algorithms.simulated_annealing import simulated_annealing
 from algorithms.stochastic_hill_climbing import stochastic_hill_climbing
 from algorithms.astar import astar_search  # For comparison
 from algorithms.genetic_algorithm import genetic_algorithm  # Thêm thuật toán Di truyền
-from algorithms.andor_search import andor_graph_search  # Thuật toán And-Or Search
-from algorithms.andor_po_search import partially_observable_andor_search  # Thuật toán And-Or Search cho môi trường quan sát một phần
+# The And-Or searches are not part of every checkout; keep the module importable
+# (and its tests collectable) without them
+try:
+    from algorithms.andor_search import andor_graph_search  # Thuật toán And-Or Search
+except ImportError:
+    andor_graph_search = None
+try:
+    from algorithms.andor_po_search import partially_observable_andor_search  # Thuật toán And-Or Search cho môi trường quan sát một phần
+except ImportError:
+    partially_observable_andor_search = None
+from algorithms.budget import SOLVED, CANCELLED
+from algorithms.registry import ALGORITHMS
+from algorithms.solver_pool import SolverPool  # Chạy song song trên nhiều tiến trình
+from models.bucket_queue import IndexedBucketQueue, f_g_priority
+from algorithms.q_table import DenseQTable
+from algorithms.q_learning import QLearning
 
 def format_path(path):
     """Format path for display"""
@@ -56,7 +72,10 @@ def run_test(initial_state, test_name="Test"):
     
     # Test And-Or Search (phiên bản cơ bản)
     start_time = time.time()
-    andor_path, andor_nodes = andor_graph_search(puzzle, max_depth=20, max_time=10)
+    if andor_graph_search is not None:
+        andor_path, andor_nodes = andor_graph_search(puzzle, max_depth=20, max_time=10)
+    else:
+        andor_path, andor_nodes = None, 0
     andor_time = time.time() - start_time
     
     # Phiên bản nâng cao đã bị loại bỏ
@@ -98,6 +117,9 @@ def run_test(initial_state, test_name="Test"):
         print(f"And-Or Graph Search solution is {'valid' if is_valid else 'INVALID'}")
         
     # Thêm kiểm tra cho Partially Observable And-Or Search
+    if partially_observable_andor_search is None:
+        print("Partially Observable And-Or Search: not available")
+        return
     start_time = time.time()
     po_andor_path, po_andor_nodes = partially_observable_andor_search(puzzle, max_time=15)
     po_andor_time = time.time() - start_time
@@ -115,6 +137,81 @@ def run_test(initial_state, test_name="Test"):
     #     is_valid = validate_solution(puzzle, adv_andor_path)
     #     print(f"Advanced And-Or Search solution is {'valid' if is_valid else 'INVALID'}")
 
+def run_all_algorithms(test_states, workers=None):
+    """Run every registered algorithm on every test state in parallel worker processes"""
+    print("\n===== All algorithms (process pool) =====")
+    # One progress/cancel slot per job
+    with SolverPool(max_workers=workers, tracked_jobs=len(test_states) * len(ALGORITHMS)) as pool:
+        jobs = []
+        for test_index, state in enumerate(test_states, 1):
+            puzzle = Puzzle(state)
+            for algorithm in ALGORITHMS:
+                job = pool.submit(state, puzzle.goal_state, algorithm, time_limit=15)
+                jobs.append((test_index, algorithm, puzzle, job))
+        
+        for test_index, algorithm, puzzle, job in jobs:
+            job.wait()
+            if job.error is not None:
+                print(f"Test {test_index} {algorithm:<8} error: {job.error}")
+                continue
+            path = job.path
+            status = job.status
+            if path and status == SOLVED:
+                status += ", valid" if validate_solution(puzzle, path) else ", INVALID"
+            print(f"Test {test_index} {algorithm:<8} {format_path(path)}, explored "
+                  f"{job.nodes_explored} nodes in {job.solve_time:.4f}s ({status})")
+
+def test_astar_open_list_prefers_higher_g():
+    """Among equal f, the A* open list pops the entry with the larger g first"""
+    frontier = IndexedBucketQueue()
+    entries = {"a": (5, 1), "b": (5, 4), "c": (6, 6), "d": (5, 2), "e": (4, 0), "f": (5, 3)}
+    for item, (f, g) in entries.items():
+        frontier.push(item, f_g_priority(f, g))
+    # Decrease-key: "c" (h = 0) is reached by a shorter path, g 6 -> 5
+    frontier.push("c", f_g_priority(5, 5))
+    order = [frontier.pop() for _ in range(len(entries))]
+    assert order == ["e", "c", "b", "f", "d", "a"], order
+
+def test_q_table_round_trip_keeps_visited():
+    """A saved and reloaded dense Q-table reports the same visited states"""
+    table = DenseQTable()
+    trained = table.key([[1, 2, 3], [4, 5, 6], [7, 0, 8]])
+    untouched = table.key([[1, 2, 3], [4, 0, 6], [7, 5, 8]])
+    table.update(trained, 1, 10.0, table.key([[1, 2, 3], [4, 5, 6], [7, 8, 0]]), 0.1, 0.9)
+    # Visited but every Q value is still zero
+    table.add(untouched)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "q.npy")
+        table.save(filename)
+        loaded = DenseQTable.load(filename)
+        assert len(loaded) == len(table) == 3
+        assert trained in loaded and untouched in loaded
+        del loaded
+
+        # Same through the agent: a reloaded agent must not look untrained
+        agent = QLearning()
+        agent.q_table = table
+        agent_filename = agent.save(os.path.join(directory, "agent.npy"))
+        reloaded = QLearning()
+        assert reloaded.load(agent_filename)
+        assert len(reloaded.q_table) == 3
+        assert reloaded.get_state_key([[1, 2, 3], [4, 0, 6], [7, 5, 8]]) in reloaded.q_table
+        del reloaded
+
+def test_cancel_finished_pool_job():
+    """Cancelling a finished pool job must not cancel the job that reuses its slot"""
+    easy = [[1, 2, 3], [4, 5, 6], [7, 0, 8]]
+    hardest = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]  # 31 moves
+    goal = Puzzle(easy).goal_state
+    with SolverPool(max_workers=1, algorithms=["BFS"]) as pool:
+        first = pool.submit(easy, goal, "BFS")
+        assert first.wait(30) and first.status == SOLVED
+        # The second job takes over the slot released by the first one
+        second = pool.submit(hardest, goal, "BFS", time_limit=1)
+        first.cancel()
+        assert second.wait(30)
+        assert second.status != CANCELLED
+
 def validate_solution(puzzle, path):
     """Validate that a solution path is correct"""
     if not path:
@@ -212,6 +309,9 @@ def main():
         [8, 3, 1]
     ]
     run_test(test5, "Test 5 - Very Complex")
+    
+    # Run every algorithm on all test cases, using all CPU cores
+    run_all_algorithms([test1, test2, test3, test4, test5])
 
 if __name__ == "__main__":
     main()
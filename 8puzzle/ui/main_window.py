@@ -8,21 +8,14 @@ from datetime import datetime
 from ui.puzzle_board import PuzzleBoard
 from ui.interactive_puzzle_board import InteractivePuzzleBoard
 from models.puzzle import Puzzle
-from algorithms.bfs import bfs_search
-from algorithms.dfs import dfs_search
-from algorithms.ids import ids_search
-from algorithms.ucs import ucs_search
-from algorithms.greedy import greedy_search
-from algorithms.astar import astar_search
-from algorithms.ida import ida_star_search
-from algorithms.simple_hill_climbing import simple_hill_climbing
-from algorithms.steepest_hill_climbing import steepest_hill_climbing
-from algorithms.beam_search import beam_search
-from algorithms.simulated_annealing import simulated_annealing
-from algorithms.stochastic_hill_climbing import stochastic_hill_climbing
-from algorithms.genetic_algorithm import genetic_algorithm
 from algorithms.csp_backtracking import show_backtracking_visualization
 from algorithms.q_learning import QLearning, show_qlearning_visualization
+from algorithms.budget import SearchBudget, CANCELLED
+from algorithms.executor import SolverExecutor
+from algorithms.solver_pool import SolverPool
+
+# Chu kỳ (ms) cập nhật tiến độ khi thuật toán đang chạy ở luồng nền
+PROGRESS_POLL_INTERVAL = 100
 
 class MainWindow:
     def __init__(self, root):
@@ -55,6 +48,12 @@ class MainWindow:
         
         # Biến để lưu trạng thái giải
         self.solving = False
+        # Thuật toán chạy trong tiến trình worker (làm nóng một lần) để giao
+        # diện không bị treo và không tranh GIL
+        self.executor = SolverExecutor(SolverPool(max_workers=1))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.solve_job = None
+        self.solving_algorithm = None
         self.current_path = None
         self.current_step = 0
         self.start_time = 0
@@ -66,12 +65,16 @@ class MainWindow:
         # Dictionary lưu thống kê của các thuật toán
         self.stats = {
             "BFS": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
+            "BIBFS": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "DFS": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "IDS": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "UCS": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "GREEDY": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "ASTAR": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "IDA": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
+            "WASTAR": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
+            "ARA": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
+            "FOCAL": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "SHC": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "SAHC": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
             "BEAM": {"time": 0, "steps": 0, "nodes": 0, "runs": 0},
@@ -194,6 +197,7 @@ class MainWindow:
         # Tạo các danh sách thuật toán theo phân loại
         uninformed_algorithms = [
             ("Breadth-First Search (BFS)", "BFS"),
+            ("Bidirectional BFS", "BIBFS"),
             ("Depth-First Search (DFS)", "DFS"),
             ("Iterative Deepening Search (IDS)", "IDS"),
             ("Uniform Cost Search (UCS)", "UCS")
@@ -202,7 +206,10 @@ class MainWindow:
         informed_algorithms = [
             ("Greedy Search", "GREEDY"),
             ("A* Search (A*)", "ASTAR"),
-            ("IDA* Search", "IDA")
+            ("IDA* Search", "IDA"),
+            ("Weighted A* (w = 1.5)", "WASTAR"),
+            ("Anytime Repairing A* (ARA*)", "ARA"),
+            ("Focal Search (ε = 0.5)", "FOCAL")
         ]
         
         local_algorithms = [
@@ -324,13 +331,23 @@ class MainWindow:
         control_frame.pack(fill="x", pady=(0, 15))
         
         # Buttons với gradient background
-        solve_btn = ttk.Button(
+        self.solve_btn = ttk.Button(
             control_frame,
             text="Solve Puzzle",
             command=self.solve_puzzle,
             style='Action.TButton'
         )
-        solve_btn.pack(pady=5, fill="x")
+        self.solve_btn.pack(pady=5, fill="x")
+        
+        # Nút hủy thuật toán đang chạy
+        self.cancel_btn = ttk.Button(
+            control_frame,
+            text="Cancel",
+            command=self.cancel_solve,
+            style='Action.TButton',
+            state=tk.DISABLED
+        )
+        self.cancel_btn.pack(pady=5, fill="x")
         
         # Thêm nút dữ liệu mẫu
         sample_data_btn = ttk.Button(
@@ -456,7 +473,7 @@ class MainWindow:
         
         # Tạo labels cho thống kê
         self.stats_labels = {}
-        for algo in ["BFS", "DFS", "IDS", "UCS", "GREEDY", "ASTAR", "IDA", "SHC", "SAHC", "BEAM", "SA", "STOCH", "GA", "ANDOR", "SENSORLESS", "CSP_BACKTRACKING", "CSP_AC3", "MIN_CONFLICTS"]:
+        for algo in ["BFS", "BIBFS", "DFS", "IDS", "UCS", "GREEDY", "ASTAR", "IDA", "WASTAR", "ARA", "FOCAL", "SHC", "SAHC", "BEAM", "SA", "STOCH", "GA", "ANDOR", "SENSORLESS", "CSP_BACKTRACKING", "CSP_AC3", "MIN_CONFLICTS"]:
             # Frame cho mỗi thuật toán
             algo_frame = ttk.LabelFrame(
                 right_frame,
@@ -505,10 +522,14 @@ class MainWindow:
         """Lấy tên đầy đủ của thuật toán"""
         names = {
             "BFS": "Breadth-First Search",
+            "BIBFS": "Bidirectional BFS",
             "UCS": "Uniform Cost Search",
             "GREEDY": "Greedy Best-First",
             "ASTAR": "A* Search",
             "IDA": "IDA* Search",
+            "WASTAR": "Weighted A* Search",
+            "ARA": "Anytime Repairing A*",
+            "FOCAL": "Focal Search",
             "SHC": "Simple Hill Climbing",
             "SAHC": "Steepest-Ascent Hill Climbing",
             "BEAM": "Beam Search",
@@ -524,6 +545,13 @@ class MainWindow:
         }
         return names.get(algo, algo)
         
+    def show_progress(self, algorithm, nodes, states, elapsed):
+        """Hiển thị tiến độ của thuật toán đang chạy lên các label thống kê"""
+        labels = self.stats_labels[algorithm]
+        labels["time"].config(text=f"⏱️ Elapsed: {elapsed:.2f}s")
+        labels["steps"].config(text=f"📦 Frontier: {states}")
+        labels["nodes"].config(text=f"🔍 Nodes: {nodes}")
+        
     def update_stats(self, algorithm, solve_time, steps, nodes):
         """Cập nhật thống kê cho thuật toán"""
         stats = self.stats[algorithm]
@@ -534,6 +562,12 @@ class MainWindow:
         stats["steps"] = ((stats["steps"] * (stats["runs"] - 1)) + steps) / stats["runs"]
         stats["nodes"] = ((stats["nodes"] * (stats["runs"] - 1)) + nodes) / stats["runs"]
         
+        self.show_stats(algorithm)
+        
+    def show_stats(self, algorithm):
+        """Hiển thị thống kê trung bình của thuật toán lên các label"""
+        stats = self.stats[algorithm]
+        
         # Cập nhật labels với màu sắc và emoji
         self.stats_labels[algorithm]["time"].config(
             text=f"⏱️ Avg Time: {stats['time']:.2f}s"
@@ -615,8 +649,9 @@ class MainWindow:
             self.show_q_learning(initial_state, goal_state)
             return
         
-        # Bắt đầu theo dõi thời gian
-        start_time = time.time()
+        # Mỗi lần chỉ chạy một thuật toán
+        if self.solving:
+            return
         
         # Tạo đối tượng puzzle với trạng thái ban đầu và đích
         puzzle = Puzzle(initial_state)
@@ -624,60 +659,80 @@ class MainWindow:
         puzzle.goal_state = goal_state
         
         # Kiểm tra xem có thể đi từ trạng thái đầu đến trạng thái đích hay không
-        # Tính số đảo trong cả hai trạng thái
-        def count_inversions(state):
-            flat_state = [num for row in state for num in row]
-            inversions = 0
-            for i in range(len(flat_state)):
-                for j in range(i + 1, len(flat_state)):
-                    if flat_state[i] != 0 and flat_state[j] != 0 and flat_state[i] > flat_state[j]:
-                        inversions += 1
-            return inversions
-        
-        initial_inversions = count_inversions(initial_state)
-        goal_inversions = count_inversions(goal_state)
-        
-        # Hai trạng thái có thể đạt đến nhau nếu cùng chẵn hoặc cùng lẻ
-        if (initial_inversions % 2) != (goal_inversions % 2):
+        if not puzzle.is_solvable():
             messagebox.showerror("Error", "This puzzle configuration is impossible to solve! The goal state cannot be reached from the initial state.")
             return
         
+        # Chọn thuật toán tương ứng
+        algo = self.algorithm_var.get()
+        params = self.get_solver_params(algo)
+        if params is None:
+            return
+        
+        # Chạy thuật toán trên luồng nền, tiến độ được cập nhật định kỳ
+        self.solving = True
+        self.solving_algorithm = algo
+        self.solve_initial_state = initial_state
+        self.solve_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.solve_job = self.executor.submit(algo, puzzle, SearchBudget(), **params)
+        self.root.after(PROGRESS_POLL_INTERVAL, self.poll_solver)
+        
+    def get_solver_params(self, algo):
+        """Tham số gọi thuật toán algo (tên trong algorithms.registry), hoặc None nếu không có"""
+        solver_params = {
+            "BFS": {},
+            "BIBFS": {},
+            "DFS": {"max_depth": 50},
+            "IDS": {"max_depth": 30},
+            "UCS": {},
+            "GREEDY": {},
+            "ASTAR": {},
+            "IDA": {},
+            "WASTAR": {"weight": 1.5},
+            "ARA": {"time_limit": 1.0},
+            "FOCAL": {"epsilon": 0.5},
+            "SHC": {},
+            "SAHC": {},
+            "BEAM": {"beam_width": 3},
+            "SA": {},
+            "STOCH": {},
+            "GA": {"pop_size": 200, "max_generations": 200},
+        }
+        return solver_params.get(algo)
+        
+    def cancel_solve(self):
+        """Yêu cầu dừng thuật toán đang chạy"""
+        if self.solve_job is not None:
+            self.solve_job.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+        
+    def poll_solver(self):
+        """Cập nhật tiến độ; khi thuật toán chạy xong thì xử lý kết quả"""
+        job = self.solve_job
+        algo = self.solving_algorithm
+        if not job.done:
+            self.show_progress(algo, *job.progress())
+            self.root.after(PROGRESS_POLL_INTERVAL, self.poll_solver)
+            return
+        
+        self.solving = False
+        self.solve_job = None
+        self.solve_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        # Trả lại thống kê trung bình thay cho tiến độ
+        self.show_stats(algo)
+        
+        if job.error is not None:
+            messagebox.showerror("Error", f"An error occurred: {str(job.error)}")
+        elif job.status == CANCELLED:
+            messagebox.showinfo("Cancelled", f"Search cancelled after {job.progress()[0]} nodes.")
+        else:
+            self.on_solve_finished(algo, job.path, job.solve_time, job.nodes_explored)
+        
+    def on_solve_finished(self, algo, path, solve_time, nodes_explored):
+        """Xử lý kết quả của thuật toán"""
         try:
-            # Gọi thuật toán tương ứng
-            algo = self.algorithm_var.get()
-            path = None
-            nodes_explored = 0
-            
-            if algo == "BFS":
-                path, nodes_explored = bfs_search(puzzle)
-            elif algo == "DFS":
-                path, nodes_explored = dfs_search(puzzle, max_depth=50)
-            elif algo == "IDS":
-                path, nodes_explored = ids_search(puzzle, max_depth=30)
-            elif algo == "UCS":
-                path, nodes_explored = ucs_search(puzzle)
-            elif algo == "GREEDY":
-                path, nodes_explored = greedy_search(puzzle)
-            elif algo == "ASTAR":
-                path, nodes_explored = astar_search(puzzle)
-            elif algo == "IDA":
-                path, nodes_explored = ida_star_search(puzzle)
-            elif algo == "SHC":
-                path, nodes_explored = simple_hill_climbing(puzzle)
-            elif algo == "SAHC":
-                path, nodes_explored = steepest_hill_climbing(puzzle)
-            elif algo == "BEAM":
-                path, nodes_explored = beam_search(puzzle, beam_width=3)
-            elif algo == "SA":
-                path, nodes_explored = simulated_annealing(puzzle)
-            elif algo == "STOCH":
-                path, nodes_explored = stochastic_hill_climbing(puzzle)
-            elif algo == "GA":
-                path, nodes_explored = genetic_algorithm(puzzle, pop_size=200, max_generations=200)
-        
-            # Tính thời gian giải
-            solve_time = time.time() - start_time
-            
             if path:
                 # Cập nhật thống kê
                 self.update_stats(algo, solve_time, len(path) - 1, nodes_explored)
@@ -693,7 +748,7 @@ class MainWindow:
                 self.save_solution_path(algo, path, solve_time, nodes_explored)
                 
                 # Hiển thị trạng thái ban đầu trước tiên trong phần visualization
-                self.puzzle_board.update_board(initial_state)
+                self.puzzle_board.update_board(self.solve_initial_state)
                 self.puzzle_board.update_info(0, 0.0)
                 
                 # Đợi 1 giây trước khi bắt đầu hiển thị các bước tiếp theo
@@ -704,6 +759,12 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             
+    def on_close(self):
+        """Đóng cửa sổ: dừng thuật toán đang chạy và các tiến trình worker"""
+        self.executor.cancel()
+        self.executor.pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+        
     def reset_visualization(self):
         """Chỉ reset bảng visualization mà không reset trạng thái đầu và đích"""
         # Reset bảng visualization
@@ -795,7 +856,8 @@ class MainWindow:
             "gamma": 0.9,  # Discount factor
             "epsilon": 0.3,  # Exploration rate
             "episodes": 1000,  # Số lượt huấn luyện
-            "shuffle_steps": 20  # Số bước trộn cho mỗi trạng thái ban đầu mới
+            "shuffle_steps": 20,  # Số bước trộn cho mỗi trạng thái ban đầu mới
+            "workers": os.cpu_count() or 1  # Số tiến trình huấn luyện song song
         }
         
         # Hiển thị cửa sổ trực quan hóa Q-learning với tiến trình huấn luyện tích hợp